@@ -0,0 +1,32 @@
+"""add_player_catalog_indexes
+
+Revision ID: 3f9a6c1d2e47
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-17 10:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6c1d2e47'
+down_revision: Union[str, Sequence[str], None] = 'b2c3d4e5f6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Indexes for the filtered, keyset-paginated player catalog."""
+    op.create_index('idx_players_catalog', 'players', ['set_number', 'name', 'id'])
+    op.create_index('idx_players_sold_catalog', 'players', ['is_sold', 'set_number', 'name', 'id'])
+    op.create_index('idx_players_team_id', 'players', ['team_id'])
+
+
+def downgrade() -> None:
+    """Drop player catalog indexes."""
+    op.drop_index('idx_players_team_id', table_name='players')
+    op.drop_index('idx_players_sold_catalog', table_name='players')
+    op.drop_index('idx_players_catalog', table_name='players')
@@ -0,0 +1,30 @@
+"""bids_timestamp_keyset_index
+
+Revision ID: 7c2e5b8d1f03
+Revises: 3f9a6c1d2e47
+Create Date: 2026-10-17 11:02:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5b8d1f03'
+down_revision: Union[str, Sequence[str], None] = '3f9a6c1d2e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Extend idx_bids_timestamp to (timestamp, id) for keyset pagination."""
+    op.drop_index('idx_bids_timestamp', table_name='bids')
+    op.create_index('idx_bids_timestamp', 'bids', ['timestamp', 'id'])
+
+
+def downgrade() -> None:
+    """Restore single-column idx_bids_timestamp."""
+    op.drop_index('idx_bids_timestamp', table_name='bids')
+    op.create_index('idx_bids_timestamp', 'bids', ['timestamp'])
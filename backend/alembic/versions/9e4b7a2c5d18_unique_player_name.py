@@ -0,0 +1,41 @@
+"""unique_player_name
+
+Revision ID: 9e4b7a2c5d18
+Revises: 7c2e5b8d1f03
+Create Date: 2026-10-17 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b7a2c5d18'
+down_revision: Union[str, Sequence[str], None] = '7c2e5b8d1f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Make player name the natural key used by dataset upserts."""
+    # Existing duplicates would fail the unique index. Rename rather than
+    # delete them so no squad or bid history is lost: a sold copy keeps the
+    # plain name, the others become "Name (2)", "Name (3)", ...
+    op.execute("""
+        UPDATE players p SET name = p.name || ' (' || d.rn || ')'
+        FROM (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY name ORDER BY is_sold DESC, id) AS rn
+            FROM players WHERE name IS NOT NULL
+        ) d
+        WHERE p.id = d.id AND d.rn > 1
+    """)
+    op.drop_index('ix_players_name', table_name='players')
+    op.create_index('ix_players_name', 'players', ['name'], unique=True)
+
+
+def downgrade() -> None:
+    """Back to a non-unique name index."""
+    op.drop_index('ix_players_name', table_name='players')
+    op.create_index('ix_players_name', 'players', ['name'], unique=False)
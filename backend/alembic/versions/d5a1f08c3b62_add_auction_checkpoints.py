@@ -0,0 +1,37 @@
+"""add_auction_checkpoints
+
+Revision ID: d5a1f08c3b62
+Revises: 9e4b7a2c5d18
+Create Date: 2026-10-17 13:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a1f08c3b62'
+down_revision: Union[str, Sequence[str], None] = '9e4b7a2c5d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Named snapshots of mutable auction state."""
+    op.create_table('auction_checkpoints',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_auction_checkpoints_name'), 'auction_checkpoints', ['name'], unique=True)
+
+
+def downgrade() -> None:
+    """Drop auction checkpoints."""
+    op.drop_index(op.f('ix_auction_checkpoints_name'), table_name='auction_checkpoints')
+    op.drop_table('auction_checkpoints')
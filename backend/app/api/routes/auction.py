@@ -1,25 +1,88 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
-from app.services.auction_service import place_bid, confirm_sale, reset_auction_logic, get_auction_state
-from app.schemas.schemas import BidRequest, AuctionStateResponse
-from app.models.all_models import AuctionState, Player, Bid, Team
-from sqlalchemy import select, update
+from app.db.session import get_db, async_session_maker
+from app.services.auction_service import place_bid, confirm_sale, reset_auction_logic, get_auction_state_view, select_player as select_player_logic, bid_log_query, bid_log_entry
+from app.schemas.schemas import BidRequest, AuctionStateResponse, CheckpointRequest, CheckpointResponse
+from app.services.checkpoint_service import create_checkpoint, list_checkpoints, restore_checkpoint, delete_checkpoint
+from app.models.all_models import Bid
+from sqlalchemy import tuple_
 from app.websockets.manager import manager
+from app.websockets.protocol import parse_event_id
+from app.websockets.topics import parse_topics
+from app.services.snapshot_service import snapshot_cache
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.core.config import BID_EXPORT_CHUNK_SIZE
+from app.core.errors import StaleBidError, BidRateLimited
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
+import json
 
 router = APIRouter()
 
 @router.get("/state", response_model=AuctionStateResponse)
 async def get_state(db: AsyncSession = Depends(get_db)):
-    state = await get_auction_state(db)
-    return state
+    return await get_auction_state_view(db)
+
+@router.get("/snapshot")
+async def get_snapshot(request: Request, db: AsyncSession = Depends(get_db)):
+    # One cached payload for client bootstrap: state, current player, ranked teams, recent bids
+    body, etag = await snapshot_cache.get(db)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+# Server-Sent Events: no proxy or intermediary may cache, transform or buffer the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache, no-transform",
+    "X-Accel-Buffering": "no",
+}
+SSE_RETRY_MS = 3000
+
+@router.get("/events")
+async def events(
+    request: Request,
+    topics: Optional[str] = Query(None, description="Comma-separated topics, as for /ws?topics="),
+    since: Optional[int] = Query(None, description="Resume after this seq (first connect; reconnects send Last-Event-ID)"),
+    epoch: Optional[str] = None,
+):
+    # Read-only event feed for viewer screens: same events and topics as /ws
+    try:
+        subscribed = parse_topics(topics.split(",") if topics else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id:
+        since, epoch = parse_event_id(last_event_id)
+
+    async def stream():
+        # Registered on first read so a request that never starts streaming leaves nothing behind
+        connection = manager.open_stream(since=since, epoch=epoch, topics=subscribed)
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            async for frame in manager.stream_frames(connection):
+                yield frame
+        finally:
+            manager.disconnect(connection.websocket)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 @router.post("/bid")
 async def bid(bid_request: BidRequest, db: AsyncSession = Depends(get_db)):
     try:
-        state = await place_bid(amount=bid_request.amount, team_id=bid_request.team_id, session=db)
-        return {"status": "success", "current_bid": state.current_bid}
+        state = await place_bid(
+            amount=bid_request.amount, team_id=bid_request.team_id, session=db,
+            expected_version=bid_request.expected_version,
+        )
+        return {"status": "success", "current_bid": state.current_bid, "version": state.version}
+    except BidRateLimited as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(max(1, round(e.retry_after)))})
+    except StaleBidError as e:
+        # Someone bid first: refresh and retry with the new version
+        headers = {"X-Auction-Version": str(e.current_version)} if e.current_version is not None else None
+        raise HTTPException(status_code=409, detail=str(e), headers=headers)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -38,45 +101,81 @@ async def reset(db: AsyncSession = Depends(get_db)):
     await reset_auction_logic(db)
     return {"status": "reset_complete"}
 
+@router.post("/checkpoints", response_model=CheckpointResponse)
+async def save_checkpoint(request: CheckpointRequest, db: AsyncSession = Depends(get_db)):
+    # Saving under an existing name overwrites it
+    return await create_checkpoint(request.name, db)
+
+@router.get("/checkpoints", response_model=List[CheckpointResponse])
+async def get_checkpoints(db: AsyncSession = Depends(get_db)):
+    return await list_checkpoints(db)
+
+@router.post("/checkpoints/{name}/restore")
+async def restore(name: str, db: AsyncSession = Depends(get_db)):
+    try:
+        await restore_checkpoint(name, db)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"status": "restored", "checkpoint": name}
+
+@router.delete("/checkpoints/{name}")
+async def remove_checkpoint(name: str, db: AsyncSession = Depends(get_db)):
+    try:
+        await delete_checkpoint(name, db)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"status": "deleted", "checkpoint": name}
+
 @router.post("/select-player/{player_id}")
 async def select_player(player_id: UUID, db: AsyncSession = Depends(get_db)):
-    # Simple logic to select a player for auction
-    async with db.begin():
-        result = await db.execute(select(AuctionState).where(AuctionState.id == 1).with_for_update())
-        state = result.scalar_one()
-        
-        if state.status == "ACTIVE" and state.current_bidder_id:
-            raise HTTPException(status_code=400, detail="Cannot switch player while bid is active")
-            
-        player = await db.get(Player, player_id)
-        if not player:
-            raise HTTPException(status_code=404, detail="Player not found")
-        if player.is_sold:
-            raise HTTPException(status_code=400, detail="Player already sold")
-            
-        state.current_player_id = player_id
-        state.status = "ACTIVE"
-        state.current_bid = 0
-        state.current_bidder_id = None
-        
-    await manager.broadcast("PLAYER_SELECTED", {"player_id": str(player_id)})
+    try:
+        await select_player_logic(player_id, db)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/all-bids")
-async def get_all_bids(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Bid, Player.name, Team.code)
-        .join(Player, Bid.player_id == Player.id)
-        .join(Team, Bid.team_id == Team.id)
-        .order_by(Bid.timestamp.desc())
-    )
-    bids = []
-    for row in result.all():
-        bid, player_name, team_code = row
-        bids.append({
-            "id": str(bid.id),
-            "player_name": player_name,
-            "team_code": team_code,
-            "amount": float(bid.amount) / 100000,
-            "timestamp": bid.timestamp.isoformat()
-        })
-    return bids
+async def get_all_bids(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Only bids placed after this timestamp (incremental polling)"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_db)
+):
+    # Newest first, keyset on (timestamp, id) via idx_bids_timestamp
+    query = bid_log_query()
+    if since is not None:
+        query = query.where(Bid.timestamp > since)
+    if cursor:
+        try:
+            last_ts, last_id = decode_cursor(cursor, 2)
+            last_ts, last_id = datetime.fromisoformat(last_ts), UUID(last_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.where(tuple_(Bid.timestamp, Bid.id) < tuple_(last_ts, last_id))
+    query = query.order_by(Bid.timestamp.desc(), Bid.id.desc())
+
+    if format == "ndjson":
+        # Full export: stream rows from a server-side cursor, one JSON object per line
+        if limit:
+            query = query.limit(limit)
+        return StreamingResponse(_stream_bids(query), media_type="application/x-ndjson")
+
+    if limit:
+        query = query.limit(limit + 1)
+    result = await db.execute(query)
+    rows = result.all()
+
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor([rows[-1].timestamp.isoformat(), str(rows[-1].id)])
+    return [bid_log_entry(row) for row in rows]
+
+async def _stream_bids(query):
+    # Own session: the request-scoped one may be closed before the body is sent
+    async with async_session_maker() as session:
+        result = await session.stream(query.execution_options(yield_per=BID_EXPORT_CHUNK_SIZE))
+        async for partition in result.partitions():
+            yield "".join(json.dumps(bid_log_entry(row)) + "\n" for row in partition)
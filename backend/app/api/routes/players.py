@@ -1,52 +1,109 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from uuid import UUID
 from app.db.session import get_db
+from app.services.snapshot_service import snapshot_cache
 from app.models.all_models import Player
 from app.schemas.schemas import PlayerCreate, PlayerResponse
-from io import StringIO
-import csv
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_after
+from app.services.player_import import import_players_csv
 
 router = APIRouter()
 
+# Keyset order for the catalog (backed by idx_players_catalog)
+CATALOG_KEY = ("set_number", "name", "id")
+PLAYER_FIELDS = set(PlayerResponse.model_fields)
+
 @router.get("/", response_model=List[PlayerResponse])
-async def get_players(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Player).order_by(Player.set_number, Player.name))
-    players = result.scalars().all()
-    return players
+async def get_players(
+    response: Response,
+    set_number: Optional[int] = None,
+    role: Optional[str] = None,
+    is_sold: Optional[bool] = None,
+    team_id: Optional[UUID] = None,
+    nationality: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of player fields, e.g. id,name,role"),
+    db: AsyncSession = Depends(get_db)
+):
+    # Projection: only load the requested columns (plus the keyset columns)
+    requested = None
+    if fields:
+        requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = set(requested) - PLAYER_FIELDS
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        columns = requested + [k for k in CATALOG_KEY if k not in requested]
+        query = select(*[getattr(Player, c) for c in columns])
+    else:
+        query = select(Player)
+
+    if set_number is not None:
+        query = query.where(Player.set_number == set_number)
+    if role is not None:
+        query = query.where(Player.role == role)
+    if is_sold is not None:
+        query = query.where(Player.is_sold == is_sold)
+    if team_id is not None:
+        query = query.where(Player.team_id == team_id)
+    if nationality is not None:
+        query = query.where(Player.nationality == nationality)
+
+    if cursor:
+        try:
+            last_set, last_name, last_id = decode_cursor(cursor, len(CATALOG_KEY))
+            last_id = UUID(last_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # set_number and name may be NULL; those rows sort last
+        query = query.where(keyset_after((Player.set_number, Player.name, Player.id), (last_set, last_name, last_id)))
+
+    query = query.order_by(Player.set_number, Player.name, Player.id)
+    if limit:
+        # One extra row tells us whether there is a next page
+        query = query.limit(limit + 1)
+
+    result = await db.execute(query)
+    rows = result.mappings().all() if requested else result.scalars().all()
+
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last[k] if requested else getattr(last, k) for k in CATALOG_KEY])
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if requested:
+        return JSONResponse(jsonable_encoder([{f: row[f] for f in requested} for row in rows]), headers=headers)
+
+    response.headers.update(headers)
+    return rows
 
 @router.post("/", response_model=PlayerResponse)
 async def create_player(player: PlayerCreate, db: AsyncSession = Depends(get_db)):
     new_player = Player(**player.dict())
     db.add(new_player)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # ix_players_name is unique
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=f"Player '{player.name}' already exists")
     await db.refresh(new_player)
+    snapshot_cache.invalidate()
     return new_player
 
 @router.post("/bulk-upload")
 async def bulk_upload_players(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
-    try:
-        contents = await file.read()
-        decoded = contents.decode('utf-8')
-        csv_reader = csv.DictReader(StringIO(decoded))
-        
-        players_to_add = []
-        for row in csv_reader:
-            # Assumes CSV columns: name, role, nationality, age, image
-            player = Player(
-                name=row['name'],
-                role=row['role'],
-                nationality=row.get('nationality', 'India'),
-                age=int(row.get('age', 25)),
-                image=row.get('image', '')
-            )
-            players_to_add.append(player)
-            
-        if players_to_add:
-            db.add_all(players_to_add)
-            await db.commit()
-            
-        return {"status": "success", "count": len(players_to_add)}
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    # Streams the upload in chunks; bad rows (and bad bytes) are reported, not fatal.
+    # Columns: any PlayerCreate field (name and role required).
+    report = await import_players_csv(file, db)
+    if report["count"]:
+        snapshot_cache.invalidate()
+    return report
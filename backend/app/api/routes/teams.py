@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
 from app.db.session import get_db
-from app.models.all_models import Team
+from app.services.snapshot_service import snapshot_cache
+from app.models.all_models import AuctionState, Team
 from app.schemas.schemas import TeamCreate, TeamResponse
 from app.services.auction_service import get_leaderboard
+from app.services.leaderboard import leaderboard as live_leaderboard
+from app.websockets.manager import manager
 
 router = APIRouter()
 
@@ -21,8 +24,30 @@ async def create_team(team: TeamCreate, db: AsyncSession = Depends(get_db)):
     db.add(new_team)
     await db.commit()
     await db.refresh(new_team)
+    if not live_leaderboard.loaded:
+        await get_leaderboard(db)
+    # No state change of its own: the team joins at the current version, and
+    # every worker and client learns its full row from the delta
+    version = await db.scalar(select(AuctionState.version).where(AuctionState.id == 1)) or 0
+    delta = live_leaderboard.add_team({
+        "id": str(new_team.id),
+        "name": new_team.name,
+        "code": new_team.code,
+        "logo_url": new_team.logo_url,
+        "color": new_team.color,
+        "primary_color": new_team.primary_color,
+        "secondary_color": new_team.secondary_color,
+        "total_points": new_team.total_points or 0,
+        "purse_balance": float(new_team.purse_balance),
+        "players_count": new_team.players_count or 0,
+    }, version)
+    await manager.broadcast("LEADERBOARD_DELTA", delta, teams=[row["id"] for row in delta["teams"]])
+    snapshot_cache.invalidate()
     return new_team
 
 @router.get("/leaderboard")
-async def leaderboard(db: AsyncSession = Depends(get_db)):
-    return await get_leaderboard(db)
+async def leaderboard(response: Response, db: AsyncSession = Depends(get_db)):
+    # Baseline for LEADERBOARD_DELTA events (see delta "base_version")
+    rows = await get_leaderboard(db)
+    response.headers["X-Leaderboard-Version"] = str(live_leaderboard.version)
+    return rows
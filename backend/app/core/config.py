@@ -0,0 +1,76 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Bid engine: "database" validates every bid under the AuctionState row lock,
+# "memory" validates against an in-process copy of the live lot and persists
+# bids through an ordered write-behind flusher, "actor" runs every bid, sale
+# and player selection through one in-process command queue and commits
+# before answering ("memory" and "actor" are single worker only).
+AUCTION_ENGINE = os.getenv("AUCTION_ENGINE", "database").lower()
+
+# Max queued bid writes persisted per flusher transaction
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "100"))
+# Attempts before a flusher batch that keeps failing is dead-lettered, and
+# seconds a bid (or shutdown) waits while the engine is held
+WRITE_BEHIND_MAX_RETRIES = int(os.getenv("WRITE_BEHIND_MAX_RETRIES", "10"))
+WRITE_BEHIND_TIMEOUT = float(os.getenv("WRITE_BEHIND_TIMEOUT", "10"))
+
+# Max queued bid commands the actor validates and commits together
+BID_ACTOR_BATCH_SIZE = int(os.getenv("BID_ACTOR_BATCH_SIZE", "100"))
+# Seconds a bid or state change waits for the actor before giving up
+BID_ACTOR_TIMEOUT = float(os.getenv("BID_ACTOR_TIMEOUT", "10"))
+
+# WebSocket fan-out: per-connection outbound queue length and max seconds a
+# single send may block before the connection is evicted as a slow consumer
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+
+# Heartbeats: the server sends PING every interval; a socket that has sent
+# nothing (no pong, no command) for the idle timeout is reaped as dead
+WS_HEARTBEAT_INTERVAL = float(os.getenv("WS_HEARTBEAT_INTERVAL", "20"))
+WS_IDLE_TIMEOUT = float(os.getenv("WS_IDLE_TIMEOUT", "60"))
+
+# Broadcast bus between workers: "memory" (single process) or "postgres"
+# (LISTEN/NOTIFY, required for `uvicorn --workers N` or multiple replicas)
+BROADCAST_BACKEND = os.getenv("BROADCAST_BACKEND", "memory").lower()
+BROADCAST_CHANNEL = os.getenv("BROADCAST_CHANNEL", "auction_events")
+
+# Recent events kept for WebSocket resume (`/ws?since=<seq>&epoch=<epoch>`)
+WS_REPLAY_BUFFER_SIZE = int(os.getenv("WS_REPLAY_BUFFER_SIZE", "1024"))
+
+# Most recent bids included in /api/auction/snapshot
+SNAPSHOT_BID_LIMIT = int(os.getenv("SNAPSHOT_BID_LIMIT", "20"))
+
+# Rows fetched per round trip when streaming /api/auction/all-bids?format=ndjson
+BID_EXPORT_CHUNK_SIZE = int(os.getenv("BID_EXPORT_CHUNK_SIZE", "1000"))
+
+# Bulk player CSV upload: bytes read per chunk, rows per multi-row INSERT,
+# and how many row errors the upload report lists
+IMPORT_READ_CHUNK_SIZE = int(os.getenv("IMPORT_READ_CHUNK_SIZE", str(256 * 1024)))
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "500"))
+
+# Database connection pool (app/db/session.py). DB_POOL_RECYCLE is seconds
+# (-1 = never); pre-ping checks each connection on checkout.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Size of asyncpg's per-connection prepared statement cache. The cache is
+# asyncpg's default behaviour; this only makes its size configurable.
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+# PgBouncer in transaction mode: no statement cache, uniquely named prepared
+# statements. LISTEN/NOTIFY needs a session connection, so point
+# DATABASE_DIRECT_URL at Postgres itself when using BROADCAST_BACKEND=postgres.
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+DATABASE_DIRECT_URL = os.getenv("DATABASE_DIRECT_URL")
+
+# Per-team bid admission: sustained bids/sec and burst size allowed per team
+# before `429 Too Many Requests` (0 disables the rate limit)
+BID_RATE_LIMIT = float(os.getenv("BID_RATE_LIMIT", "5"))
+BID_RATE_BURST = int(os.getenv("BID_RATE_BURST", "5"))
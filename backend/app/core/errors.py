@@ -0,0 +1,21 @@
+from typing import Optional
+
+
+class StaleBidError(ValueError):
+    """
+    An optimistic bid was made against an AuctionState.version that is no
+    longer current. The client should refresh and bid again.
+    """
+
+    def __init__(self, current_version: Optional[int] = None):
+        super().__init__("Outbid, refresh")
+        # Latest version when known; None when another writer held the row
+        self.current_version = current_version
+
+
+class BidRateLimited(Exception):
+    """A team exceeded its bid rate; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Too many bids, slow down")
+        self.retry_after = retry_after
@@ -0,0 +1,133 @@
+import re
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Prometheus metrics for the auction hot paths, served at GET /metrics.
+# Values are per process: with several workers, scrape each one.
+
+# Sub-millisecond to a few seconds: bids are fast, a stalled lock is not
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency (until the response starts) by route template",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+PLACE_BID_SECONDS = Histogram(
+    "auction_place_bid_seconds", "place_bid validation + commit time",
+    ["outcome"], buckets=LATENCY_BUCKETS,
+)
+CONFIRM_SALE_SECONDS = Histogram(
+    "auction_confirm_sale_seconds", "confirm_sale transaction time",
+    buckets=LATENCY_BUCKETS,
+)
+STATE_LOCK_WAIT = Histogram(
+    "auction_state_lock_wait_seconds", "Time waiting for the AuctionState row lock",
+    ["operation"], buckets=LATENCY_BUCKETS,
+)
+BIDS_REJECTED = Counter("auction_bids_rejected_total", "Rejected bids by reason", ["reason"])
+BIDS_SHED = Counter(
+    "auction_bids_shed_total", "Bids rejected by admission control before reaching the database",
+    ["reason"],
+)
+ACTOR_QUEUE_DEPTH = Gauge("auction_actor_queue_depth", "Commands waiting for the bid actor")
+ACTOR_BATCH_SIZE = Histogram(
+    "auction_actor_batch_size", "Bids committed per actor transaction",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+
+BROADCAST_SECONDS = Histogram(
+    "ws_broadcast_seconds", "manager.broadcast duration (encode + publish)",
+    ["type"], buckets=LATENCY_BUCKETS,
+)
+FAN_OUT_SECONDS = Histogram(
+    "ws_fan_out_seconds", "Time to enqueue one event on every local connection",
+    buckets=LATENCY_BUCKETS,
+)
+WS_COMMAND_SECONDS = Histogram(
+    "ws_command_seconds", "Commands received on /ws, by type and reply status",
+    ["command", "status"], buckets=LATENCY_BUCKETS,
+)
+WS_EVICTED = Counter("ws_evicted_total", "Slow WebSocket consumers disconnected")
+WS_REAPED = Counter("ws_reaped_total", "Dead WebSocket connections removed", ["reason"])
+WS_CONNECTIONS = Gauge("ws_active_connections", "Open WebSocket connections")
+WS_QUEUE_DEPTH = Gauge("ws_outbound_queue_depth", "Messages waiting in all outbound queues")
+WS_QUEUE_DEPTH_MAX = Gauge("ws_outbound_queue_depth_max", "Deepest single outbound queue")
+
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connections checked out of the pool")
+DB_POOL_IN_USE = Gauge("db_pool_checked_out", "Connections currently checked out")
+DB_POOL_SIZE = Gauge("db_pool_size", "Connections the pool keeps open")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond pool_size")
+DB_POOL_SATURATION = Gauge("db_pool_saturation", "Checked out / (pool_size + max_overflow)")
+DB_POOL_WAITING = Gauge("db_pool_waiting", "Tasks waiting for a pooled connection")
+# Time to get a connection out of the pool: high here with low lock wait and
+# fast statements means the pool, not Postgres, is the bottleneck
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time waiting for a pooled connection",
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def rejection_reason(error: Exception) -> str:
+    # "Bid too low. Current bid: 123" -> "Bid too low"; amounts would make every label unique
+    if isinstance(error, ValueError):
+        return re.split(r"[.:]", str(error), maxsplit=1)[0].strip()
+    return type(error).__name__
+
+
+def route_template(scope) -> str:
+    """
+    Full path template of the matched route, e.g. "/api/auction/select-player/{player_id}".
+
+    Depending on the FastAPI version, `route.path` of an included router may
+    lack the include prefix, so the prefix is recovered from the request
+    path: whatever comes before the part the route's own pattern matches.
+    """
+    route = scope.get("route")
+    if route is None:
+        # The router fills in scope["route"]; unmatched paths share one label
+        return "unmatched"
+    path = scope["path"]
+    for i, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[i:]):
+            return path[:i] + route.path
+    return route.path
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing HTTP requests, labelled by route template.
+
+    The clock stops when the response starts, not when the body ends:
+    streaming routes (SSE /api/auction/events, NDJSON /all-bids) would
+    otherwise report how long the client stayed connected.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        observed = False
+
+        def observe(status: int):
+            nonlocal observed
+            observed = True
+            REQUEST_LATENCY.labels(
+                scope["method"], route_template(scope), str(status)
+            ).observe(time.perf_counter() - started)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                observe(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not observed:
+                # Failed before any response was sent
+                observe(500)
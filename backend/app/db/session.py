@@ -1,9 +1,23 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from typing import AsyncGenerator
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import AsyncGenerator, Dict, Any, Optional
+from uuid import uuid4
 import os
+import time
 from dotenv import load_dotenv
 
+from app.core.config import (
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    DB_STATEMENT_CACHE_SIZE, DB_PGBOUNCER,
+)
+from app.core.metrics import (
+    DB_POOL_CHECKOUTS, DB_POOL_IN_USE, DB_POOL_SIZE as DB_POOL_SIZE_GAUGE, DB_POOL_OVERFLOW,
+    DB_POOL_SATURATION, DB_POOL_WAITING, DB_POOL_WAIT,
+)
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -13,7 +27,94 @@ if not DATABASE_URL:
 if DATABASE_URL.startswith("postgresql://"):
     DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long (and how many) callers wait for a connection."""
+
+    waiting = 0
+
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        # Kept for pool_stats: QueuePool only exposes overflow in use, not the limit
+        self.max_overflow = max_overflow
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+
+    def connect(self):
+        self.waiting += 1
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.waiting -= 1
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
+def build_engine(url: str = DATABASE_URL, pgbouncer: Optional[bool] = None, **overrides) -> AsyncEngine:
+    """
+    The one place engines are created. Pool settings come from the DB_* env
+    vars (app/core/config.py); callers pass overrides such as echo=True.
+    `pgbouncer` defaults to DB_PGBOUNCER.
+    """
+    connect_args: Dict[str, Any] = {}
+    url = make_url(url)
+    if DB_PGBOUNCER if pgbouncer is None else pgbouncer:
+        # Transaction pooling hands each transaction a different server
+        # connection: never reuse a prepared statement by name across them
+        url = url.update_query_dict({"prepared_statement_cache_size": "0"})
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    else:
+        # asyncpg's own per-connection statement cache (on by default), sized here
+        url = url.update_query_dict({"prepared_statement_cache_size": str(DB_STATEMENT_CACHE_SIZE)})
+
+    options = dict(
+        echo=False,
+        poolclass=InstrumentedPool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    options.update(overrides)
+    return create_async_engine(url, **options)
+
+engine = build_engine()
+
+def script_engine(**overrides) -> AsyncEngine:
+    """
+    Engine for the maintenance scripts. They have always run with the
+    statement cache off so they work behind transaction-mode PgBouncer,
+    whatever DB_PGBOUNCER says.
+    """
+    return build_engine(pgbouncer=True, **overrides)
+
+def pool_stats(target: AsyncEngine = engine) -> Dict[str, Any]:
+    """Pool occupancy; saturation near 1.0 with waiters means bids queue on the pool."""
+    pool = target.sync_engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {"pool": type(pool).__name__}
+    max_overflow = getattr(pool, "max_overflow", None)
+    capacity = pool.size() + max(max_overflow, 0) if max_overflow is not None else None
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": max_overflow,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "waiting": getattr(pool, "waiting", 0),
+        "saturation": round(pool.checkedout() / capacity, 3) if capacity else None,
+    }
+
+# Pool telemetry for /metrics
+@event.listens_for(engine.sync_engine, "checkout")
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKOUTS.inc()
+
+DB_POOL_IN_USE.set_function(lambda: engine.sync_engine.pool.checkedout())
+DB_POOL_SIZE_GAUGE.set_function(lambda: engine.sync_engine.pool.size())
+DB_POOL_OVERFLOW.set_function(lambda: max(engine.sync_engine.pool.overflow(), 0))
+DB_POOL_SATURATION.set_function(lambda: pool_stats()["saturation"] or 0)
+DB_POOL_WAITING.set_function(lambda: engine.sync_engine.pool.waiting)
 
 async_session_maker = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
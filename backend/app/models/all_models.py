@@ -11,7 +11,7 @@ from sqlalchemy import (
     Index,
     func
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
 from app.db.session import Base
@@ -49,7 +49,7 @@ class Player(Base):
     __tablename__ = "players"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    name = Column(String, index=True)
+    name = Column(String, index=True, unique=True) # Natural key for dataset imports
     role = Column(String)
     nationality = Column(String, default="India")
     age = Column(Integer, nullable=True)
@@ -66,6 +66,13 @@ class Player(Base):
     team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id", ondelete="SET NULL"), nullable=True)
     team = relationship("Team", back_populates="players")
 
+    # Catalog browsing: keyset order plus the common "unsold in set N" filter
+    __table_args__ = (
+        Index("idx_players_catalog", "set_number", "name", "id"),
+        Index("idx_players_sold_catalog", "is_sold", "set_number", "name", "id"),
+        Index("idx_players_team_id", "team_id"),
+    )
+
 class Bid(Base):
     __tablename__ = "bids"
 
@@ -78,7 +85,8 @@ class Bid(Base):
     # Optimization
     __table_args__ = (
         Index("idx_bids_player_id", "player_id"),
-        Index("idx_bids_timestamp", "timestamp"),
+        # (timestamp, id) so bid history can be keyset-paginated
+        Index("idx_bids_timestamp", "timestamp", "id"),
     )
 
 class AuctionState(Base):
@@ -95,4 +103,14 @@ class AuctionState(Base):
     remaining_players_count = Column(Integer, default=0) 
     
     # Concurrency Tracking
-    version = Column(Integer, default=0) 
+    version = Column(Integer, default=0)
+
+class AuctionCheckpoint(Base):
+    __tablename__ = "auction_checkpoints"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String, unique=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Compact capture of the mutable auction state (see checkpoint_service)
+    payload = Column(JSONB, nullable=False)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, Union
 from uuid import UUID
 from datetime import datetime
 
@@ -34,6 +34,8 @@ class PlayerCreate(PlayerBase):
 
 class PlayerResponse(PlayerBase):
     id: UUID
+    # Imported players may not be assigned to a set yet
+    set_number: Optional[int] = None
     is_sold: bool = False
     team_id: Optional[UUID] = None
     points: int = 0
@@ -64,3 +66,23 @@ class AuctionStateResponse(BaseModel):
 class BidRequest(BaseModel):
     team_id: Optional[UUID] = None
     amount: float
+    # AuctionState.version the bidder saw; enables the compare-and-swap path
+    expected_version: Optional[int] = None
+
+class SelectPlayerRequest(BaseModel):
+    player_id: UUID
+
+class WsCommand(BaseModel):
+    # Client -> server message on /ws; `id` is echoed in the ACK/NACK reply
+    id: Optional[Union[str, int]] = None
+    type: str
+    data: dict = {}
+
+class CheckpointRequest(BaseModel):
+    name: str
+
+class CheckpointResponse(BaseModel):
+    name: str
+    created_at: datetime
+    sold_players: int
+    bids: int
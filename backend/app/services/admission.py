@@ -0,0 +1,134 @@
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+from uuid import UUID
+
+from app.core.config import BID_RATE_LIMIT, BID_RATE_BURST
+from app.core.errors import BidRateLimited, StaleBidError
+from app.core.metrics import BIDS_SHED
+from app.websockets.manager import manager
+
+
+@dataclass
+class LotView:
+    """The live lot as of the last broadcast event this worker received."""
+    known: bool = False
+    active: bool = False
+    current_bid: float = 0
+    version: Optional[int] = None
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Consume one token; returns 0 on success or the seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class BidAdmission:
+    """
+    Cheap per-team checks in front of place_bid, so bids that cannot win
+    never queue for the AuctionState row lock.
+
+    The lot view only ever trails the database (it is updated from events
+    broadcast after commit), and a lot's bid only goes up, so a bid at or
+    below the view's current amount is certain to be rejected downstream.
+    Anything the view can't be sure about (no lot selected since startup or
+    the last reset) is passed through. Self-bids are left to the database:
+    a newer bid by another team may already have committed there.
+    """
+
+    def __init__(self, rate: float = BID_RATE_LIMIT, burst: int = BID_RATE_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.view = LotView()
+        self._buckets: Dict[str, TokenBucket] = {}
+        # (team, amount) pairs currently being processed: a repeat click
+        self._in_flight: Set[Tuple[str, float]] = set()
+
+    def prime(self, status: str, current_bid: float, version: int):
+        self.view = LotView(
+            known=True,
+            active=status == "ACTIVE",
+            current_bid=float(current_bid or 0),
+            version=version,
+        )
+
+    @contextmanager
+    def admit(self, amount: float, team_id: Optional[UUID], expected_version: Optional[int] = None):
+        if team_id is None:
+            # Admin price adjustments are never shed
+            yield
+            return
+
+        team = str(team_id)
+        self._check(team, amount, expected_version)
+
+        key = (team, amount)
+        self._in_flight.add(key)
+        try:
+            yield
+        finally:
+            self._in_flight.discard(key)
+
+    def _check(self, team: str, amount: float, expected_version: Optional[int]):
+        if self.rate > 0:
+            bucket = self._buckets.get(team)
+            if bucket is None:
+                bucket = self._buckets[team] = TokenBucket(self.rate, self.burst)
+            retry_after = bucket.take()
+            if retry_after:
+                self._shed("rate_limited")
+                raise BidRateLimited(retry_after)
+
+        if (team, amount) in self._in_flight:
+            self._shed("duplicate")
+            raise ValueError("Duplicate bid already in progress")
+
+        view = self.view
+        if not (view.known and view.active):
+            return
+        if expected_version is not None and view.version is not None and expected_version < view.version:
+            self._shed("stale_version")
+            raise StaleBidError(view.version)
+        if view.current_bid and amount <= view.current_bid:
+            self._shed("too_low")
+            raise ValueError(f"Bid too low. Current bid: {view.current_bid}")
+
+    def _shed(self, reason: str):
+        BIDS_SHED.labels(reason).inc()
+
+    def on_event(self, message: str):
+        # Broadcast listener: follows the lot on every worker
+        view = self.view
+        event = json.loads(message)
+        kind = event["type"]
+        if kind == "BID_UPDATE":
+            view.current_bid = float(event["data"]["amount"])
+            view.version = event.get("version", view.version)
+        elif kind == "PLAYER_SELECTED":
+            # A fresh lot: everything about the previous bid is known again
+            self.view = LotView(known=True, active=True, version=event.get("version", view.version))
+        elif kind == "PLAYER_SOLD":
+            view.active, view.current_bid = False, 0
+            view.version = event.get("version", view.version)
+        elif kind in ("AUCTION_RESET", "STATE_SYNC"):
+            # State rewound: stop judging until the next lot starts
+            self.view = LotView()
+
+
+bid_admission = BidAdmission()
+manager.add_listener(bid_admission.on_event)
@@ -1,8 +1,21 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func, desc
+from sqlalchemy import select, update, delete, func, text
 from app.models.all_models import Team, Player, Bid, AuctionState
+from app.schemas.schemas import AuctionStateResponse
 from app.websockets.manager import manager
-from uuid import UUID
+from app.services.live_engine import live_engine
+from app.services.bid_actor import auction_actor
+from app.services.leaderboard import leaderboard
+from app.services.admission import bid_admission
+from app.core.errors import StaleBidError
+from app.core.metrics import PLACE_BID_SECONDS, CONFIRM_SALE_SECONDS, STATE_LOCK_WAIT, BIDS_REJECTED, rejection_reason
+from uuid import UUID, uuid4
+from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from decimal import Decimal
+import time
+
+RESET_PURSE_BALANCE = 1200000000
 
 def get_bid_increment(current_bid_rupees: float) -> float:
     """Standard IPL-style bid increments in Rupees"""
@@ -26,83 +39,209 @@ async def get_auction_state(session: AsyncSession):
         await session.refresh(state)
     return state
 
-async def place_bid(amount: float, team_id: UUID, session: AsyncSession):
-    async with session.begin():
-        # 1. LOCK state
-        result = await session.execute(
-            select(AuctionState).where(AuctionState.id == 1).with_for_update()
+def live_lot():
+    """
+    The in-process lot when the memory engine or the actor owns bids. It is
+    ahead of the AuctionState row (bids are written after they are accepted),
+    so readers should prefer it.
+    """
+    if auction_actor.enabled:
+        return auction_actor.engine.lot
+    if live_engine.enabled:
+        return live_engine.lot
+    return None
+
+async def get_auction_state_view(session: AsyncSession) -> Dict[str, Any]:
+    """AuctionState as clients see it: the row, overlaid with the live lot when there is one."""
+    state = AuctionStateResponse.model_validate(await get_auction_state(session)).model_dump(mode="json")
+    lot = live_lot()
+    if lot is not None:
+        state.update(
+            status=lot.status,
+            current_player_id=str(lot.current_player_id) if lot.current_player_id else None,
+            current_bid=lot.current_bid,
+            current_bidder_id=str(lot.current_bidder_id) if lot.current_bidder_id else None,
+            remaining_players_count=lot.remaining_players_count,
+            version=lot.version,
         )
-        state = result.scalar_one()
-        
-        # 2. STRICT Validations inside Lock
-        if state.status != "ACTIVE":
-            raise ValueError("Auction not active")
-        
-        if state.current_player_id is None:
-             raise ValueError("No player selected")
-             
-        # Double check player status inside transaction
-        player = await session.get(Player, state.current_player_id)
-        if player.is_sold:
-             raise ValueError("Player already sold")
-
-        if team_id: # Real bid from a team
-            base_price_val = float(player.base_price)
-            current_bid_val = float(state.current_bid)
-            
-            # If current_bid is 0, first bid must be >= base_price
-            if current_bid_val == 0:
-                if amount < base_price_val:
-                    raise ValueError(f"First bid must be at least base price: ₹{int(base_price_val/100000)}L")
+    return state
+
+def state_change(name: str):
+    """
+    Guard for anything that changes more than the live bid (sale, selection,
+    reset, checkpoints): keeps the in-process bid engine, if one is running,
+    out of the way and reloads it afterwards.
+    """
+    if auction_actor.enabled:
+        return auction_actor.exclusive(name)
+    return live_engine.exclusive()
+
+async def lock_auction_state(session: AsyncSession, operation: str) -> AuctionState:
+    # SELECT ... FOR UPDATE on the singleton row; the wait is exported per operation
+    started = time.perf_counter()
+    result = await session.execute(
+        select(AuctionState).where(AuctionState.id == 1).with_for_update()
+    )
+    STATE_LOCK_WAIT.labels(operation).observe(time.perf_counter() - started)
+    return result.scalar_one()
+
+# One round trip for the whole bid: lock the state row, validate against the
+# current player and the bidding team, apply the bid and log it. Every rule
+# of the old multi-statement path is a branch of the CASE, in the same order,
+# so clients see the same rejection messages. `{lock}` is FOR UPDATE
+# (queue behind other writers) or FOR UPDATE SKIP LOCKED (optimistic bids:
+# a busy row returns no row at all, i.e. "outbid, refresh").
+# Player and team rows come from the statement snapshot; a sale that commits
+# while we wait for the lock also resets the state row, which we do see
+# fresh, and confirm_sale re-checks purse and squad size regardless.
+PLACE_BID_SQL = """
+    WITH s AS (
+        SELECT id, status, current_player_id, current_bid, current_bidder_id, version
+        FROM auction_state WHERE id = 1
+        {lock}
+    ),
+    p AS (
+        SELECT pl.is_sold, pl.base_price FROM players pl JOIN s ON pl.id = s.current_player_id
+    ),
+    t AS (
+        SELECT purse_balance, players_count FROM teams WHERE id = CAST(:team_id AS uuid)
+    ),
+    verdict AS (
+        SELECT s.*, p.base_price,
+            CASE
+                WHEN CAST(:expected_version AS integer) IS NOT NULL
+                     AND s.version <> CAST(:expected_version AS integer)      THEN 'stale'
+                WHEN s.status IS DISTINCT FROM 'ACTIVE'                       THEN 'not_active'
+                WHEN s.current_player_id IS NULL                              THEN 'no_player'
+                WHEN p.is_sold                                                THEN 'player_sold'
+                WHEN CAST(:team_id AS uuid) IS NULL                           THEN 'ok'  -- admin price adjustment
+                WHEN s.current_bid = 0 AND CAST(:amount AS numeric) < p.base_price THEN 'below_base_price'
+                WHEN s.current_bid > 0 AND CAST(:amount AS numeric) <= s.current_bid THEN 'bid_too_low'
+                WHEN s.current_bidder_id = CAST(:team_id AS uuid)             THEN 'self_bid'
+                WHEN NOT EXISTS (SELECT 1 FROM t)                             THEN 'unknown_team'
+                WHEN (SELECT purse_balance FROM t) < CAST(:amount AS numeric) THEN 'insufficient_funds'
+                WHEN (SELECT players_count FROM t) >= 25                      THEN 'squad_full'
+                ELSE 'ok'
+            END AS outcome
+        FROM s LEFT JOIN p ON true
+    ),
+    applied AS (
+        UPDATE auction_state a
+        SET current_bid = CAST(:amount AS numeric),
+            current_bidder_id = COALESCE(CAST(:team_id AS uuid), a.current_bidder_id),
+            version = a.version + 1
+        FROM verdict v
+        WHERE a.id = v.id AND v.outcome = 'ok'
+        RETURNING a.version, a.current_bid, a.current_bidder_id
+    ),
+    logged AS (
+        INSERT INTO bids (id, player_id, team_id, amount)
+        SELECT CAST(:bid_id AS uuid), v.current_player_id, CAST(:team_id AS uuid), CAST(:amount AS numeric)
+        FROM verdict v
+        WHERE v.outcome = 'ok' AND CAST(:team_id AS uuid) IS NOT NULL
+    )
+    SELECT v.outcome, v.base_price, v.current_player_id,
+           COALESCE(applied.version, v.version) AS version,
+           COALESCE(applied.current_bid, v.current_bid) AS current_bid,
+           CASE WHEN applied.version IS NULL THEN v.current_bidder_id ELSE applied.current_bidder_id END AS current_bidder_id
+    FROM verdict v LEFT JOIN applied ON true
+"""
+PLACE_BID_LOCKED = text(PLACE_BID_SQL.format(lock="FOR UPDATE"))
+PLACE_BID_CAS = text(PLACE_BID_SQL.format(lock="FOR UPDATE SKIP LOCKED"))
+
+@dataclass
+class BidOutcome:
+    """Result of the single-statement bid; `outcome` is 'ok' or a rejection code."""
+    outcome: str
+    version: int
+    current_bid: float
+    current_bidder_id: Optional[UUID]
+    current_player_id: Optional[UUID]
+    base_price: Optional[float]
+
+    def raise_for_rejection(self):
+        if self.outcome == "ok":
+            return
+        if self.outcome == "stale":
+            raise StaleBidError(self.version)
+        if self.outcome == "below_base_price":
+            raise ValueError(f"First bid must be at least base price: ₹{int(self.base_price/100000)}L")
+        if self.outcome == "bid_too_low":
+            raise ValueError(f"Bid too low. Current bid: {self.current_bid}")
+        raise ValueError(BID_REJECTIONS[self.outcome])
+
+BID_REJECTIONS = {
+    "not_active": "Auction not active",
+    "no_player": "No player selected",
+    "player_sold": "Player already sold",
+    "self_bid": "Self-bidding not allowed",
+    "unknown_team": "Unknown team",
+    "insufficient_funds": "Insufficient funds",
+    "squad_full": "Squad full",
+}
+
+async def place_bid(amount: float, team_id: UUID, session: AsyncSession, expected_version: Optional[int] = None):
+    # expected_version: the AuctionState.version the client bid against.
+    # When given, the bid is applied by compare-and-swap instead of waiting
+    # for the row lock.
+    started = time.perf_counter()
+    try:
+        # Per-team rate limit and bids that cannot win are shed before the lock
+        with bid_admission.admit(amount, team_id, expected_version):
+            if auction_actor.enabled:
+                state = await auction_actor.submit_bid(amount, team_id, expected_version)
+            elif live_engine.enabled:
+                state = await live_engine.place_bid(amount, team_id, expected_version)
             else:
-                increment = get_bid_increment(current_bid_val)
-                if amount < (current_bid_val + increment) and amount != current_bid_val + increment:
-                     # Allow slightly less if it matches strictly (float precision)
-                     pass 
-                if amount <= current_bid_val:
-                    raise ValueError(f"Bid too low. Current bid: {current_bid_val}")
-        else: # Admin price adjustment
-            pass
+                state = await _place_bid_statement(amount, team_id, expected_version, session)
+    except Exception as e:
+        PLACE_BID_SECONDS.labels("rejected").observe(time.perf_counter() - started)
+        BIDS_REJECTED.labels(rejection_reason(e)).inc()
+        raise
+    PLACE_BID_SECONDS.labels("accepted").observe(time.perf_counter() - started)
 
-        if team_id:
-            if state.current_bidder_id == team_id:
-                 raise ValueError("Self-bidding not allowed")
-                 
-            team = await session.get(Team, team_id)
-            if team.purse_balance < amount:
-                 raise ValueError("Insufficient funds")
-            if team.players_count >= 25:
-                 raise ValueError("Squad full")
-        
-        # 3. Update
-        state.current_bid = amount
-        if team_id:
-            state.current_bidder_id = team_id
-        
-        state.version += 1
-        
-        # 4. Log (Only if team provided)
-        if team_id:
-            bid = Bid(
-                player_id=state.current_player_id, 
-                team_id=team_id, 
-                amount=amount
-            )
-            session.add(bid)
-        
     # 5. Broadcast (After Commit)
-    await manager.broadcast("BID_UPDATE", { "amount": amount, "team_id": str(team_id) if team_id else None })
+    await manager.broadcast("BID_UPDATE", { "amount": amount, "team_id": str(team_id) if team_id else None }, version=state.version, teams=[team_id])
     return state
 
+async def _place_bid_statement(amount: float, team_id: Optional[UUID], expected_version: Optional[int], session: AsyncSession) -> BidOutcome:
+    statement = PLACE_BID_LOCKED if expected_version is None else PLACE_BID_CAS
+    params = {
+        "amount": Decimal(str(amount)),
+        "team_id": team_id,
+        "expected_version": expected_version,
+        "bid_id": uuid4(),
+    }
+    # Lock wait and work are one statement here, so it is timed as a whole
+    # by PLACE_BID_SECONDS rather than as a lock wait
+    async with session.begin():
+        row = (await session.execute(statement, params)).one_or_none()
+        if row is None:
+            # SKIP LOCKED: another writer holds the row right now
+            raise StaleBidError()
+        outcome = BidOutcome(
+            outcome=row.outcome,
+            version=row.version,
+            current_bid=float(row.current_bid or 0),
+            current_bidder_id=row.current_bidder_id,
+            current_player_id=row.current_player_id,
+            base_price=float(row.base_price) if row.base_price is not None else None,
+        )
+        # Rejections write nothing, so raising (and rolling back) is free
+        outcome.raise_for_rejection()
+    return outcome
+
 async def confirm_sale(session: AsyncSession):
+    async with state_change("confirm_sale"):
+        return await _confirm_sale(session)
+
+async def _confirm_sale(session: AsyncSession):
     sold_price = 0
     winner = None
+    started = time.perf_counter()
     async with session.begin(): # Start Transaction
         # 1. Lock Auction State (Pessimistic Lock)
-        result = await session.execute(
-            select(AuctionState).where(AuctionState.id == 1).with_for_update()
-        )
-        state = result.scalar_one()
+        state = await lock_auction_state(session, "confirm_sale")
 
         if not state.current_bidder_id:
             raise Exception("No active bid to confirm")
@@ -145,70 +284,110 @@ async def confirm_sale(session: AsyncSession):
             # Get winner for broadcast inside logic block but broadcast later
             # Logic for winner determination can be added here
             pass
+    CONFIRM_SALE_SECONDS.observe(time.perf_counter() - started)
 
     # 8. Post-Commit Broadcast (Safe)
     await manager.broadcast("PLAYER_SOLD", {
         "player_id": str(player.id),
         "sold_price": sold_price,
         "team_id": str(team.id)
-    })
+    }, version=state.version, teams=[team.id])
     
-    # Leaderboard update
-    leaderboard = await get_leaderboard(session)
-    await manager.broadcast("LEADERBOARD_UPDATE", leaderboard)
+    # Leaderboard update: only the rows whose rank or numbers changed
+    if not leaderboard.loaded:
+        await leaderboard.reconcile(session)
+    delta = leaderboard.update_team(
+        str(team.id),
+        state.version,
+        total_points=team.total_points,
+        purse_balance=float(team.purse_balance),
+        players_count=team.players_count,
+    )
+    if delta:
+        await manager.broadcast("LEADERBOARD_DELTA", delta, teams=[row["id"] for row in delta["teams"]])
     
     if winner:
          await manager.broadcast("AUCTION_COMPLETED", { "winner": winner })
          
     return state
 
+def bid_log_query():
+    # Bid history rows as shown to clients; newest first unless re-ordered
+    return (
+        select(Bid.id, Player.name.label("player_name"), Team.code.label("team_code"), Bid.amount, Bid.timestamp)
+        .join(Player, Bid.player_id == Player.id)
+        .join(Team, Bid.team_id == Team.id)
+    )
+
+def bid_log_entry(row) -> dict:
+    return {
+        "id": str(row.id),
+        "player_name": row.player_name,
+        "team_code": row.team_code,
+        "amount": float(row.amount) / 100000,
+        "timestamp": row.timestamp.isoformat()
+    }
+
 async def get_leaderboard(session: AsyncSession):
-    # This corresponds to the DENSE_RANK logic, implemented in Python or raw SQL
-    # SQLAlchemy way:
-    query = select(Team).order_by(desc(Team.total_points), desc(Team.purse_balance))
-    result = await session.execute(query)
-    teams = result.scalars().all()
-    
-    leaderboard = []
-    rank = 1
-    for team in teams:
-        leaderboard.append({
-            "rank": rank,
-            "id": str(team.id),
-            "name": team.name,
-            "code": team.code,
-            "logo_url": team.logo_url,
-            "color": team.color,
-            "primary_color": team.primary_color,
-            "secondary_color": team.secondary_color,
-            "total_points": team.total_points,
-            "purse_balance": float(team.purse_balance),
-            "players_count": team.players_count
-        })
-        rank += 1
-    return leaderboard
+    # Served from the in-memory leaderboard; the first call loads it with a
+    # DENSE_RANK() query. Tied teams (same points and purse) share a rank.
+    if not leaderboard.loaded:
+        await leaderboard.reconcile(session)
+    return leaderboard.rows()
+
+async def select_player(player_id: UUID, session: AsyncSession):
+    async with state_change("select_player"):
+        async with session.begin():
+            state = await lock_auction_state(session, "select_player")
+
+            if state.status == "ACTIVE" and state.current_bidder_id:
+                raise ValueError("Cannot switch player while bid is active")
+
+            player = await session.get(Player, player_id)
+            if not player:
+                raise LookupError("Player not found")
+            if player.is_sold:
+                raise ValueError("Player already sold")
+
+            state.current_player_id = player_id
+            state.status = "ACTIVE"
+            state.current_bid = 0
+            state.current_bidder_id = None
+            # A new lot is a new version: late bids aimed at the previous
+            # player must not compare-and-swap onto this one
+            state.version += 1
+
+    await manager.broadcast("PLAYER_SELECTED", {"player_id": str(player_id)}, version=state.version)
+    return state
 
 async def reset_auction_logic(session: AsyncSession):
+    async with state_change("reset"):
+        version = await _reset_auction(session)
+
+    # Every worker (this one included) resets its leaderboard from the event
+    await manager.broadcast("AUCTION_RESET", {"purse_balance": RESET_PURSE_BALANCE}, version=version)
+    return True
+
+async def _reset_auction(session: AsyncSession) -> int:
     async with session.begin():
         # 1. Pre-calculate count
         count = await session.scalar(select(func.count(Player.id)))
         
         # 2. Reset Tables
-        await session.execute(update(Team).values(purse_balance=1200000000, total_points=0, players_count=0))
+        await session.execute(update(Team).values(purse_balance=RESET_PURSE_BALANCE, total_points=0, players_count=0))
         await session.execute(update(Player).values(is_sold=False, team_id=None))
         await session.execute(delete(Bid))
         
         # 3. Reset State
-        await session.execute(
+        version = await session.scalar(
             update(AuctionState).where(AuctionState.id == 1).values(
                 status="WAITING", 
                 current_bid=0, 
                 current_bidder_id=None,
                 current_player_id=None,
                 remaining_players_count=count, 
-                version=0
-            )
+                # Never rewound: old version numbers must not become valid again
+                version=AuctionState.version + 1
+            ).returning(AuctionState.version)
         )
-    
-    await manager.broadcast("AUCTION_RESET", {})
-    return True
+    return version
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Union
+from uuid import UUID
+
+from app.core.config import AUCTION_ENGINE, BID_ACTOR_BATCH_SIZE, BID_ACTOR_TIMEOUT
+from app.core.metrics import ACTOR_QUEUE_DEPTH, ACTOR_BATCH_SIZE
+from app.db.session import async_session_maker
+from app.services.live_engine import LiveAuctionEngine, LiveLot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BidCommand:
+    amount: float
+    team_id: Optional[UUID]
+    expected_version: Optional[int]
+    future: asyncio.Future
+    # Set once the actor applies it to the lot: it is then committed (or
+    # failed) with its batch and can no longer be withdrawn
+    taken: bool = False
+
+
+@dataclass
+class ExclusiveCommand:
+    """Sale, player selection, reset...: the caller runs it while the actor waits."""
+    name: str
+    started: asyncio.Event = field(default_factory=asyncio.Event)
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+Command = Union[BidCommand, ExclusiveCommand]
+
+
+class AuctionActor:
+    """
+    Single-writer command queue that owns the live lot.
+
+    Handlers submit commands and await a future; one consumer task runs them
+    strictly in arrival order, so concurrent bids never meet in a lock
+    convoy. Consecutive bid commands are validated one by one against the
+    in-memory lot and the accepted ones are committed in one transaction
+    (group commit) before any of their futures resolve: a bid is only
+    acknowledged once it is durable.
+
+    Anything that changes more than the live bid goes through `exclusive()`,
+    which queues like any other command, holds the actor while the caller's
+    transaction runs, and reloads the lot from the database afterwards.
+    """
+
+    def __init__(self, batch_size: int = BID_ACTOR_BATCH_SIZE, timeout: float = BID_ACTOR_TIMEOUT):
+        self.enabled = False
+        self.batch_size = batch_size
+        self.timeout = timeout
+        # Set when the lot may not match the database (a failed commit or
+        # reload); bids are refused until a reload succeeds
+        self._stale = False
+        self.engine = LiveAuctionEngine()  # lot, ledger and persistence; its own flusher is never started
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._carry: Optional[Command] = None
+
+    async def start(self):
+        await self.reload()
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        self.enabled = True
+        ACTOR_QUEUE_DEPTH.set_function(self._queue.qsize)
+
+    async def stop(self):
+        if not self.enabled:
+            return
+        if self._task.done():
+            self.enabled = False
+            return
+        # Let everything already queued finish first
+        async with self.exclusive("stop"):
+            self.enabled = False
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def reload(self):
+        async with async_session_maker() as session:
+            await self.engine.load(session)
+
+    def _check_running(self):
+        if self._task is None or self._task.done():
+            raise RuntimeError("Bid engine unavailable, please retry")
+
+    async def submit_bid(self, amount: float, team_id: Optional[UUID], expected_version: Optional[int] = None) -> LiveLot:
+        self._check_running()
+        command = BidCommand(amount, team_id, expected_version, asyncio.get_running_loop().create_future())
+        self._queue.put_nowait(command)
+        try:
+            # Shielded: a timeout must not cancel a bid the actor is already committing
+            return await asyncio.wait_for(asyncio.shield(command.future), self.timeout)
+        except asyncio.TimeoutError:
+            if command.taken:
+                # Giving up now would leave a saved bid nobody hears about
+                return await command.future
+            # Still queued: withdraw it, the actor skips cancelled commands
+            command.future.cancel()
+            raise RuntimeError("Bid not confirmed in time, please refresh")
+
+    @asynccontextmanager
+    async def exclusive(self, name: str = "exclusive"):
+        """Hold the actor while the caller changes state in the database. No-op when disabled."""
+        if not self.enabled:
+            yield
+            return
+        self._check_running()
+        command = ExclusiveCommand(name)
+        self._queue.put_nowait(command)
+        try:
+            await asyncio.wait_for(command.started.wait(), self.timeout)
+        except asyncio.TimeoutError:
+            # Release the actor if it reaches the command after all
+            command.done.set()
+            raise RuntimeError(f"Bid engine busy, {name} not started")
+        try:
+            yield
+        finally:
+            command.done.set()
+
+    async def _next(self) -> Command:
+        if self._carry is not None:
+            command, self._carry = self._carry, None
+            return command
+        return await self._queue.get()
+
+    async def _reload_guarded(self, reason: str) -> bool:
+        try:
+            await self.reload()
+        except Exception:
+            logger.exception("Bid actor: reload after %s failed", reason)
+            self._stale = True
+            return False
+        self._stale = False
+        return True
+
+    async def _run(self):
+        while True:
+            command = await self._next()
+            try:
+                await self._handle(command)
+            except Exception:
+                # Keep the single writer alive whatever one command did
+                logger.exception("Bid actor: command failed")
+
+    async def _handle(self, command: Command):
+        if isinstance(command, ExclusiveCommand):
+            command.started.set()
+            await command.done.wait()
+            await self._reload_guarded(command.name)
+            return
+
+        # Take the run of bids queued behind this one; stop at the next
+        # exclusive command so it still sees every earlier bid committed
+        batch: List[BidCommand] = [command]
+        while len(batch) < self.batch_size and not self._queue.empty():
+            queued = self._queue.get_nowait()
+            if isinstance(queued, ExclusiveCommand):
+                self._carry = queued
+                break
+            batch.append(queued)
+        try:
+            if self._stale and not await self._reload_guarded("earlier failure"):
+                raise RuntimeError("Bid engine unavailable, please retry")
+            await self._process(batch)
+        except Exception as e:
+            for command in batch:
+                if not command.future.done():
+                    command.future.set_exception(e)
+
+    async def _process(self, batch: List[BidCommand]):
+        accepted = []
+        for command in batch:
+            if command.future.cancelled():
+                continue
+            command.taken = True
+            try:
+                write = self.engine.apply_bid(command.amount, command.team_id, command.expected_version)
+            except Exception as e:
+                command.future.set_exception(e)
+                continue
+            accepted.append((command, write, replace(self.engine.lot)))
+
+        if not accepted:
+            return
+        try:
+            await self.engine.persist([write for _, write, _ in accepted])
+        except Exception:
+            logger.exception("Bid actor: commit of %d bid(s) failed", len(accepted))
+            # The in-memory lot ran ahead of the database; take it back
+            await self._reload_guarded("failed commit")
+            for command, _, _ in accepted:
+                if not command.future.done():
+                    command.future.set_exception(RuntimeError("Bid could not be saved, please retry"))
+            return
+
+        ACTOR_BATCH_SIZE.observe(len(accepted))
+        for command, _, lot in accepted:
+            if not command.future.done():
+                command.future.set_result(lot)
+
+
+auction_actor = AuctionActor()
+
+
+def actor_mode_enabled() -> bool:
+    return AUCTION_ENGINE == "actor"
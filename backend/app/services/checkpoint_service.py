@@ -0,0 +1,145 @@
+import uuid
+
+from sqlalchemy import select, delete, text, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.all_models import AuctionCheckpoint
+from app.services.auction_service import lock_auction_state, state_change
+from app.websockets.manager import manager
+
+# Everything an auction mutates, captured server-side in one statement as
+# positional arrays (no per-row keys):
+#   teams   [id, purse_balance, total_points, players_count]
+#   players [id, team_id, sold_price]            (sold players only)
+#   bids    [id, player_id, team_id, amount, timestamp]
+#   state   {status, current_player_id, current_bid, current_bidder_id, remaining_players_count}
+CAPTURE_SQL = text("""
+    INSERT INTO auction_checkpoints (id, name, created_at, payload)
+    SELECT :id, :name, now(), jsonb_build_object(
+        'teams', (SELECT coalesce(jsonb_agg(jsonb_build_array(id, purse_balance, total_points, players_count)), '[]')
+                  FROM teams),
+        'players', (SELECT coalesce(jsonb_agg(jsonb_build_array(id, team_id, sold_price)), '[]')
+                    FROM players WHERE is_sold),
+        'bids', (SELECT coalesce(jsonb_agg(jsonb_build_array(id, player_id, team_id, amount, timestamp)), '[]')
+                 FROM bids),
+        'state', (SELECT jsonb_build_object(
+                      'status', status,
+                      'current_player_id', current_player_id,
+                      'current_bid', current_bid,
+                      'current_bidder_id', current_bidder_id,
+                      'remaining_players_count', remaining_players_count)
+                  FROM auction_state WHERE id = 1)
+    )
+    ON CONFLICT (name) DO UPDATE SET created_at = now(), payload = EXCLUDED.payload
+    RETURNING created_at,
+              jsonb_array_length(payload->'players') AS sold_players,
+              jsonb_array_length(payload->'bids') AS bids
+""")
+
+# Restore statements: each one is a single set-based pass driven by the
+# stored payload, so the whole rewind is a handful of statements in one
+# transaction regardless of table size.
+RESTORE_TEAMS_SQL = text("""
+    UPDATE teams t
+    SET purse_balance = (e->>1)::numeric, total_points = (e->>2)::int, players_count = (e->>3)::int
+    FROM auction_checkpoints c, jsonb_array_elements(c.payload->'teams') e
+    WHERE c.name = :name AND t.id = (e->>0)::uuid
+""")
+
+RESTORE_PLAYERS_SQL = text("""
+    WITH sold AS (
+        SELECT (e->>0)::uuid AS id, (e->>1)::uuid AS team_id, (e->>2)::numeric AS sold_price
+        FROM auction_checkpoints c, jsonb_array_elements(c.payload->'players') e
+        WHERE c.name = :name
+    )
+    UPDATE players p
+    SET is_sold = sold.id IS NOT NULL, team_id = sold.team_id, sold_price = sold.sold_price
+    FROM players p2 LEFT JOIN sold ON sold.id = p2.id
+    -- reset clears is_sold and team_id but leaves sold_price behind
+    WHERE p.id = p2.id AND (p.is_sold OR p.team_id IS NOT NULL OR p.sold_price IS NOT NULL OR sold.id IS NOT NULL)
+""")
+
+RESTORE_BIDS_DELETE_SQL = text("""
+    DELETE FROM bids
+    WHERE id NOT IN (  -- hashed subplan: one pass over each side
+        SELECT (e->>0)::uuid
+        FROM auction_checkpoints c, jsonb_array_elements(c.payload->'bids') e
+        WHERE c.name = :name
+    )
+""")
+
+RESTORE_BIDS_INSERT_SQL = text("""
+    INSERT INTO bids (id, player_id, team_id, amount, timestamp)
+    SELECT (e->>0)::uuid, (e->>1)::uuid, (e->>2)::uuid, (e->>3)::numeric, (e->>4)::timestamptz
+    FROM auction_checkpoints c, jsonb_array_elements(c.payload->'bids') e
+    WHERE c.name = :name
+    ON CONFLICT (id) DO NOTHING
+""")
+
+# version moves forward, never back, so clients holding an older version
+# can't mistake restored state for something they already saw
+RESTORE_STATE_SQL = text("""
+    UPDATE auction_state a
+    SET status = c.payload->'state'->>'status',
+        current_player_id = (c.payload->'state'->>'current_player_id')::uuid,
+        current_bid = (c.payload->'state'->>'current_bid')::numeric,
+        current_bidder_id = (c.payload->'state'->>'current_bidder_id')::uuid,
+        remaining_players_count = (c.payload->'state'->>'remaining_players_count')::int,
+        version = a.version + 1
+    FROM auction_checkpoints c
+    WHERE c.name = :name AND a.id = 1
+""")
+
+
+async def create_checkpoint(name: str, session: AsyncSession):
+    async with state_change("create_checkpoint"):
+        async with session.begin():
+            # Holding the state lock keeps bids and sales out while we capture
+            await lock_auction_state(session, "create_checkpoint")
+            row = (await session.execute(CAPTURE_SQL, {"id": uuid.uuid4(), "name": name})).one()
+
+    checkpoint = {"name": name, "created_at": row.created_at, "sold_players": row.sold_players, "bids": row.bids}
+    # Operator consoles only (admin topic)
+    await manager.broadcast("CHECKPOINT_SAVED", checkpoint)
+    return checkpoint
+
+
+async def list_checkpoints(session: AsyncSession):
+    result = await session.execute(
+        select(
+            AuctionCheckpoint.name,
+            AuctionCheckpoint.created_at,
+            literal_column("jsonb_array_length(payload->'players')").label("sold_players"),
+            literal_column("jsonb_array_length(payload->'bids')").label("bids"),
+        ).order_by(AuctionCheckpoint.created_at.desc())
+    )
+    return [dict(row._mapping) for row in result.all()]
+
+
+async def restore_checkpoint(name: str, session: AsyncSession):
+    async with state_change("restore_checkpoint"):
+        async with session.begin():
+            await lock_auction_state(session, "restore_checkpoint")
+            exists = await session.scalar(select(AuctionCheckpoint.id).where(AuctionCheckpoint.name == name))
+            if not exists:
+                raise LookupError("Checkpoint not found")
+
+            params = {"name": name}
+            await session.execute(RESTORE_TEAMS_SQL, params)
+            await session.execute(RESTORE_PLAYERS_SQL, params)
+            await session.execute(RESTORE_BIDS_DELETE_SQL, params)
+            await session.execute(RESTORE_BIDS_INSERT_SQL, params)
+            await session.execute(RESTORE_STATE_SQL, params)
+
+    # Clients treat STATE_SYNC as "reload everything"; every worker's
+    # leaderboard reloads from the DB on next use
+    await manager.broadcast("STATE_SYNC", {"reason": "checkpoint_restored", "checkpoint": name})
+    return True
+
+
+async def delete_checkpoint(name: str, session: AsyncSession):
+    async with session.begin():
+        result = await session.execute(delete(AuctionCheckpoint).where(AuctionCheckpoint.name == name))
+    if result.rowcount == 0:
+        raise LookupError("Checkpoint not found")
+    await manager.broadcast("CHECKPOINT_DELETED", {"name": name})
@@ -0,0 +1,182 @@
+import json
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.all_models import AuctionState, Player, Team
+
+# Descriptive columns a re-import may refresh. Auction outcomes (purse,
+# points won, sold flags, owning team, bids) are never touched, so re-seeding
+# before a rehearsal keeps whatever has already happened.
+TEAM_UPSERT_COLUMNS = ("name", "logo_url", "color", "primary_color", "secondary_color")
+PLAYER_UPSERT_COLUMNS = ("role", "nationality", "age", "image", "points", "set_number", "set_name", "base_price")
+
+EXCEL_SET_NAMES = {
+    "BAT_WKB": "Batters & Wicketkeepers",
+    "BOWL": "Bowlers",
+    "ALL_ROUNDERS": "All-Rounders",
+}
+
+
+def read_json_dataset(path: str):
+    """Teams and players from ipl_auction_dataset.json."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    teams = [{
+        "name": t["name"],
+        "code": t["code"],
+        "logo_url": t.get("logo_url"),
+        "color": t.get("color"),
+        "primary_color": t.get("primary_color"),
+        "secondary_color": t.get("secondary_color"),
+        "purse_balance": t.get("purse_balance", 1200000000),
+    } for t in data.get("teams", [])]
+
+    def players():
+        for p in data.get("players", []):
+            yield {
+                "name": p["name"],
+                "role": p.get("role", "BATSMAN"),
+                "nationality": p.get("nationality", "India"),
+                "age": p.get("age"),
+                # The dataset calls the headshot `image_url`; the column is `image`
+                "image": p.get("image_url") or p.get("image"),
+                "points": p.get("points", 0),
+                "set_number": p.get("set_number", 1),
+                "set_name": p.get("set_name", "Marquee Players"),
+                # Handle the typo in JSON (base_portion vs base_price)
+                "base_price": p.get("base_price", p.get("base_portion", 5000000)),
+            }
+
+    return teams, players()
+
+
+def read_seed_players():
+    """Players from seed_data_v2.PLAYERS (no teams)."""
+    from seed_data_v2 import PLAYERS, PLACEHOLDER_IMG
+
+    def players():
+        for p in PLAYERS:
+            default_lakhs = 200 if p["set_number"] == 1 else 50 if p["set_number"] <= 6 else 20
+            yield {
+                "name": p["name"],
+                "role": p["role"],
+                "nationality": p["nationality"],
+                "age": p["age"],
+                "image": PLACEHOLDER_IMG,
+                "points": p["points"],
+                "set_number": p["set_number"],
+                "set_name": p["set_name"],
+                "base_price": p.get("base_price_lakhs", default_lakhs) * 100000,
+            }
+
+    return [], players()
+
+
+def read_excel_players(path: str):
+    """Players from IPL_2025_FINAL_OUTPUT.xlsx, one auction set per sheet."""
+    import openpyxl
+
+    def players():
+        # read_only streams rows instead of building the whole sheet in memory
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            for set_number, sheet in enumerate(workbook.worksheets, start=1):
+                rows = sheet.iter_rows(values_only=True)
+                header = [str(h).strip() if h is not None else "" for h in next(rows, [])]
+                for values in rows:
+                    row = dict(zip(header, values))
+                    if not row.get("NAME"):
+                        continue
+                    base_lakhs = row.get("BASE PRICE (LAKHS)") or 20
+                    yield {
+                        "name": str(row["NAME"]).strip().title(),
+                        "role": str(row.get("ROLE") or "").strip(),
+                        "nationality": str(row.get("COUNTRY") or "India").strip(),
+                        "age": int(row["AGE"]) if row.get("AGE") else None,
+                        "image": row.get("IMAGE PATH"),
+                        "points": 0,
+                        "set_number": set_number,
+                        "set_name": EXCEL_SET_NAMES.get(sheet.title, sheet.title),
+                        "base_price": int(base_lakhs) * 100000,
+                    }
+        finally:
+            workbook.close()
+
+    return [], players()
+
+
+def batched(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def upsert_teams(session: AsyncSession, teams: List[Dict[str, Any]]) -> int:
+    if not teams:
+        return 0
+    stmt = insert(Team).values(teams)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Team.code],
+        set_={c: stmt.excluded[c] for c in TEAM_UPSERT_COLUMNS},
+    )
+    await session.execute(stmt)
+    return len(teams)
+
+
+async def upsert_players(session: AsyncSession, players: List[Dict[str, Any]]) -> int:
+    # Natural key is the player name (unique ix_players_name)
+    stmt = insert(Player).values(players)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Player.name],
+        set_={c: stmt.excluded[c] for c in PLAYER_UPSERT_COLUMNS},
+    )
+    await session.execute(stmt)
+    return len(players)
+
+
+async def import_dataset(session: AsyncSession, teams, players, batch_size: int = 500) -> Dict[str, Any]:
+    """
+    Idempotently upsert teams and players, committing once per batch.
+    Returns row counts and per-phase timings in seconds.
+    """
+    timings = {}
+    started = time.perf_counter()
+
+    team_count = await upsert_teams(session, teams)
+    await session.commit()
+    timings["teams"] = time.perf_counter() - started
+
+    phase = time.perf_counter()
+    player_count = 0
+    for batch in batched(players, batch_size):
+        # A name repeated inside one statement cannot be upserted twice
+        batch = list({p["name"]: p for p in batch}.values())
+        player_count += await upsert_players(session, batch)
+        await session.commit()
+    timings["players"] = time.perf_counter() - phase
+
+    # Keep the auction's remaining count honest (new players arrive unsold)
+    phase = time.perf_counter()
+    unsold = await session.scalar(select(func.count(Player.id)).where(Player.is_sold == False))
+    result = await session.execute(
+        update(AuctionState).where(AuctionState.id == 1).values(remaining_players_count=unsold)
+    )
+    if result.rowcount == 0:
+        session.add(AuctionState(id=1, status="WAITING", remaining_players_count=unsold))
+    await session.commit()
+    timings["state"] = time.perf_counter() - phase
+    timings["total"] = time.perf_counter() - started
+
+    return {
+        "teams": team_count,
+        "players": player_count,
+        "unsold_players": unsold,
+        "timings": timings,
+        "players_per_second": player_count / timings["players"] if timings["players"] else None,
+    }
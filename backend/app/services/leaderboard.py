@@ -0,0 +1,189 @@
+import bisect
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.websockets.manager import manager
+
+# Fields that can change on a sale; static team fields (name, logo, colours)
+# are only shipped with the full leaderboard.
+DELTA_FIELDS = ("rank", "total_points", "purse_balance", "players_count")
+
+STATE_VERSION_QUERY = text("SELECT version FROM auction_state WHERE id = 1")
+
+DENSE_RANK_QUERY = text("""
+    SELECT id, name, code, logo_url, color, primary_color, secondary_color,
+           total_points, purse_balance, players_count,
+           DENSE_RANK() OVER (ORDER BY total_points DESC, purse_balance DESC) AS rank
+    FROM teams
+""")
+
+
+class Leaderboard:
+    """
+    In-memory leaderboard ordered by (total_points, purse_balance), both
+    descending. Teams tied on both share a dense rank.
+
+    `_order` is a sorted list of `(-points, -purse, id)` keys, so moving one
+    team after a sale is a bisect.
+
+    Versions are AuctionState.version values, so every worker agrees on
+    them: a sale's delta carries the version the sale committed at. Each
+    team row also carries the version its numbers were written at, and a
+    worker mirroring deltas only takes a row newer than the one it holds,
+    so deltas that arrive late or out of order still converge. A client
+    whose last seen version is not the delta's `base_version` must fetch
+    `/api/teams/leaderboard` again.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.loaded = False
+        self._teams: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._order: List[Tuple[int, float, str]] = []
+        self._ranks: Dict[str, int] = {}
+
+    @staticmethod
+    def _key(row: Dict[str, Any]) -> Tuple[int, float, str]:
+        return (-(row["total_points"] or 0), -row["purse_balance"], row["id"])
+
+    def load(self, rows: List[Dict[str, Any]], version: int = 0):
+        self._teams = {row["id"]: dict(row) for row in rows}
+        self._versions = {team_id: version for team_id in self._teams}
+        self._order = sorted(self._key(row) for row in self._teams.values())
+        self._ranks = self._dense_ranks()
+        self.version = max(self.version, version)
+        self.loaded = True
+
+    async def reconcile(self, session: AsyncSession):
+        """Load from the DB and check our ranking against Postgres DENSE_RANK()."""
+        # Version first: a sale committing in between is then at most
+        # re-applied by its own delta, never missed
+        version = await session.scalar(STATE_VERSION_QUERY) or 0
+        result = await session.execute(DENSE_RANK_QUERY)
+        rows, sql_ranks = [], {}
+        for r in result.mappings():
+            team_id = str(r["id"])
+            rows.append({
+                "id": team_id,
+                "name": r["name"],
+                "code": r["code"],
+                "logo_url": r["logo_url"],
+                "color": r["color"],
+                "primary_color": r["primary_color"],
+                "secondary_color": r["secondary_color"],
+                "total_points": r["total_points"] or 0,
+                "purse_balance": float(r["purse_balance"] or 0),
+                "players_count": r["players_count"] or 0,
+            })
+            sql_ranks[team_id] = r["rank"]
+
+        self.load(rows, version)
+        mismatched = [t for t, rank in sql_ranks.items() if self._ranks.get(t) != rank]
+        if mismatched:
+            print(f"Leaderboard: {len(mismatched)} rank(s) differ from DENSE_RANK(); using SQL order")
+            self._ranks = dict(sql_ranks)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return [{"rank": self._ranks[team_id], **self._teams[team_id]} for _, _, team_id in self._order]
+
+    def update_team(self, team_id: str, version: int, **values) -> Optional[Dict[str, Any]]:
+        """Apply new numbers for one team, written at `version`, and return the delta event, if any."""
+        team = self._teams.get(team_id)
+        if team is None:
+            return None
+
+        self._move(team_id, values)
+        self._versions[team_id] = version
+        return self._publish({team_id}, version)
+
+    def add_team(self, row: Dict[str, Any], version: int) -> Dict[str, Any]:
+        """Insert (or refresh) a team and return the delta event, which carries its full row."""
+        row = dict(row)
+        if row["id"] in self._teams:
+            self._move(row["id"], row)
+        else:
+            self._teams[row["id"]] = row
+            bisect.insort(self._order, self._key(row))
+        self._versions[row["id"]] = version
+        return self._publish({row["id"]}, version, added={row["id"]})
+
+    def reset(self, purse_balance: float, version: int):
+        for team in self._teams.values():
+            team.update(total_points=0, purse_balance=purse_balance, players_count=0)
+        self._versions = {team_id: version for team_id in self._teams}
+        self._order = sorted(self._key(team) for team in self._teams.values())
+        self._ranks = self._dense_ranks()
+        # Clients reload everything after a reset, so just move the baseline
+        self.version = max(self.version, version)
+
+    def apply_delta(self, delta: Dict[str, Any]):
+        """Mirror a LEADERBOARD_DELTA, keeping each team row only if it is newer than ours."""
+        for row in delta["teams"]:
+            team_id = row["id"]
+            if team_id not in self._teams:
+                if "name" in row:  # a new team: the delta carries its full row
+                    self._teams[team_id] = {k: v for k, v in row.items() if k not in ("rank", "version")}
+                    bisect.insort(self._order, self._key(self._teams[team_id]))
+                    self._versions[team_id] = row["version"]
+                continue
+            if row["version"] <= self._versions.get(team_id, 0):
+                continue  # our own write, a duplicate, or older than what we hold
+            self._move(team_id, {f: row[f] for f in DELTA_FIELDS if f != "rank"})
+            self._versions[team_id] = row["version"]
+        self._ranks = self._dense_ranks()
+        self.version = max(self.version, delta["version"])
+
+    def _move(self, team_id: str, values: Dict[str, Any]):
+        team = self._teams[team_id]
+        old_key = self._key(team)
+        team.update(values)
+        new_key = self._key(team)
+        if new_key != old_key:
+            del self._order[bisect.bisect_left(self._order, old_key)]
+            bisect.insort(self._order, new_key)
+
+    def _dense_ranks(self) -> Dict[str, int]:
+        ranks, rank, previous = {}, 0, None
+        for points, purse, team_id in self._order:
+            if (points, purse) != previous:
+                rank += 1
+                previous = (points, purse)
+            ranks[team_id] = rank
+        return ranks
+
+    def _publish(self, touched: set, version: int, added: set = frozenset()) -> Dict[str, Any]:
+        # A move can shift the dense rank of every team between the old and
+        # new position, so compare all ranks (n is the number of franchises).
+        old_ranks, self._ranks = self._ranks, self._dense_ranks()
+        changed = touched | {t for t, rank in self._ranks.items() if old_ranks.get(t) != rank}
+        base_version, self.version = self.version, max(self.version, version)
+        return {
+            "version": version,
+            "base_version": base_version,
+            "teams": [self._delta_row(t, full=t in added) for t in sorted(changed, key=lambda t: self._ranks[t])],
+        }
+
+    def _delta_row(self, team_id: str, full: bool = False) -> Dict[str, Any]:
+        # Static fields only for a team other workers and clients have not seen
+        fields = self._teams[team_id] if full else {f: self._teams[team_id][f] for f in DELTA_FIELDS if f != "rank"}
+        return {"id": team_id, "rank": self._ranks[team_id], **fields, "version": self._versions[team_id]}
+
+    def on_event(self, message: str):
+        # Broadcast listener: keeps every worker's copy in step
+        event = json.loads(message)
+        kind = event["type"]
+        if kind == "LEADERBOARD_DELTA":
+            self.apply_delta(event["data"])
+        elif kind == "AUCTION_RESET":
+            self.reset(event["data"]["purse_balance"], event.get("version", self.version))
+        elif kind == "STATE_SYNC":
+            # Rewound elsewhere (checkpoint restore): reload from the DB on next use
+            self.loaded = False
+
+
+leaderboard = Leaderboard()
+manager.add_listener(leaderboard.on_event)
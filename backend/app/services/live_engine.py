@@ -0,0 +1,322 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import AUCTION_ENGINE, WRITE_BEHIND_BATCH_SIZE, WRITE_BEHIND_MAX_RETRIES, WRITE_BEHIND_TIMEOUT
+from app.core.errors import StaleBidError
+from app.db.session import async_session_maker
+from app.models.all_models import AuctionState, Bid, Player, Team
+from app.websockets.manager import manager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LiveLot:
+    """Process-local mirror of the AuctionState row plus the current player."""
+    status: str = "WAITING"
+    current_player_id: Optional[UUID] = None
+    current_bid: float = 0
+    current_bidder_id: Optional[UUID] = None
+    remaining_players_count: int = 0
+    version: int = 0
+    base_price: float = 0
+    player_sold: bool = False
+
+
+@dataclass
+class TeamLedger:
+    purse_balance: float
+    players_count: int
+
+
+@dataclass
+class BidWrite:
+    """One accepted bid waiting to be persisted by the flusher."""
+    bid_id: UUID
+    player_id: UUID
+    team_id: Optional[UUID]
+    amount: float
+    current_bidder_id: Optional[UUID]
+    version: int
+
+
+class LiveAuctionEngine:
+    """
+    Authoritative in-memory bid engine.
+
+    Bids are validated and applied synchronously against `lot` and `teams`
+    (no awaits between the checks and the mutation, so the event loop gives
+    us the same atomicity the row lock gave us). Accepted bids are queued and
+    written to Postgres in arrival order by a single flusher task.
+
+    Anything that changes more than the live bid (sale, player selection,
+    reset) must run inside `exclusive()`, which parks new bids, drains the
+    queue and reloads the engine from the database once the change commits.
+
+    A failed flush is retried with new bids parked in the meantime. Rows the
+    database rejects outright (IntegrityError), and batches still failing
+    after `max_retries` attempts, are dead-lettered: logged, kept in
+    `dead_letters` and dropped. The lot is then stale (ahead of the
+    database) and is reloaded before the next bid is taken; clients are
+    sent STATE_SYNC, since the bids they were shown no longer exist.
+    """
+
+    def __init__(self, max_retries: int = WRITE_BEHIND_MAX_RETRIES, timeout: float = WRITE_BEHIND_TIMEOUT):
+        self.enabled = False
+        self.max_retries = max_retries
+        self.timeout = timeout
+        # Set when the lot may not match the database (dropped writes or a
+        # failed reload); bids are refused until a reload succeeds
+        self._stale = False
+        self.dead_letters: List[BidWrite] = []
+        self.lot = LiveLot()
+        self.teams: Dict[UUID, TeamLedger] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._open = asyncio.Event()
+        self._open.set()
+        self._exclusive = asyncio.Lock()
+        # First backoff after a failed flush; doubles per attempt, capped at 10s
+        self.retry_delay = 0.5
+
+    async def start(self):
+        async with async_session_maker() as session:
+            await self.load(session)
+        self._queue = asyncio.Queue()
+        self._flusher = asyncio.create_task(self._run_flusher())
+        self.enabled = True
+
+    async def stop(self):
+        if not self.enabled:
+            return
+        try:
+            await asyncio.wait_for(self.flush(), self.timeout)
+        except asyncio.TimeoutError:
+            logger.error("Write-behind: stopping with %d bid(s) not persisted", self._queue.qsize())
+        self._flusher.cancel()
+        try:
+            await self._flusher
+        except asyncio.CancelledError:
+            pass
+        self.enabled = False
+
+    async def load(self, session: AsyncSession):
+        state = (await session.execute(select(AuctionState).where(AuctionState.id == 1))).scalar_one_or_none()
+        lot = LiveLot()
+        if state:
+            lot.status = state.status
+            lot.current_player_id = state.current_player_id
+            lot.current_bid = float(state.current_bid or 0)
+            lot.current_bidder_id = state.current_bidder_id
+            lot.remaining_players_count = state.remaining_players_count or 0
+            # The database only moves forward, but never step back if it somehow lags
+            lot.version = max(state.version or 0, self.lot.version)
+
+        if lot.current_player_id:
+            player = await session.get(Player, lot.current_player_id)
+            if player:
+                lot.base_price = float(player.base_price or 0)
+                lot.player_sold = bool(player.is_sold)
+
+        result = await session.execute(select(Team.id, Team.purse_balance, Team.players_count))
+        self.teams = {
+            team_id: TeamLedger(purse_balance=float(purse or 0), players_count=count or 0)
+            for team_id, purse, count in result.all()
+        }
+        self.lot = lot
+
+    async def place_bid(self, amount: float, team_id: Optional[UUID], expected_version: Optional[int] = None) -> LiveLot:
+        if not self._open.is_set():
+            try:
+                await asyncio.wait_for(self._open.wait(), self.timeout)
+            except asyncio.TimeoutError:
+                raise RuntimeError("Bid engine busy, please retry")
+        if self._stale and not await self._recover():
+            raise RuntimeError("Bid engine unavailable, please retry")
+        self._queue.put_nowait(self.apply_bid(amount, team_id, expected_version))
+        # A copy: later bids keep mutating the lot while the caller broadcasts
+        return replace(self.lot)
+
+    def apply_bid(self, amount: float, team_id: Optional[UUID], expected_version: Optional[int] = None) -> BidWrite:
+        """Validate and apply one bid to the in-memory lot; returns the write to persist."""
+        # Everything below is synchronous: validation and mutation cannot interleave
+        lot = self.lot
+        if expected_version is not None and expected_version != lot.version:
+            raise StaleBidError(lot.version)
+        if lot.status != "ACTIVE":
+            raise ValueError("Auction not active")
+        if lot.current_player_id is None:
+            raise ValueError("No player selected")
+        if lot.player_sold:
+            raise ValueError("Player already sold")
+
+        if team_id:
+            if lot.current_bid == 0:
+                if amount < lot.base_price:
+                    raise ValueError(f"First bid must be at least base price: ₹{int(lot.base_price/100000)}L")
+            elif amount <= lot.current_bid:
+                raise ValueError(f"Bid too low. Current bid: {lot.current_bid}")
+
+            if lot.current_bidder_id == team_id:
+                raise ValueError("Self-bidding not allowed")
+
+            team = self.teams.get(team_id)
+            if team is None:
+                raise ValueError("Unknown team")
+            if team.purse_balance < amount:
+                raise ValueError("Insufficient funds")
+            if team.players_count >= 25:
+                raise ValueError("Squad full")
+
+        lot.current_bid = amount
+        if team_id:
+            lot.current_bidder_id = team_id
+        lot.version += 1
+
+        return BidWrite(
+            bid_id=uuid4(),
+            player_id=lot.current_player_id,
+            team_id=team_id,
+            amount=amount,
+            current_bidder_id=lot.current_bidder_id,
+            version=lot.version,
+        )
+
+    async def flush(self):
+        """Wait until every accepted bid has been written to the database."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    @asynccontextmanager
+    async def exclusive(self):
+        """
+        Run a DB-side state change (sale, select, reset) against a drained engine.
+        No-op when the engine is disabled.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        async with self._exclusive:
+            self._open.clear()
+            try:
+                await self.flush()
+                yield
+            finally:
+                try:
+                    await self._reload_guarded("state change")
+                finally:
+                    self._open.set()
+
+    async def reload(self):
+        async with async_session_maker() as session:
+            await self.load(session)
+
+    async def _reload_guarded(self, reason: str) -> bool:
+        try:
+            await self.reload()
+        except Exception as e:
+            logger.error("Write-behind: reload after %s failed: %s", reason, e)
+            self._stale = True
+            return False
+        self._stale = False
+        return True
+
+    async def _recover(self) -> bool:
+        """Bring a stale lot back in line with the database; False if it still can't be."""
+        recovered = False
+        async with self._exclusive:
+            if self._stale:
+                self._open.clear()
+                try:
+                    await self.flush()
+                    recovered = await self._reload_guarded("dropped writes")
+                finally:
+                    self._open.set()
+        if recovered:
+            # Acknowledged bids were dropped: clients must reload the lot
+            await manager.broadcast("STATE_SYNC", {"reason": "bids_dropped"}, version=self.lot.version)
+        return not self._stale
+
+    def _dead_letter(self, writes: List[BidWrite], error: Exception):
+        for w in writes:
+            logger.error(
+                "Write-behind: dropping bid %s (player %s, team %s, amount %s, version %s): %s",
+                w.bid_id, w.player_id, w.team_id, w.amount, w.version, error,
+            )
+        self.dead_letters.extend(writes)
+        # The lot already reflects these bids; reload it before the next one
+        self._stale = True
+
+    async def _persist_rows(self, batch: List[BidWrite]):
+        """Persist a batch the database rejected one row at a time, dropping only the bad rows."""
+        for w in batch:
+            try:
+                await self.persist([w])
+            except Exception as e:
+                self._dead_letter([w], e)
+
+    async def _run_flusher(self):
+        while True:
+            batch: List[BidWrite] = [await self._queue.get()]
+            while len(batch) < WRITE_BEHIND_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # These bids were already acknowledged: while the database is
+            # refusing writes, stop taking new bids rather than drop them.
+            # Only a row the database will never take, or a batch that
+            # still fails after max_retries, is dead-lettered.
+            attempt = 0
+            while True:
+                try:
+                    await self.persist(batch)
+                    break
+                except IntegrityError as e:
+                    logger.warning("Write-behind flush rejected, retrying %d bid(s) one by one: %s", len(batch), e)
+                    await self._persist_rows(batch)
+                    break
+                except Exception as e:
+                    attempt += 1
+                    if attempt >= self.max_retries:
+                        self._dead_letter(batch, e)
+                        break
+                    logger.warning("Write-behind flush failed (attempt %d), holding new bids: %s", attempt, e)
+                    self._open.clear()
+                    await asyncio.sleep(min(self.retry_delay * 2 ** (attempt - 1), 10))
+            if attempt and not self._exclusive.locked():
+                # exclusive() reopens by itself once its state change is done
+                self._open.set()
+
+            for _ in batch:
+                self._queue.task_done()
+
+    async def persist(self, batch: List[BidWrite]):
+        last = batch[-1]
+        async with async_session_maker() as session:
+            async with session.begin():
+                session.add_all([
+                    Bid(id=w.bid_id, player_id=w.player_id, team_id=w.team_id, amount=w.amount)
+                    for w in batch if w.team_id
+                ])
+                await session.execute(
+                    update(AuctionState).where(AuctionState.id == 1).values(
+                        current_bid=last.amount,
+                        current_bidder_id=last.current_bidder_id,
+                        version=last.version,
+                    )
+                )
+
+
+live_engine = LiveAuctionEngine()
+
+
+def engine_mode_enabled() -> bool:
+    return AUCTION_ENGINE == "memory"
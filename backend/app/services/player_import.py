@@ -0,0 +1,146 @@
+import codecs
+import csv
+from io import StringIO
+from typing import Any, Dict, List, Optional
+
+from fastapi import UploadFile
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import IMPORT_BATCH_SIZE, IMPORT_READ_CHUNK_SIZE, IMPORT_MAX_REPORTED_ERRORS
+from app.models.all_models import Player
+from app.schemas.schemas import PlayerCreate
+
+
+class CsvChunkParser:
+    """
+    Incremental CSV parser for byte chunks.
+
+    Only text up to the last newline that sits outside a quoted field is
+    parsed, so records with embedded newlines are never split across chunks.
+
+    Input that is not UTF-8 ends the stream: complete records before the bad
+    bytes are still returned and the exception is kept in `error`.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self.fieldnames: Optional[List[str]] = None
+        self.error: Optional[UnicodeDecodeError] = None
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Dict[str, str]]:
+        try:
+            self._buffer += self._decoder.decode(chunk, final=final)
+        except UnicodeDecodeError as e:
+            # e.object is the pending bytes plus this chunk; everything before e.start decoded fine
+            self._buffer += e.object[:e.start].decode("utf-8")
+            self.error = e
+            # The record the bad bytes fall in is never complete
+            final = False
+        if final:
+            complete, self._buffer = self._buffer, ""
+        else:
+            cut = self._safe_cut()
+            if cut < 0:
+                return []
+            complete, self._buffer = self._buffer[:cut + 1], self._buffer[cut + 1:]
+
+        reader = csv.reader(StringIO(complete))
+        if self.fieldnames is None:
+            header = next(reader, None)
+            if header is None:
+                return []
+            self.fieldnames = [h.strip() for h in header]
+        return [dict(zip(self.fieldnames, values)) for values in reader if values]
+
+    def _safe_cut(self) -> int:
+        # Last newline preceded by an even number of quotes ("" escapes keep parity)
+        cut = self._buffer.rfind("\n")
+        while cut >= 0 and self._buffer.count('"', 0, cut) % 2:
+            cut = self._buffer.rfind("\n", 0, cut)
+        return cut
+
+
+def validate_row(row: Dict[str, str]) -> Dict[str, Any]:
+    # Blank cells fall back to the PlayerCreate defaults
+    values = {k: v.strip() for k, v in row.items() if k and v is not None and v.strip() != ""}
+    return PlayerCreate(**values).model_dump()
+
+
+async def import_players_csv(file: UploadFile, session: AsyncSession) -> Dict[str, Any]:
+    """
+    Stream a CSV upload into `players` in multi-row INSERT batches.
+
+    Rows that fail PlayerCreate validation are reported and skipped. A batch
+    the database rejects is retried one row at a time so only the offending
+    rows are rejected. Bytes that are not UTF-8 end the import there: rows
+    before them are kept and the decode error is reported.
+    """
+    parser = CsvChunkParser()
+    batch: List[Dict[str, Any]] = []
+    batch_rows: List[int] = []  # CSV row number of each batch entry
+    errors: List[Dict[str, Any]] = []
+    report = {"inserted": 0, "rejected": 0, "duplicates": 0}
+    row_number = 1  # header is row 1
+
+    async def insert_rows(rows: List[Dict[str, Any]]):
+        # Names already in the catalog are skipped (ix_players_name is unique)
+        stmt = insert(Player).on_conflict_do_nothing(index_elements=[Player.name]).returning(Player.id)
+        inserted = len((await session.execute(stmt, rows)).all())
+        await session.commit()
+        report["inserted"] += inserted
+        report["duplicates"] += len(rows) - inserted
+
+    async def flush():
+        if not batch:
+            return
+        try:
+            await insert_rows(batch)
+        except Exception:
+            await session.rollback()
+            # Retry row by row so one bad row doesn't sink the rest of the batch
+            for number, values in zip(batch_rows, batch):
+                try:
+                    await insert_rows([values])
+                except Exception as e:
+                    await session.rollback()
+                    report["rejected"] += 1
+                    errors.append({"row": number, "errors": [str(e).splitlines()[0]]})
+        batch.clear()
+        batch_rows.clear()
+
+    while True:
+        chunk = await file.read(IMPORT_READ_CHUNK_SIZE)
+        for row in parser.feed(chunk, final=not chunk):
+            row_number += 1
+            try:
+                values = validate_row(row)
+            except ValidationError as e:
+                report["rejected"] += 1
+                errors.append({
+                    "row": row_number,
+                    "errors": [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()],
+                })
+                continue
+            batch_rows.append(row_number)
+            batch.append(values)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await flush()
+        if parser.error:
+            # Everything from the bad bytes on is unreadable; keep the rows before them
+            report["rejected"] += 1
+            errors.append({"row": row_number + 1, "errors": [f"File is not valid UTF-8: {parser.error}"]})
+            break
+        if not chunk:
+            break
+
+    await flush()
+    return {
+        "status": "success" if not report["rejected"] else "partial",
+        "count": report["inserted"],
+        "rejected": report["rejected"],
+        "duplicates": report["duplicates"],
+        "errors": errors[:IMPORT_MAX_REPORTED_ERRORS],
+    }
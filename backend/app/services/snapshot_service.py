@@ -0,0 +1,76 @@
+import asyncio
+import json
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import SNAPSHOT_BID_LIMIT
+from app.models.all_models import Bid, Player
+from app.schemas.schemas import PlayerResponse
+from app.services.auction_service import get_auction_state_view, get_leaderboard, bid_log_query, bid_log_entry
+from app.websockets.manager import manager
+
+
+async def build_snapshot(session: AsyncSession, bid_limit: int = SNAPSHOT_BID_LIMIT) -> Dict[str, Any]:
+    # Stream position first: replaying from here may repeat an event that is
+    # already reflected below, but can never skip one.
+    seq, epoch = manager.seq, manager.epoch
+
+    # With the memory engine or the actor, the live lot is ahead of the row
+    state = await get_auction_state_view(session)
+    player = await session.get(Player, UUID(state["current_player_id"])) if state["current_player_id"] else None
+    teams = await get_leaderboard(session)
+
+    result = await session.execute(
+        bid_log_query().order_by(Bid.timestamp.desc(), Bid.id.desc()).limit(bid_limit)
+    )
+    bids = [bid_log_entry(row) for row in result.all()]
+
+    return {
+        "seq": seq,
+        "epoch": epoch,
+        "state": state,
+        "current_player": PlayerResponse.model_validate(player).model_dump(mode="json") if player else None,
+        "teams": teams,
+        "recent_bids": bids,
+    }
+
+
+class SnapshotCache:
+    """
+    Holds the encoded snapshot until the next broadcast event. Concurrent
+    misses share one build, so a bootstrap stampede costs one set of queries.
+    """
+
+    def __init__(self):
+        self._body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self, message: Optional[str] = None):
+        self._generation += 1
+        self._body = None
+        self._etag = None
+
+    async def get(self, session: AsyncSession):
+        if self._body is not None:
+            return self._body, self._etag
+
+        async with self._lock:
+            if self._body is not None:
+                return self._body, self._etag
+
+            generation = self._generation
+            snapshot = await build_snapshot(session)
+            body = json.dumps(snapshot, default=str).encode("utf-8")
+            etag = f'"{snapshot["epoch"]}-{snapshot["seq"]}-{snapshot["state"]["version"]}"'
+            # Only keep it if nothing changed while we were reading
+            if generation == self._generation:
+                self._body, self._etag = body, etag
+            return body, etag
+
+
+snapshot_cache = SnapshotCache()
+manager.add_listener(snapshot_cache.invalidate)
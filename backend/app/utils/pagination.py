@@ -0,0 +1,38 @@
+import base64
+import json
+from typing import Any, List, Sequence
+
+from sqlalchemy import and_, false, or_
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque keyset cursor: the sort key of the last row returned."""
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def keyset_after(columns: Sequence[Any], values: Sequence[Any]):
+    """
+    WHERE clause for the rows after `values` in `ORDER BY columns` (all
+    ascending, NULLs last as Postgres sorts them). A row-value comparison
+    such as `(a, b) > (1, NULL)` is NULL, not true, so NULL sort keys are
+    spelled out column by column.
+    """
+    column, value = columns[0], values[0]
+    if len(columns) == 1:
+        return false() if value is None else or_(column > value, column.is_(None))
+    rest = keyset_after(columns[1:], values[1:])
+    if value is None:
+        return and_(column.is_(None), rest)
+    return or_(column > value, column.is_(None), and_(column == value, rest))
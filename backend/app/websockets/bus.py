@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Optional, Set
+
+import asyncpg
+
+from app.core.config import BROADCAST_BACKEND, BROADCAST_CHANNEL, DATABASE_DIRECT_URL
+from app.db.session import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str], Awaitable[None]]
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_PAYLOAD_LIMIT = 7999
+
+
+class BroadcastBackend(ABC):
+    """
+    Carries encoded events between workers. `publish` is called once per
+    event by whichever worker produced it; every worker (including the
+    publisher) gets the message back through `deliver` and fans it out to
+    its own sockets.
+    """
+
+    @abstractmethod
+    async def start(self, deliver: Deliver):
+        ...
+
+    @abstractmethod
+    async def publish(self, message: str):
+        ...
+
+    async def stop(self):
+        pass
+
+
+class InProcessBackend(BroadcastBackend):
+    """Single-process delivery. Default, and what the tests use."""
+
+    def __init__(self, deliver: Optional[Deliver] = None):
+        self._deliver = deliver
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def publish(self, message: str):
+        if self._deliver:
+            await self._deliver(message)
+
+
+class PostgresNotifyBackend(BroadcastBackend):
+    """Fan-out across workers and replicas via Postgres LISTEN/NOTIFY."""
+
+    def __init__(self, dsn: str, channel: str = BROADCAST_CHANNEL):
+        self.dsn = dsn
+        self.channel = channel
+        self._deliver: Optional[Deliver] = None
+        self._listener: Optional[asyncpg.Connection] = None
+        self._publisher: Optional[asyncpg.Connection] = None
+        # One publisher connection + lock keeps this worker's events in order
+        self._publish_lock = asyncio.Lock()
+        self._stopping = False
+        # The loop only keeps weak references to tasks: hold them until done
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+        self._publisher = await asyncpg.connect(self.dsn)
+        await self._listen()
+
+    async def _listen(self):
+        self._listener = await asyncpg.connect(self.dsn)
+        self._listener.add_termination_listener(self._on_listener_lost)
+        await self._listener.add_listener(self.channel, self._on_notify)
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self._spawn(self._deliver(payload))
+
+    def _on_listener_lost(self, connection):
+        if not self._stopping:
+            self._spawn(self._reconnect())
+
+    async def _reconnect(self):
+        delay = 0.5
+        while not self._stopping:
+            try:
+                await self._listen()
+                logger.info("Broadcast bus: LISTEN connection restored")
+                return
+            except Exception as e:
+                logger.warning("Broadcast bus: reconnect failed (%s), retrying in %ss", e, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 10)
+
+    async def publish(self, message: str):
+        if len(message.encode("utf-8")) > NOTIFY_PAYLOAD_LIMIT:
+            # Too large for NOTIFY: other workers miss it, so deliver locally and say so
+            logger.warning("Broadcast bus: %d byte event exceeds NOTIFY limit, delivered locally only", len(message))
+            await self._deliver(message)
+            return
+
+        async with self._publish_lock:
+            if self._publisher is None or self._publisher.is_closed():
+                self._publisher = await asyncpg.connect(self.dsn)
+            await self._publisher.execute("SELECT pg_notify($1, $2)", self.channel, message)
+
+    async def stop(self):
+        self._stopping = True
+        for connection in (self._listener, self._publisher):
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+
+
+def create_backend(name: str = BROADCAST_BACKEND) -> BroadcastBackend:
+    if name == "postgres":
+        # asyncpg wants a plain libpq-style URL. LISTEN needs a session-level
+        # connection, so bypass PgBouncer when a direct URL is configured.
+        dsn = DATABASE_DIRECT_URL or DATABASE_URL
+        return PostgresNotifyBackend(dsn.replace("postgresql+asyncpg://", "postgresql://", 1))
+    return InProcessBackend()
@@ -0,0 +1,130 @@
+import json
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import WebSocket
+from pydantic import ValidationError
+
+from app.core.errors import StaleBidError, BidRateLimited
+from app.core.metrics import WS_COMMAND_SECONDS
+from app.db.session import async_session_maker
+from app.schemas.schemas import WsCommand, BidRequest, SelectPlayerRequest
+from app.services.auction_service import place_bid, confirm_sale, select_player
+from app.websockets.manager import manager
+from app.websockets.topics import parse_topics
+
+# Commands a client can send over /ws instead of calling the REST routes:
+#
+#   {"id": "c1", "type": "bid", "data": {"team_id": "...", "amount": 2500000, "expected_version": 7}}
+#   {"id": "c2", "type": "select-player", "data": {"player_id": "..."}}
+#   {"id": "c3", "type": "confirm-sale"}
+#   {"id": "c4", "type": "ping"}
+#   {"id": "c5", "type": "subscribe", "data": {"topics": ["lot", "team:<team id>"]}}
+#
+# `{"type": "pong"}` answers the server's PING heartbeat and gets no reply.
+# Every other command gets exactly one reply on the same socket, carrying its id:
+#
+#   {"type": "ACK", "id": "c1", "data": {...}}
+#   {"type": "NACK", "id": "c1", "error": {"status": 409, "detail": "Outbid, refresh", "version": 8}}
+#
+# `status` is the code the matching REST route would have answered with.
+
+
+async def _bid(data: Dict[str, Any], websocket: Optional[WebSocket]) -> Dict[str, Any]:
+    request = BidRequest(**data)
+    async with async_session_maker() as session:
+        state = await place_bid(
+            amount=request.amount, team_id=request.team_id, session=session,
+            expected_version=request.expected_version,
+        )
+    return {"current_bid": state.current_bid, "version": state.version}
+
+
+async def _select_player(data: Dict[str, Any], websocket: Optional[WebSocket]) -> Dict[str, Any]:
+    request = SelectPlayerRequest(**data)
+    async with async_session_maker() as session:
+        state = await select_player(request.player_id, session)
+    return {"player_id": str(request.player_id), "version": state.version}
+
+
+async def _confirm_sale(data: Dict[str, Any], websocket: Optional[WebSocket]) -> Dict[str, Any]:
+    async with async_session_maker() as session:
+        try:
+            await confirm_sale(session)
+        except Exception as e:
+            # POST /confirm-sale answers 400 for every failed sale
+            raise ValueError(str(e)) from e
+    return {}
+
+
+async def _ping(data: Dict[str, Any], websocket: Optional[WebSocket]) -> Dict[str, Any]:
+    # Doubles as a cheap position check: seq/epoch as in HELLO
+    return {"seq": manager.seq, "epoch": manager.epoch, "server_time": time.time()}
+
+
+async def _subscribe(data: Dict[str, Any], websocket: Optional[WebSocket]) -> Dict[str, Any]:
+    topics: List[str] = data.get("topics") or []
+    if not isinstance(topics, list):
+        raise ValueError("topics must be a list")
+    subscribed = parse_topics(topics)
+    if websocket is not None:
+        manager.subscribe(websocket, subscribed)
+    return {"topics": sorted(subscribed)}
+
+
+HANDLERS = {
+    "bid": _bid,
+    "select-player": _select_player,
+    "confirm-sale": _confirm_sale,
+    "ping": _ping,
+    "subscribe": _subscribe,
+}
+
+
+def error_reply(error: Exception) -> Dict[str, Any]:
+    """Same status codes as the REST routes."""
+    if isinstance(error, BidRateLimited):
+        return {"status": 429, "detail": str(error), "retry_after": round(error.retry_after, 3)}
+    if isinstance(error, StaleBidError):
+        return {"status": 409, "detail": str(error), "version": error.current_version}
+    if isinstance(error, ValidationError):
+        return {"status": 422, "detail": error.errors(include_url=False, include_context=False)}
+    if isinstance(error, LookupError):
+        return {"status": 404, "detail": str(error)}
+    if isinstance(error, ValueError):
+        return {"status": 400, "detail": str(error)}
+    return {"status": 500, "detail": str(error)}
+
+
+async def handle_command(raw: str, websocket: Optional[WebSocket] = None) -> Optional[str]:
+    """Run one client command (sent on `websocket`) and return the encoded ACK/NACK reply."""
+    started = time.perf_counter()
+    command_id: Optional[Union[str, int]] = None
+    kind = "invalid"
+    try:
+        try:
+            command = WsCommand.model_validate_json(raw)
+        except ValidationError:
+            # Salvage the id so the client can still match the NACK
+            try:
+                command_id = json.loads(raw).get("id")
+            except Exception:
+                pass
+            raise ValueError("Malformed command")
+        command_id = command.id
+        if command.type == "pong":
+            # Heartbeat reply: the receive loop has already marked the socket alive
+            return None
+        handler = HANDLERS.get(command.type)
+        if handler is None:
+            raise ValueError(f"Unknown command: {command.type}")
+        kind = command.type
+
+        data = await handler(command.data, websocket)
+        reply = {"type": "ACK", "id": command_id, "data": data}
+    except Exception as e:
+        reply = {"type": "NACK", "id": command_id, "error": error_reply(e)}
+
+    status = reply["error"]["status"] if reply["type"] == "NACK" else 200
+    WS_COMMAND_SECONDS.labels(kind, str(status)).observe(time.perf_counter() - started)
+    return json.dumps(reply, default=str)
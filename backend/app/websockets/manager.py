@@ -1,26 +1,368 @@
-from typing import List, Dict, Any
-from fastapi import WebSocket, WebSocketDisconnect
+from typing import Callable, Dict, Any, Iterable, List, Optional, Set, Tuple, Union
+from fastapi import WebSocket
+from collections import defaultdict, deque
+import asyncio
 import json
+import logging
+import time
+import uuid
+
+from app.core.config import (
+    WS_SEND_QUEUE_SIZE, WS_SEND_TIMEOUT, WS_REPLAY_BUFFER_SIZE, WS_HEARTBEAT_INTERVAL, WS_IDLE_TIMEOUT,
+)
+from app.core.metrics import (
+    BROADCAST_SECONDS, FAN_OUT_SECONDS, WS_EVICTED, WS_REAPED, WS_CONNECTIONS, WS_QUEUE_DEPTH, WS_QUEUE_DEPTH_MAX,
+)
+from app.websockets.bus import BroadcastBackend, InProcessBackend
+from app.websockets.protocol import JSON, MSGPACK, SSE, MSGPACK_SUBPROTOCOL, negotiate, encode_msgpack, encode_sse
+from app.websockets.topics import PUBLIC_TOPICS, event_topics
+
+logger = logging.getLogger(__name__)
+
+# Published messages are "<topics>\n<event JSON>": the topic list rides in
+# front so every worker can route without decoding the event. "*" = everyone.
+ALL_TOPICS = "*"
+
+class Connection:
+    """One client socket (or SSE stream) with its own bounded outbound queue and writer task."""
+
+    def __init__(self, websocket: WebSocket, queue_size: int, format: str = JSON):
+        self.websocket = websocket
+        self.format = format
+        self.topics: Set[str] = set(PUBLIC_TOPICS)
+        # Last time the client sent anything; heartbeats reap it when stale
+        self.last_seen = time.monotonic()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.writer: Optional[asyncio.Task] = None
+
+    def encode(self, message: str) -> Union[str, bytes]:
+        # Per-connection messages (HELLO, replay, replies); broadcasts share one encoding
+        if self.format == MSGPACK:
+            return encode_msgpack(message)
+        if self.format == SSE:
+            return encode_sse(message)
+        return message
+
+class EventStream:
+    """
+    Stands in for the socket of a Server-Sent Events subscriber: the manager
+    fills its queue like any other, the HTTP response drains it.
+    """
 
-class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.closed = asyncio.Event()
+
+    async def close(self, code: Optional[int] = None):
+        # Evicted or reaped: end the response once the queue is drained
+        self.closed.set()
+
+class ConnectionManager:
+    def __init__(
+        self,
+        queue_size: int = WS_SEND_QUEUE_SIZE,
+        send_timeout: float = WS_SEND_TIMEOUT,
+        replay_size: int = WS_REPLAY_BUFFER_SIZE,
+        heartbeat_interval: float = WS_HEARTBEAT_INTERVAL,
+        idle_timeout: float = WS_IDLE_TIMEOUT,
+    ):
+        self.active_connections: Dict[WebSocket, Connection] = {}
+        # topic -> its subscribers, so an event only touches interested sockets
+        self.subscribers: Dict[str, Dict[WebSocket, Connection]] = defaultdict(dict)
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.evicted_count = 0
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self.reaped_count = 0
+        self._heartbeat: Optional[asyncio.Task] = None
+
+        # Event sequencing: `seq` increases by one per delivered event within
+        # this process; `epoch` changes on every restart so a client never
+        # resumes against another process's numbering. Positions are per
+        # worker: a reconnect to another worker falls back to STATE_SYNC.
+        self.epoch = uuid.uuid4().hex[:12]
+        self.seq = 0
+        self.replay_buffer: deque = deque(maxlen=replay_size)
+
+        # Replaced by `start()` at app startup; in-process delivery until then
+        self.backend: BroadcastBackend = InProcessBackend(self._fan_out)
+
+        # In-process observers of every delivered event (cache invalidation etc.)
+        self.listeners: List[Callable[[str], None]] = []
+
+    def add_listener(self, listener: Callable[[str], None]):
+        self.listeners.append(listener)
+
+    async def start(self, backend: BroadcastBackend):
+        await backend.start(self._fan_out)
+        self.backend = backend
+        self._heartbeat = asyncio.create_task(self._run_heartbeat())
+
+    async def stop(self):
+        if self._heartbeat:
+            self._heartbeat.cancel()
+        await self.backend.stop()
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        since: Optional[int] = None,
+        epoch: Optional[str] = None,
+        topics: Optional[Set[str]] = None,
+    ):
+        # Sec-WebSocket-Protocol: JSON text frames unless the client offers MessagePack
+        format = negotiate(getattr(websocket, "scope", {}).get("subprotocols"))
+        if format == MSGPACK:
+            await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL)
+        else:
+            await websocket.accept()
+        connection = Connection(websocket, self.queue_size, format)
+        if topics:
+            connection.topics = set(topics)
+        self._register(connection, since, epoch)
+        connection.writer = asyncio.create_task(self._writer(connection))
+
+    def open_stream(
+        self,
+        since: Optional[int] = None,
+        epoch: Optional[str] = None,
+        topics: Optional[Set[str]] = None,
+    ) -> Connection:
+        """Register a Server-Sent Events subscriber; read it with `stream_frames`."""
+        connection = Connection(EventStream(), self.queue_size, SSE)
+        if topics:
+            connection.topics = set(topics)
+        self._register(connection, since, epoch)
+        return connection
+
+    async def stream_frames(self, connection: Connection):
+        stream = connection.websocket
+        while not (stream.closed.is_set() and connection.queue.empty()):
+            try:
+                # Wake up now and then to notice an eviction on an idle stream
+                yield await asyncio.wait_for(connection.queue.get(), self.heartbeat_interval)
+            except asyncio.TimeoutError:
+                continue
+
+    def _register(self, connection: Connection, since: Optional[int], epoch: Optional[str]):
+        # No awaits from here until registration: nothing can be fanned out
+        # between the replay and the live stream, so the client sees no gap.
+        connection.queue.put_nowait(connection.encode(self._hello()))
+        if since is not None:
+            missed = self.replay_since(since, epoch, connection.topics)
+            if missed is None:
+                connection.queue.put_nowait(connection.encode(self._stamp_local("STATE_SYNC", {"reason": "replay_gap"})))
+            else:
+                for message in missed[-(self.queue_size - 2):]:
+                    connection.queue.put_nowait(connection.encode(message))
+                if len(missed) > self.queue_size - 2:
+                    connection.queue.put_nowait(connection.encode(self._stamp_local("STATE_SYNC", {"reason": "replay_gap"})))
+
+        self.active_connections[connection.websocket] = connection
+        self._index(connection)
+
+    def touch(self, websocket: WebSocket):
+        """The client sent something: it is alive."""
+        connection = self.active_connections.get(websocket)
+        if connection is not None:
+            connection.last_seen = time.monotonic()
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
+    def subscribe(self, websocket: WebSocket, topics: Set[str]):
+        """Replace a socket's topics; takes effect from the next event."""
+        connection = self.active_connections.get(websocket)
+        if connection is None:
+            return
+        self._unindex(connection)
+        connection.topics = set(topics)
+        self._index(connection)
+
+    def _index(self, connection: Connection):
+        for topic in connection.topics:
+            self.subscribers[topic][connection.websocket] = connection
+
+    def _unindex(self, connection: Connection):
+        for topic in connection.topics:
+            subscribers = self.subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.pop(connection.websocket, None)
+                if not subscribers:
+                    # Team topics come and go with their consoles
+                    del self.subscribers[topic]
+
+    def replay_since(self, since: int, epoch: Optional[str] = None, topics: Optional[Set[str]] = None) -> Optional[List[str]]:
+        """
+        Events after `since` (only those on `topics`, when given), or None when
+        they are no longer all buffered.
+        """
+        if epoch is not None and epoch != self.epoch:
+            return None
+        if since >= self.seq:
+            return []
+        oldest = self.replay_buffer[0][0] if self.replay_buffer else self.seq + 1
+        if since + 1 < oldest:
+            return None
+        return [
+            message for seq, message, event_topics in self.replay_buffer
+            if seq > since and (topics is None or event_topics is None or not topics.isdisjoint(event_topics))
+        ]
+
+    def _hello(self) -> str:
+        return json.dumps({"type": "HELLO", "data": {"seq": self.seq, "epoch": self.epoch}})
+
+    def _stamp_local(self, type: str, data: Dict[str, Any]) -> str:
+        # Per-connection control message: carries the current seq, not a new one
+        return json.dumps({"seq": self.seq, "epoch": self.epoch, "type": type, "data": data})
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        connection = self.active_connections.pop(websocket, None)
+        if connection is None:
+            return
+        self._unindex(connection)
+        if connection.writer:
+            connection.writer.cancel()
+
+    def send_personal(self, websocket: WebSocket, message: str):
+        """Queue a reply for one socket, behind whatever it is already being sent."""
+        connection = self.active_connections.get(websocket)
+        if connection is None:
+            return
+        try:
+            connection.queue.put_nowait(connection.encode(message))
+        except asyncio.QueueFull:
+            self._evict(connection)
+
+    async def broadcast(self, type: str, data: Dict[str, Any], version: Optional[int] = None, teams: Iterable = ()):
+        # Encode once and publish; every worker fans out to its own sockets.
+        # `version` is the AuctionState.version the event was produced at;
+        # `teams` also delivers the event on those teams' private topics.
+        # Never raises: callers broadcast after their transaction committed,
+        # and a bus failure must not turn a saved bid or sale into an error.
+        started = time.perf_counter()
+        event = {"type": type, "data": data}
+        if version is not None:
+            event["version"] = version
+        topics = event_topics(type, teams)
+        header = ",".join(topics) if topics is not None else ALL_TOPICS
+        message = json.dumps(event, default=str)
+        try:
+            await self.backend.publish(f"{header}\n{message}")
+        except Exception:
+            # Other workers miss this event; this worker's sockets still get it
+            logger.exception("Broadcast of %s failed, delivered locally only", type)
+            await self._fan_out(f"{header}\n{message}")
+        BROADCAST_SECONDS.labels(type).observe(time.perf_counter() - started)
+
+    async def _fan_out(self, message: str):
+        # Stamp with this process's sequence by splicing the prefix in, so the
+        # published payload is not decoded and re-encoded per worker.
+        started = time.perf_counter()
+        header, _, message = message.partition("\n")
+        topics: Optional[Tuple[str, ...]] = None if header == ALL_TOPICS else tuple(header.split(","))
+        self.seq += 1
+        message = f'{{"seq": {self.seq}, "epoch": "{self.epoch}", ' + message[1:]
+        self.replay_buffer.append((self.seq, message, topics))
+
+        for listener in self.listeners:
+            try:
+                listener(message)
+            except Exception:
+                logger.exception("Broadcast listener failed")
+
+        # Enqueue without awaiting any socket. Each wire format is encoded at
+        # most once per event and the frame is shared by every socket using it.
+        frames = {JSON: message}
+        for connection in self._recipients(topics):
+            frame = frames.get(connection.format)
+            if frame is None:
+                frame = frames[connection.format] = connection.encode(message)
+            try:
+                connection.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._evict(connection)
+        FAN_OUT_SECONDS.observe(time.perf_counter() - started)
+
+    def _recipients(self, topics: Optional[Tuple[str, ...]]) -> List[Connection]:
+        if topics is None:
+            return list(self.active_connections.values())
+        if len(topics) == 1:
+            return list(self.subscribers.get(topics[0], {}).values())
+        # A socket on several of the event's topics still gets it once
+        recipients: Dict[WebSocket, Connection] = {}
+        for topic in topics:
+            recipients.update(self.subscribers.get(topic, {}))
+        return list(recipients.values())
+
+    async def _writer(self, connection: Connection):
+        while True:
+            frame = await connection.queue.get()
+            send = connection.websocket.send_text if isinstance(frame, str) else connection.websocket.send_bytes
+            try:
+                await asyncio.wait_for(send(frame), self.send_timeout)
+            except asyncio.TimeoutError:
+                # A single send stalled past the limit: treat as a slow consumer
+                self._evict(connection)
+                return
+            except Exception:
+                # Socket is gone: stop sending to it now rather than on the
+                # receive loop's schedule (never, for a half-open connection)
+                self._reap(connection, "send_failed")
+                return
+
+    def _evict(self, connection: Connection):
+        if connection.websocket not in self.active_connections:
+            return
+        self.evicted_count += 1
+        WS_EVICTED.inc()
+        self.disconnect(connection.websocket)
+        asyncio.create_task(self._close(connection.websocket))
 
-    async def broadcast(self, type: str, data: Dict[str, Any]):
-        message = json.dumps({"type": type, "data": data}, default=str)
-        for connection in self.active_connections:
+    def _reap(self, connection: Connection, reason: str):
+        if connection.websocket not in self.active_connections:
+            return
+        self.reaped_count += 1
+        WS_REAPED.labels(reason).inc()
+        self.disconnect(connection.websocket)
+        # 1001 = going away; a client that is still there reconnects and resumes
+        asyncio.create_task(self._close(connection.websocket, code=1001))
+
+    def heartbeat(self, now: Optional[float] = None):
+        """Reap sockets idle past the timeout and PING the rest."""
+        now = time.monotonic() if now is None else now
+        frames: Dict[str, Union[str, bytes]] = {}
+        for connection in list(self.active_connections.values()):
+            # SSE clients cannot answer; a dead stream fails its next write instead
+            if connection.format != SSE and now - connection.last_seen > self.idle_timeout:
+                self._reap(connection, "idle")
+                continue
+            frame = frames.get(connection.format)
+            if frame is None:
+                frame = frames[connection.format] = connection.encode(self._stamp_local("PING", {}))
+            try:
+                connection.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._evict(connection)
+
+    async def _run_heartbeat(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
             try:
-                await connection.send_text(message)
+                self.heartbeat()
             except Exception:
-                # Handle dead connection separately or just log
-                pass
+                logger.exception("WebSocket heartbeat failed")
+
+    async def _close(self, websocket: WebSocket, code: int = 1013):
+        try:
+            # 1013 = try again later; the client may reconnect and resync
+            await asyncio.wait_for(websocket.close(code=code), self.send_timeout)
+        except Exception:
+            pass
+
+    def queue_depths(self) -> List[int]:
+        return [connection.queue.qsize() for connection in self.active_connections.values()]
 
 manager = ConnectionManager()
+
+# Sampled at scrape time
+WS_CONNECTIONS.set_function(lambda: len(manager.active_connections))
+WS_QUEUE_DEPTH.set_function(lambda: sum(manager.queue_depths()))
+WS_QUEUE_DEPTH_MAX.set_function(lambda: max(manager.queue_depths(), default=0))
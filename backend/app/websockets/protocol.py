@@ -0,0 +1,139 @@
+import json
+import uuid
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Optional
+
+import msgpack
+
+# Wire formats for /ws. JSON text frames are the default; a client that
+# offers the MessagePack subprotocol gets binary frames with short keys,
+# money as whole rupees and UUIDs as 16 raw bytes. SSE is the same JSON
+# framed for /api/auction/events.
+JSON = "json"
+MSGPACK = "msgpack"
+SSE = "sse"
+MSGPACK_SUBPROTOCOL = "auction.msgpack.v1"
+
+# Full key -> short key. Keys not listed are sent as they are.
+FIELD_CODES: Dict[str, str] = {
+    "type": "t",
+    "data": "d",
+    "seq": "s",
+    "epoch": "e",
+    "version": "v",
+    "base_version": "bv",
+    "id": "i",
+    "amount": "a",
+    "expected_version": "xv",
+    "team_id": "tm",
+    "player_id": "p",
+    "current_bid": "cb",
+    "current_bidder_id": "cbi",
+    "current_player_id": "cpi",
+    "sold_price": "sp",
+    "purse_balance": "pb",
+    "total_points": "tp",
+    "players_count": "pc",
+    "rank": "r",
+    "teams": "ts",
+    "name": "n",
+    "code": "c",
+    "logo_url": "lu",
+    "color": "cl",
+    "primary_color": "pcl",
+    "secondary_color": "scl",
+    "winner": "w",
+    "reason": "rs",
+    "checkpoint": "ck",
+    "error": "er",
+    "status": "st",
+    "detail": "dt",
+    "retry_after": "ra",
+    "server_time": "stm",
+    "topics": "to",
+}
+FIELD_NAMES = {code: name for name, code in FIELD_CODES.items()}
+
+# Rupee amounts: JSON carries them as floats or Decimal strings
+MONEY_FIELDS = {"amount", "current_bid", "sold_price", "purse_balance"}
+UUID_FIELDS = {"id", "team_id", "player_id", "current_bidder_id", "current_player_id"}
+
+
+def negotiate(subprotocols) -> str:
+    """Wire format for a socket from the subprotocols its client offered."""
+    return MSGPACK if MSGPACK_SUBPROTOCOL in (subprotocols or []) else JSON
+
+
+def _compact_value(key: Optional[str], value: Any) -> Any:
+    if isinstance(value, dict):
+        return {FIELD_CODES.get(k, k): _compact_value(k, v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_compact_value(key, v) for v in value]
+    if key in MONEY_FIELDS and isinstance(value, (int, float, str)) and not isinstance(value, bool):
+        try:
+            return int(Decimal(str(value)).to_integral_value())
+        except InvalidOperation:
+            return value
+    if key in UUID_FIELDS and isinstance(value, str):
+        try:
+            return uuid.UUID(value).bytes
+        except ValueError:
+            return value
+    return value
+
+
+def _expand_value(key: Optional[str], value: Any) -> Any:
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            name = FIELD_NAMES.get(k, k)
+            out[name] = _expand_value(name, v)
+        return out
+    if isinstance(value, list):
+        return [_expand_value(key, v) for v in value]
+    if key in UUID_FIELDS and isinstance(value, bytes) and len(value) == 16:
+        return str(uuid.UUID(bytes=value))
+    return value
+
+
+def encode_msgpack(message: str) -> bytes:
+    """Re-encode one JSON event or reply as a compact MessagePack frame."""
+    return msgpack.packb(_compact_value(None, json.loads(message)), use_bin_type=True)
+
+
+def decode_msgpack(frame: bytes) -> Dict[str, Any]:
+    """Inverse of `encode_msgpack` (full keys, UUID strings)."""
+    return _expand_value(None, msgpack.unpackb(frame, raw=False))
+
+
+def encode_sse(message: str) -> str:
+    """
+    One Server-Sent Events frame. The id is "<epoch>:<seq>" so a reconnecting
+    EventSource resumes through Last-Event-ID; PING becomes a comment, which
+    keeps proxies from timing the stream out without waking the client.
+    """
+    event = json.loads(message)
+    if event.get("type") == "PING":
+        return ": ping\n\n"
+    position = event["data"] if event.get("type") == "HELLO" else event
+    seq, epoch = position.get("seq"), position.get("epoch")
+    # json.dumps never emits raw newlines, so the event fits one data line
+    event_id = f"id: {epoch}:{seq}\n" if seq is not None and epoch else ""
+    return f"{event_id}data: {message}\n\n"
+
+
+def parse_event_id(value: str):
+    """Last-Event-ID -> (since, epoch); (None, None) when it is not ours."""
+    epoch, _, seq = value.rpartition(":")
+    if not epoch or not seq.isdigit():
+        return None, None
+    return int(seq), epoch
+
+
+def command_text(frame: bytes) -> str:
+    """A binary command frame as the JSON text the command handler expects."""
+    try:
+        return json.dumps(decode_msgpack(frame))
+    except Exception:
+        # Let the handler answer "Malformed command"
+        return ""
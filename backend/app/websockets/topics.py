@@ -0,0 +1,56 @@
+import uuid
+from typing import Iterable, Optional, Set, Tuple
+
+# What a socket can subscribe to:
+#   lot          bids on the current player, selection and sale
+#   leaderboard  rank / purse / points changes
+#   bids         the bid log
+#   admin        operator events (checkpoints); opt-in, never a default
+#   team:<id>    one team's private channel: its own bids, purchases and
+#                leaderboard rows
+PUBLIC_TOPICS: Tuple[str, ...] = ("lot", "leaderboard", "bids")
+ADMIN_TOPIC = "admin"
+TEAM_PREFIX = "team:"
+
+# Event type -> topics it is delivered on. Types not listed here (reset,
+# STATE_SYNC, ...) tell clients to reload and go to every socket.
+EVENT_TOPICS = {
+    "BID_UPDATE": ("lot", "bids"),
+    "PLAYER_SELECTED": ("lot",),
+    "PLAYER_SOLD": ("lot", "bids"),
+    "AUCTION_COMPLETED": ("lot", "leaderboard"),
+    "LEADERBOARD_UPDATE": ("leaderboard",),
+    "LEADERBOARD_DELTA": ("leaderboard",),
+    "CHECKPOINT_SAVED": (ADMIN_TOPIC,),
+    "CHECKPOINT_DELETED": (ADMIN_TOPIC,),
+}
+
+
+def team_topic(team_id) -> str:
+    return f"{TEAM_PREFIX}{team_id}"
+
+
+def parse_topics(topics: Optional[Iterable[str]]) -> Set[str]:
+    """Validated topic set; None or empty subscribes to every public topic."""
+    parsed = set()
+    for topic in topics or ():
+        topic = topic.strip()
+        if not topic:
+            continue
+        if topic.startswith(TEAM_PREFIX):
+            try:
+                topic = team_topic(uuid.UUID(topic[len(TEAM_PREFIX):]))
+            except ValueError:
+                raise ValueError(f"Invalid team topic: {topic}")
+        elif topic not in PUBLIC_TOPICS and topic != ADMIN_TOPIC:
+            raise ValueError(f"Unknown topic: {topic}")
+        parsed.add(topic)
+    return parsed or set(PUBLIC_TOPICS)
+
+
+def event_topics(type: str, teams: Iterable = ()) -> Optional[Tuple[str, ...]]:
+    """Topics for one event, or None when every socket should get it."""
+    topics = EVENT_TOPICS.get(type)
+    if topics is None:
+        return None
+    return topics + tuple(team_topic(t) for t in teams if t)
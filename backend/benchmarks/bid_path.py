@@ -0,0 +1,262 @@
+"""
+Bid-path benchmark: drives place_bid and confirm_sale directly (no HTTP) with
+concurrent teams and reports throughput, latency percentiles, the share of
+time spent waiting on the standalone AuctionState row locks (sale and player
+selection) and the rejected-bid mix.
+
+WARNING: wipes teams, players and bids. Point DATABASE_URL at a scratch
+database and pass --yes.
+
+Usage:
+    python benchmarks/bid_path.py --yes
+    python benchmarks/bid_path.py --yes --teams 20 --sessions 10 --pattern burst --output before.json
+    python benchmarks/bid_path.py --yes --baseline before.json
+    python benchmarks/bid_path.py --yes --mode optimistic   # compare-and-swap on AuctionState.version
+    AUCTION_ENGINE=actor python benchmarks/bid_path.py --yes   # single-writer actor, group commit
+
+Patterns (each wave, every team submits one bid at the same time):
+    ladder  team i bids the next valid amount plus i ticks (distinct amounts)
+    burst   every team bids the same next valid amount (one winner per wave)
+    random  amounts scattered around the current bid, including stale ones
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+# Fix for Windows Asyncio Loop
+import platform
+if platform.system() == 'Windows':
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, event, update
+
+from app.core.metrics import BIDS_SHED, rejection_reason
+from app.db.session import async_session_maker, engine
+from app.models.all_models import AuctionState, Bid, Player, Team
+from app.services.auction_service import place_bid, confirm_sale, select_player
+from app.services.admission import bid_admission
+from app.services.live_engine import live_engine, engine_mode_enabled
+from app.services.bid_actor import auction_actor, actor_mode_enabled
+from benchmarks.stats import summarize, report_header, write_report, compare
+
+BASE_PRICE = 2000000  # 20 L
+# Bids only have to beat the current one, so a 1 L tick keeps long runs well
+# inside bids.amount (NUMERIC(10, 2)) while still exercising every check
+TICK = 100000
+TEAM_PURSE = 1000000000  # 100 Cr: never the limiting factor
+
+COMPARED_METRICS = [
+    "bids.per_second",
+    "bids.latency_ms.p50",
+    "bids.latency_ms.p95",
+    "bids.latency_ms.p99",
+    "confirm_sale.latency_ms.p95",
+    "lock_wait.share",
+]
+
+
+class LockWaitProbe:
+    """
+    Times every standalone `SELECT ... FOR UPDATE` on the engine. Such a
+    statement returns once the row lock is granted, so its duration is
+    (almost entirely) time spent queued behind other transactions.
+
+    The single-statement bid also says FOR UPDATE, but it is a CTE that does
+    the whole bid; its lock wait can't be told apart from the work, so it is
+    left out (bid latency covers it).
+    """
+
+    def __init__(self, sync_engine):
+        self.total = 0.0
+        self.count = 0
+        self._engine = sync_engine
+
+    @staticmethod
+    def is_lock(statement: str) -> bool:
+        return statement.lstrip().upper().startswith("SELECT") and "FOR UPDATE" in statement
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        if self.is_lock(statement):
+            conn.info.setdefault("bench_lock_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        if self.is_lock(statement):
+            self.total += time.perf_counter() - conn.info["bench_lock_started"].pop()
+            self.count += 1
+
+    def __enter__(self):
+        event.listen(self._engine, "before_cursor_execute", self._before)
+        event.listen(self._engine, "after_cursor_execute", self._after)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self._engine, "before_cursor_execute", self._before)
+        event.remove(self._engine, "after_cursor_execute", self._after)
+
+
+async def setup(teams: int, lots: int):
+    async with async_session_maker() as session:
+        await session.execute(delete(Bid))
+        await session.execute(update(AuctionState).values(current_player_id=None, current_bidder_id=None))
+        await session.execute(delete(Player))
+        await session.execute(delete(Team))
+
+        team_rows = [Team(name=f"Bench Team {i}", code=f"B{i:03d}", purse_balance=TEAM_PURSE) for i in range(teams)]
+        player_rows = [
+            Player(name=f"Bench Player {i}", role="BATSMAN", base_price=BASE_PRICE, points=10)
+            for i in range(lots)
+        ]
+        session.add_all(team_rows + player_rows)
+        await session.flush()
+
+        state = await session.get(AuctionState, 1)
+        if state is None:
+            session.add(AuctionState(id=1, status="WAITING", remaining_players_count=lots))
+        else:
+            state.status, state.current_bid = "WAITING", 0
+            # Versions never rewind, not even here: clients holding an older
+            # version or replay position must not see it become valid again
+            state.version = (state.version or 0) + 1
+            state.remaining_players_count = lots
+        await session.commit()
+        return [t.id for t in team_rows], [p.id for p in player_rows]
+
+
+def wave_amounts(pattern: str, current: float, team_count: int, rng: random.Random):
+    next_valid = current + TICK if current else BASE_PRICE
+    if pattern == "burst":
+        return [next_valid] * team_count
+    if pattern == "random":
+        return [max(BASE_PRICE, current + rng.randint(-1, 3) * TICK) for _ in range(team_count)]
+    return [next_valid + i * TICK for i in range(team_count)]
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    bid_admission.rate = args.rate_limit
+    team_ids, player_ids = await setup(args.teams, args.lots)
+    if engine_mode_enabled():
+        await live_engine.start()
+    elif actor_mode_enabled():
+        await auction_actor.start()
+
+    sessions = asyncio.Semaphore(args.sessions)
+    bid_latencies, sale_latencies = [], []
+    outcomes = Counter()
+
+    async def timed_bid(amount, team_id, version):
+        async with sessions:
+            started = time.perf_counter()
+            try:
+                async with async_session_maker() as session:
+                    state = await place_bid(amount, team_id, session, expected_version=version)
+                outcome, result = "accepted", (float(state.current_bid), state.version)
+            except Exception as e:
+                outcome, result = rejection_reason(e), None
+            bid_latencies.append(time.perf_counter() - started)
+            outcomes[outcome] += 1
+            return result
+
+    with LockWaitProbe(engine.sync_engine) as probe:
+        started = time.perf_counter()
+        for player_id in player_ids:
+            async with async_session_maker() as session:
+                state = await select_player(player_id, session)
+
+            # In optimistic mode every team in a wave bids against the version it last saw
+            current, version = 0.0, state.version
+            for _ in range(args.waves):
+                amounts = wave_amounts(args.pattern, current, len(team_ids), rng)
+                order = list(zip(amounts, team_ids))
+                rng.shuffle(order)
+                expected = version if args.mode == "optimistic" else None
+                results = await asyncio.gather(*(timed_bid(a, t, expected) for a, t in order))
+                for result in results:
+                    if result is not None and result[1] > version:
+                        current, version = result
+
+            sale_started = time.perf_counter()
+            try:
+                async with async_session_maker() as session:
+                    await confirm_sale(session)
+                sale_latencies.append(time.perf_counter() - sale_started)
+            except Exception as e:
+                outcomes[f"confirm_sale: {e}"] += 1
+        elapsed = time.perf_counter() - started
+
+    await live_engine.stop()
+    await auction_actor.stop()
+    await engine.dispose()
+
+    attempted = sum(v for k, v in outcomes.items() if not k.startswith("confirm_sale"))
+    busy = sum(bid_latencies) + sum(sale_latencies)
+    report = report_header("bid_path", {
+        "engine": "memory" if engine_mode_enabled() else "actor" if actor_mode_enabled() else "database",
+        "mode": args.mode,
+        "rate_limit": args.rate_limit,
+        "teams": args.teams,
+        "sessions": args.sessions,
+        "lots": args.lots,
+        "waves": args.waves,
+        "pattern": args.pattern,
+        "seed": args.seed,
+    })
+    report.update({
+        "elapsed_s": round(elapsed, 3),
+        "bids": {
+            "attempted": attempted,
+            "accepted": outcomes["accepted"],
+            "per_second": round(attempted / elapsed, 1) if elapsed else None,
+            "accepted_per_second": round(outcomes["accepted"] / elapsed, 1) if elapsed else None,
+            "latency_ms": summarize(bid_latencies),
+            "rejected": {k: v for k, v in outcomes.most_common() if k != "accepted"},
+            # Subset of the rejections answered by admission control without the database
+            "shed": {
+                sample.labels["reason"]: int(sample.value)
+                for metric in BIDS_SHED.collect() for sample in metric.samples
+                if sample.name.endswith("_total")
+            },
+        },
+        "confirm_sale": {"latency_ms": summarize(sale_latencies)},
+        "lock_wait": {
+            "statements": probe.count,
+            "total_s": round(probe.total, 3),
+            # Share of request time spent queued on the standalone AuctionState row locks
+            "share": round(probe.total / busy, 4) if busy else None,
+        },
+    })
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark place_bid / confirm_sale")
+    parser.add_argument("--teams", type=int, default=10, help="Concurrent bidding teams")
+    parser.add_argument("--sessions", type=int, default=10, help="Max DB sessions in flight at once")
+    parser.add_argument("--lots", type=int, default=20, help="Players auctioned (one confirm_sale each)")
+    parser.add_argument("--waves", type=int, default=20, help="Bid waves per lot")
+    parser.add_argument("--pattern", choices=["ladder", "burst", "random"], default="ladder")
+    parser.add_argument("--mode", choices=["locked", "optimistic"], default="locked",
+                        help="Row-lock bids, or compare-and-swap bids carrying expected_version")
+    parser.add_argument("--rate-limit", type=float, default=0,
+                        help="Per-team bids/sec before admission answers 429 (0 = off)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--yes", action="store_true", help="Confirm the target database may be wiped")
+    args = parser.parse_args()
+
+    if not args.yes:
+        parser.error("this benchmark wipes teams, players and bids; re-run with --yes against a scratch database")
+
+    report = asyncio.run(run(args))
+    write_report(report, args.output)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            print("\n".join(compare(json.load(f), report, COMPARED_METRICS)))
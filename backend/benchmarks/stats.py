@@ -0,0 +1,85 @@
+"""Shared helpers for the benchmark scripts: latency summaries and JSON reports."""
+import json
+import math
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(seconds: List[float]) -> Dict[str, Any]:
+    """Latency distribution in milliseconds."""
+    values = sorted(seconds)
+    if not values:
+        return {"count": 0, "mean": None, "p50": None, "p95": None, "p99": None, "max": None}
+
+    def ms(v):
+        return round(v * 1000, 3)
+
+    return {
+        "count": len(values),
+        "mean": ms(sum(values) / len(values)),
+        "p50": ms(percentile(values, 50)),
+        "p95": ms(percentile(values, 95)),
+        "p99": ms(percentile(values, 99)),
+        "max": ms(values[-1]),
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report_header(name: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    # Enough context to tell two result files apart when comparing commits
+    return {
+        "benchmark": name,
+        "commit": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "host": {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system()},
+        "config": config,
+    }
+
+
+def write_report(report: Dict[str, Any], path: Optional[str]):
+    body = json.dumps(report, indent=2, default=str)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(body + "\n")
+    print(body)
+
+
+def compare(baseline: Dict[str, Any], report: Dict[str, Any], metrics: List[str]) -> List[str]:
+    """
+    One line per metric (dotted path into the report) with the relative change
+    against a baseline result file.
+    """
+    def lookup(data, path):
+        for part in path.split("."):
+            if not isinstance(data, dict) or part not in data:
+                return None
+            data = data[part]
+        return data
+
+    lines = [f"Compared with {baseline.get('commit') or 'baseline'}:"]
+    for metric in metrics:
+        old, new = lookup(baseline, metric), lookup(report, metric)
+        if old is None or new is None:
+            lines.append(f"  {metric:<32} {old} -> {new}")
+            continue
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        lines.append(f"  {metric:<32} {old} -> {new} ({change})")
+    return lines
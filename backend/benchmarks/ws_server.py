@@ -0,0 +1,58 @@
+"""
+The app's /ws endpoint and ConnectionManager without the database, plus two
+routes the fan-out benchmark uses to drive it. Started by ws_fanout.py:
+
+    uvicorn benchmarks.ws_server:app --port 8765
+"""
+import time
+from typing import List
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from app.websockets.manager import manager
+from main import websocket_endpoint
+
+# A full LEADERBOARD_UPDATE is the heaviest event clients receive
+TEAM_CODES = ["CSK", "MI", "RCB", "KKR", "SRH", "DC", "PBKS", "RR", "GT", "LSG"]
+
+
+class BurstRequest(BaseModel):
+    types: List[str] = ["BID_UPDATE"]
+    count: int = 10
+
+
+def payload(type: str, i: int):
+    if type == "LEADERBOARD_UPDATE":
+        return [{
+            "rank": rank,
+            "id": f"00000000-0000-0000-0000-{rank:012d}",
+            "name": f"{code} Franchise",
+            "code": code,
+            "total_points": 500 - rank * 20,
+            "purse_balance": 1200000000 - rank * 35000000,
+            "players_count": 10 + rank,
+        } for rank, code in enumerate(TEAM_CODES, start=1)]
+    return {"amount": 2000000 + i * 500000, "team_id": "00000000-0000-0000-0000-000000000001"}
+
+
+app = FastAPI(title="IPL Auction /ws fan-out bench")
+app.add_api_websocket_route("/ws", websocket_endpoint)
+
+
+@app.post("/bench/burst")
+async def burst(request: BurstRequest):
+    # `sent_at` rides inside the event so clients can compute publish-to-receive latency
+    publish_s = 0.0
+    for i in range(request.count):
+        for type in request.types:
+            data = {"sent_at": time.time(), "payload": payload(type, i)}
+            started = time.perf_counter()
+            await manager.broadcast(type, data)
+            publish_s += time.perf_counter() - started
+    return {"published": request.count * len(request.types), "publish_s": publish_s}
+
+
+@app.get("/bench/stats")
+async def stats():
+    return {"connections": len(manager.active_connections), "evicted": manager.evicted_count}
@@ -1,16 +1,16 @@
 import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import select, func
 from app.models.all_models import Team, Player, AuctionState
-from app.db.session import DATABASE_URL
+from app.db.session import script_engine, pool_stats
 
 # Fix for Windows Asyncio Loop
 import platform
 if platform.system() == 'Windows':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-engine = create_async_engine(DATABASE_URL, echo=False, connect_args={"statement_cache_size": 0})
+engine = script_engine()
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 async def check_database():
@@ -48,5 +48,7 @@ async def check_database():
             status = "Sold" if player.is_sold else "Unsold"
             print(f"  - {player.name} ({status}) - ₹{player.base_price/100000:.1f}L")
 
+    print(f"\nConnection pool: {pool_stats(engine)}")
+
 if __name__ == "__main__":
     asyncio.run(check_database())
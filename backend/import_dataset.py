@@ -0,0 +1,78 @@
+"""
+Idempotent dataset import: upserts teams and players without touching bids
+or auction outcomes, so it is safe to re-run before a rehearsal.
+
+Usage:
+    python import_dataset.py json  [--path ipl_auction_dataset.json]
+    python import_dataset.py seed                      # seed_data_v2.PLAYERS
+    python import_dataset.py excel [--path ../IPL_2025_FINAL_OUTPUT.xlsx]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# Fix for Windows Asyncio Loop
+import platform
+if platform.system() == 'Windows':
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+# Configure stdout to handle UTF-8
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import script_engine
+from app.services.dataset_import import import_dataset, read_json_dataset, read_seed_players, read_excel_players
+
+engine = script_engine()
+async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+DEFAULT_PATHS = {
+    "json": "ipl_auction_dataset.json",
+    "excel": os.path.join("..", "IPL_2025_FINAL_OUTPUT.xlsx"),
+}
+
+async def main(source: str, path: str, batch_size: int):
+    if source == "json":
+        teams, players = read_json_dataset(path)
+    elif source == "excel":
+        teams, players = read_excel_players(path)
+    else:
+        teams, players = read_seed_players()
+
+    print(f"Importing {source} dataset{f' from {path}' if path else ''} (batch size {batch_size})...")
+    async with async_session() as session:
+        report = await import_dataset(session, teams, players, batch_size=batch_size)
+
+    timings = report["timings"]
+    print("=" * 50)
+    print("DATASET IMPORT COMPLETED")
+    print("=" * 50)
+    print(f"Teams upserted:   {report['teams']:>6}  ({timings['teams'] * 1000:.1f} ms)")
+    print(f"Players upserted: {report['players']:>6}  ({timings['players'] * 1000:.1f} ms)")
+    if report["players_per_second"]:
+        print(f"Throughput:       {report['players_per_second']:,.0f} players/s")
+    print(f"Unsold players:   {report['unsold_players']:>6}")
+    print(f"Total time:       {timings['total'] * 1000:.1f} ms")
+    print("=" * 50)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upsert teams and players from a dataset")
+    parser.add_argument("source", choices=["json", "seed", "excel"])
+    parser.add_argument("--path", help="Dataset file (json/excel sources)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args.source, args.path or DEFAULT_PATHS.get(args.source), args.batch_size))
+    except Exception as e:
+        print(f"ERROR: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
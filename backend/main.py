@@ -1,11 +1,21 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.api.routes import auction, teams, players
 from app.websockets.manager import manager
+from app.websockets.bus import create_backend
+from app.websockets.commands import handle_command
+from app.websockets.protocol import command_text
+from app.websockets.topics import parse_topics
+from app.services.live_engine import live_engine, engine_mode_enabled
+from app.services.bid_actor import auction_actor, actor_mode_enabled
+from app.services.leaderboard import leaderboard
+from app.services.admission import bid_admission
 from app.db.session import engine, Base, async_session_maker
 from app.models.all_models import AuctionState, Player
+from app.core.metrics import MetricsMiddleware
 from sqlalchemy import select, func
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -34,12 +44,32 @@ async def lifespan(app: FastAPI):
                 state = AuctionState(id=1, status="WAITING", remaining_players_count=count)
                 session.add(state)
 
+        # Bid admission judges stale bids against the lot as of startup
+        bid_admission.prime(state.status, state.current_bid, state.version)
+
+    # Cross-worker broadcast bus (BROADCAST_BACKEND=memory|postgres)
+    await manager.start(create_backend())
+
+    # Build the in-memory leaderboard and check it against DENSE_RANK()
+    async with async_session_maker() as session:
+        await leaderboard.reconcile(session)
+
+    # Opt-in in-memory bid engine: rebuild the live lot from the DB
+    if engine_mode_enabled():
+        await live_engine.start()
+        print("⚡ In-memory auction engine enabled (write-behind persistence).")
+    elif actor_mode_enabled():
+        await auction_actor.start()
+        print("⚡ Single-writer bid actor enabled (group commit).")
     
     print("🚀 IPL Auction Backend Ready.")
     
     yield
     
     # Shutdown: Clean up resources if needed
+    await live_engine.stop()
+    await auction_actor.stop()
+    await manager.stop()
     print("Shutdown: Application stopping.")
 
 app = FastAPI(
@@ -55,8 +85,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Read by the frontend as the LEADERBOARD_DELTA baseline
+    expose_headers=["X-Leaderboard-Version"],
 )
 
+# Request latency by route template (exported at /metrics)
+app.add_middleware(MetricsMiddleware)
+
 # Routes
 app.include_router(auction.router, prefix="/api/auction", tags=["Auction"])
 app.include_router(teams.router, prefix="/api/teams", tags=["Teams"])
@@ -64,15 +99,45 @@ app.include_router(players.router, prefix="/api/players", tags=["Players"])
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+    # Resume support: /ws?since=<last seq seen>&epoch=<epoch from HELLO>
+    since = websocket.query_params.get("since")
+    # Topic filter: /ws?topics=lot,leaderboard,team:<team id> (default: every public topic)
+    try:
+        topics = parse_topics(websocket.query_params.get("topics", "").split(","))
+    except ValueError:
+        await websocket.close(code=1008)
+        return
+    await manager.connect(
+        websocket,
+        since=int(since) if since and since.isdigit() else None,
+        epoch=websocket.query_params.get("epoch"),
+        topics=topics,
+    )
     try:
         while True:
-            data = await websocket.receive_text()
-            # Handle incoming messages if any (e.g. ping)
-            pass
+            # Commands run one at a time, so a client's bids apply in the order sent
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            manager.touch(websocket)
+            raw = message.get("text")
+            if raw is None:
+                # MessagePack clients send binary command frames
+                raw = command_text(message.get("bytes") or b"")
+            reply = await handle_command(raw, websocket)
+            if reply is not None:
+                manager.send_personal(websocket, reply)
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Also covers sockets the manager already evicted as slow consumers
         manager.disconnect(websocket)
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Prometheus text format; per worker process
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/")
 async def root():
     return {"message": "IPL Auction Portal Backend is Running"}
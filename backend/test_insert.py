@@ -10,9 +10,9 @@ if platform.system() == 'Windows':
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.models.all_models import Team
-from app.db.session import DATABASE_URL, create_async_engine
+from app.db.session import script_engine
 
-engine = create_async_engine(DATABASE_URL, echo=True, connect_args={"statement_cache_size": 0})
+engine = script_engine(echo=True)
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 async def test_insert():
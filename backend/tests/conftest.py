@@ -0,0 +1,58 @@
+import sys
+import os
+
+import pytest
+import pytest_asyncio
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, text, update
+
+from app.db.session import engine, Base, async_session_maker
+from app.models.all_models import AuctionCheckpoint, AuctionState, Bid, Player, Team
+
+
+@pytest_asyncio.fixture
+async def clean_db():
+    """
+    Empty teams, players, bids and checkpoints in the DATABASE_URL database
+    (skips when it is not reachable). The auction_state row is kept, version
+    included: versions only ever move forward.
+    """
+    # Pooled connections may belong to an earlier test's event loop
+    await engine.dispose(close=False)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.run_sync(Base.metadata.create_all)
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"database not reachable: {e}")
+
+    async with async_session_maker() as session:
+        await session.execute(delete(Bid))
+        await session.execute(delete(AuctionCheckpoint))
+        await session.execute(update(AuctionState).values(
+            status="WAITING", current_player_id=None, current_bid=0, current_bidder_id=None,
+        ))
+        await session.execute(delete(Player))
+        await session.execute(delete(Team))
+        if await session.get(AuctionState, 1) is None:
+            session.add(AuctionState(id=1, status="WAITING", remaining_players_count=0))
+        await session.commit()
+
+    yield async_session_maker
+
+    # The pool belongs to this test's event loop
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def api_client(clean_db):
+    """HTTP client for the app over ASGI (no lifespan), on the clean_db database."""
+    from httpx import ASGITransport, AsyncClient
+    from main import app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
@@ -0,0 +1,72 @@
+import pytest
+import json
+import sys
+import os
+import uuid
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.errors import BidRateLimited, StaleBidError
+from app.services.admission import BidAdmission
+
+def event(type, data, version=None):
+    message = {"seq": 1, "epoch": "e", "type": type, "data": data}
+    if version is not None:
+        message["version"] = version
+    return json.dumps(message)
+
+def test_bids_that_cannot_win_are_shed_from_the_lot_view():
+    admission = BidAdmission(rate=0)
+    leader, other = uuid.uuid4(), uuid.uuid4()
+
+    # Nothing known yet: everything passes through to the database
+    with admission.admit(100, other):
+        pass
+
+    admission.on_event(event("PLAYER_SELECTED", {"player_id": "p"}))
+    admission.on_event(event("BID_UPDATE", {"amount": 2500000, "team_id": str(leader)}, version=4))
+
+    with pytest.raises(ValueError, match="Bid too low"):
+        with admission.admit(2500000, other):
+            pass
+    # The leader may have been outbid already: self-bids go to the database
+    with admission.admit(3000000, leader):
+        pass
+    with pytest.raises(StaleBidError):
+        with admission.admit(3000000, other, expected_version=3):
+            pass
+    with admission.admit(3000000, other, expected_version=4):
+        # A repeat click while the first is still in flight
+        with pytest.raises(ValueError, match="Duplicate"):
+            with admission.admit(3000000, other):
+                pass
+
+    # Matched on the event type, not on text that happens to appear in the payload
+    admission.on_event(event("CHECKPOINT_SAVED", {"name": '"type": "AUCTION_RESET"'}))
+    with pytest.raises(ValueError, match="Bid too low"):
+        with admission.admit(2500000, other):
+            pass
+
+    # After a reset the view no longer judges
+    admission.on_event(event("AUCTION_RESET", {"purse_balance": 1}))
+    with admission.admit(100, leader):
+        pass
+
+def test_per_team_rate_limit():
+    admission = BidAdmission(rate=1, burst=2)
+    team_a, team_b = uuid.uuid4(), uuid.uuid4()
+    for amount in (1, 2):
+        with admission.admit(amount, team_a):
+            pass
+    with pytest.raises(BidRateLimited) as e:
+        with admission.admit(3, team_a):
+            pass
+    assert 0 < e.value.retry_after <= 1
+
+    # Other teams and admin adjustments have their own (or no) budget
+    with admission.admit(3, team_b):
+        pass
+    for amount in range(5):
+        with admission.admit(amount, None):
+            pass
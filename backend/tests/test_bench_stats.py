@@ -0,0 +1,30 @@
+import sys
+import os
+
+# Add parent directory to path to allow importing 'benchmarks'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stats import percentile, summarize, compare
+from benchmarks.bid_path import rejection_reason, wave_amounts, BASE_PRICE, TICK
+
+def test_latency_summary_and_comparison():
+    values = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+
+    summary = summarize(list(reversed(values)))
+    assert summary["count"] == 100
+    assert (summary["p50"], summary["p95"], summary["p99"], summary["max"]) == (50.0, 95.0, 99.0, 100.0)
+    assert summarize([])["p99"] is None
+
+    lines = compare({"commit": "abc", "bids": {"per_second": 100}}, {"bids": {"per_second": 150}}, ["bids.per_second"])
+    assert lines[1].strip().endswith("100 -> 150 (+50.0%)")
+
+def test_bid_patterns_and_rejection_reasons():
+    import random
+    rng = random.Random(1)
+    assert wave_amounts("burst", 0, 3, rng) == [BASE_PRICE] * 3
+    assert wave_amounts("ladder", BASE_PRICE, 3, rng) == [BASE_PRICE + TICK * (i + 1) for i in range(3)]
+    assert rejection_reason(ValueError("Bid too low. Current bid: 2100000")) == "Bid too low"
+    assert rejection_reason(ValueError("First bid must be at least base price: ₹20L")) == "First bid must be at least base price"
+    assert rejection_reason(RuntimeError("boom")) == "RuntimeError"
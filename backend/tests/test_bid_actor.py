@@ -0,0 +1,159 @@
+import pytest
+import asyncio
+import sys
+import os
+import uuid
+from dataclasses import replace
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.bid_actor import AuctionActor
+from app.services.live_engine import LiveLot, TeamLedger
+
+def make_actor(team_ids, commits):
+    # Start the actor by hand: a fixed lot, commits recorded instead of written
+    actor = AuctionActor(batch_size=100)
+    actor.engine.lot = LiveLot(status="ACTIVE", current_player_id=uuid.uuid4(), base_price=2000000)
+    actor.engine.teams = {t: TeamLedger(purse_balance=100000000, players_count=0) for t in team_ids}
+
+    async def persist(batch):
+        commits.append([w.version for w in batch])
+
+    async def reload():
+        commits.append("reload")
+
+    actor.engine.persist = persist
+    actor.reload = reload
+    actor._queue = asyncio.Queue()
+    actor._task = asyncio.create_task(actor._run())
+    actor.enabled = True
+    return actor
+
+@pytest.mark.asyncio
+async def test_actor_group_commits_concurrent_bids_in_order():
+    teams = [uuid.uuid4() for _ in range(5)]
+    commits = []
+    actor = make_actor(teams, commits)
+
+    async def try_bid(amount, team_id):
+        try:
+            lot = await actor.submit_bid(amount, team_id)
+            return lot.version
+        except ValueError as e:
+            return str(e)
+
+    # Queued before the actor runs, so they arrive as one batch
+    results = await asyncio.gather(
+        try_bid(2000000, teams[0]),
+        try_bid(2000000, teams[1]),
+        try_bid(2500000, teams[1]),
+        try_bid(2500000, teams[2]),
+        try_bid(3000000, teams[3]),
+    )
+    assert results[0] == 1
+    assert "Bid too low" in results[1]
+    assert results[2] == 2
+    assert "Bid too low" in results[3]
+    assert results[4] == 3
+    # Accepted bids were saved in one transaction, in arrival order
+    assert commits == [[1, 2, 3]]
+
+    await actor.stop()
+
+@pytest.mark.asyncio
+async def test_actor_runs_state_changes_between_bids():
+    team_a, team_b = uuid.uuid4(), uuid.uuid4()
+    commits = []
+    actor = make_actor([team_a, team_b], commits)
+
+    first = asyncio.create_task(actor.submit_bid(2000000, team_a))
+    await asyncio.sleep(0)
+
+    async def sale():
+        async with actor.exclusive("confirm_sale"):
+            commits.append("sale")
+
+    sale_task = asyncio.create_task(sale())
+    await asyncio.sleep(0)
+    later = asyncio.create_task(actor.submit_bid(2500000, team_b))
+
+    await asyncio.gather(first, sale_task, later)
+    # The sale waited for the earlier bid and the later bid waited for the
+    # sale and the reload that followed it
+    assert commits == [[1], "sale", "reload", [2]]
+
+    await actor.stop()
+
+@pytest.mark.asyncio
+async def test_actor_survives_failed_commit_and_reload():
+    team_a, team_b = uuid.uuid4(), uuid.uuid4()
+    commits = []
+    actor = make_actor([team_a, team_b], commits)
+    database = {"up": False}
+    saved_lot = replace(actor.engine.lot)
+
+    async def persist(batch):
+        if not database["up"]:
+            raise RuntimeError("db down")
+        commits.append([w.version for w in batch])
+
+    async def reload():
+        if not database["up"]:
+            raise RuntimeError("db down")
+        actor.engine.lot = replace(saved_lot)
+        commits.append("reload")
+
+    actor.engine.persist = persist
+    actor.reload = reload
+
+    with pytest.raises(RuntimeError, match="could not be saved"):
+        await actor.submit_bid(2000000, team_a)
+    # Still down: the lot can't be trusted, so bids are refused, not judged
+    with pytest.raises(RuntimeError, match="unavailable"):
+        await actor.submit_bid(2000000, team_a)
+    assert not actor._task.done()
+
+    database["up"] = True
+    lot = await actor.submit_bid(2000000, team_b)
+    assert lot.current_bidder_id == team_b
+    assert commits == ["reload", [lot.version]]
+
+    async with actor.exclusive("confirm_sale"):
+        pass
+    await actor.stop()
+
+    # A dead actor fails fast instead of hanging
+    with pytest.raises(RuntimeError, match="unavailable"):
+        await actor.submit_bid(2500000, team_a)
+
+@pytest.mark.asyncio
+async def test_timeout_withdraws_queued_bids_but_not_one_being_committed():
+    team_a, team_b = uuid.uuid4(), uuid.uuid4()
+    commits = []
+    actor = make_actor([team_a, team_b], commits)
+    actor.timeout = 0.05
+    slow_commit = asyncio.Event()
+
+    async def persist(batch):
+        await slow_commit.wait()
+        commits.append([w.version for w in batch])
+
+    actor.engine.persist = persist
+
+    committing = asyncio.create_task(actor.submit_bid(2000000, team_a))
+    # Let the actor take it into a batch of its own
+    await asyncio.sleep(0.01)
+    # Queued behind the stuck commit: times out and is withdrawn
+    with pytest.raises(RuntimeError, match="not confirmed in time"):
+        await actor.submit_bid(2500000, team_b)
+
+    # The first bid is past its timeout too, but it is durable once the commit lands
+    assert not committing.done()
+    slow_commit.set()
+    assert (await committing).version == 1
+
+    lot = await actor.submit_bid(2500000, team_b)
+    assert lot.version == 2
+    assert commits == [[1], [2]]
+    await actor.stop()
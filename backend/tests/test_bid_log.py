@@ -0,0 +1,75 @@
+import pytest
+import sys
+import os
+import json
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.all_models import Bid, Player, Team
+
+T0 = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+async def seed_bids(session_maker):
+    """Seven bids on three timestamps; ties on timestamp are broken by id."""
+    async with session_maker() as session:
+        team = Team(name="Log Team", code="LT", purse_balance=100000000)
+        player = Player(name="Log Player", role="BATSMAN", base_price=2000000, points=10)
+        session.add_all([team, player])
+        await session.flush()
+        offsets = [0, 0, 0, 1, 1, 2, 2]
+        bids = [
+            Bid(player_id=player.id, team_id=team.id, amount=2000000 + i * 100000, timestamp=T0 + timedelta(seconds=s))
+            for i, s in enumerate(offsets)
+        ]
+        session.add_all(bids)
+        await session.commit()
+        # Newest first, then id descending: the order every page walk must reproduce
+        return [str(b.id) for b in sorted(bids, key=lambda b: (b.timestamp, b.id), reverse=True)]
+
+async def walk(client, params, limit):
+    ids, cursor = [], None
+    while True:
+        page = await client.get("/api/auction/all-bids", params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert page.status_code == 200
+        ids += [b["id"] for b in page.json()]
+        cursor = page.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids
+
+@pytest.mark.asyncio
+async def test_pages_neither_repeat_nor_skip_bids_with_equal_timestamps(clean_db, api_client):
+    expected = await seed_bids(clean_db)
+    assert [b["id"] for b in (await api_client.get("/api/auction/all-bids")).json()] == expected
+
+    for limit in (1, 2, 3):
+        assert await walk(api_client, {}, limit) == expected
+
+    assert (await api_client.get("/api/auction/all-bids", params={"cursor": "nope"})).status_code == 400
+
+@pytest.mark.asyncio
+async def test_since_returns_only_later_bids(clean_db, api_client):
+    expected = await seed_bids(clean_db)
+    since = {"since": T0.isoformat()}
+
+    later = (await api_client.get("/api/auction/all-bids", params=since)).json()
+    assert [b["id"] for b in later] == expected[:4]
+    # Combined with the cursor, paging stays inside the window
+    assert await walk(api_client, since, 1) == expected[:4]
+
+@pytest.mark.asyncio
+async def test_ndjson_export_is_one_object_per_line(clean_db, api_client):
+    expected = await seed_bids(clean_db)
+
+    response = await api_client.get("/api/auction/all-bids", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.endswith("\n")
+    lines = response.text.split("\n")[:-1]
+    rows = [json.loads(line) for line in lines]
+    assert [r["id"] for r in rows] == expected
+    assert rows[0] == (await api_client.get("/api/auction/all-bids", params={"limit": 1})).json()[0]
+
+    limited = await api_client.get("/api/auction/all-bids", params={"format": "ndjson", "limit": 3})
+    assert [json.loads(line)["id"] for line in limited.text.splitlines()] == expected[:3]
@@ -0,0 +1,101 @@
+import pytest
+import sys
+import os
+import uuid
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from app.core.errors import StaleBidError
+from app.models.all_models import AuctionState, Bid, Player, Team
+from app.services.auction_service import BidOutcome, BID_REJECTIONS, PLACE_BID_LOCKED, PLACE_BID_CAS, _place_bid_statement
+
+def outcome(code, **values):
+    fields = dict(version=3, current_bid=2500000.0, current_bidder_id=None,
+                  current_player_id=uuid.uuid4(), base_price=2000000.0)
+    fields.update(values)
+    return BidOutcome(outcome=code, **fields)
+
+def test_outcome_codes_map_to_existing_messages():
+    outcome("ok").raise_for_rejection()
+
+    with pytest.raises(ValueError, match=r"^First bid must be at least base price: ₹20L$"):
+        outcome("below_base_price").raise_for_rejection()
+    with pytest.raises(ValueError, match=r"^Bid too low. Current bid: 2500000.0$"):
+        outcome("bid_too_low").raise_for_rejection()
+    with pytest.raises(StaleBidError) as e:
+        outcome("stale", version=7).raise_for_rejection()
+    assert e.value.current_version == 7
+
+    for code, message in BID_REJECTIONS.items():
+        with pytest.raises(ValueError, match=message):
+            outcome(code).raise_for_rejection()
+
+def test_optimistic_variant_only_differs_in_lock_clause():
+    assert "FOR UPDATE SKIP LOCKED" in PLACE_BID_CAS.text
+    assert "SKIP LOCKED" not in PLACE_BID_LOCKED.text
+    assert PLACE_BID_LOCKED.text.replace("FOR UPDATE", "FOR UPDATE SKIP LOCKED") == PLACE_BID_CAS.text
+
+async def seed_lot(session_maker, status="ACTIVE"):
+    # Lot open at base price 20 L; "POOR" cannot afford more than 25 L
+    async with session_maker() as session:
+        rich = Team(name="Rich", code="RCH", purse_balance=100000000)
+        poor = Team(name="Poor", code="PR", purse_balance=2500000)
+        player = Player(name="Statement Lot", role="BATSMAN", base_price=2000000, points=10)
+        session.add_all([rich, poor, player])
+        await session.flush()
+        state = await session.get(AuctionState, 1)
+        state.status, state.current_player_id, state.current_bid, state.current_bidder_id = status, player.id, 0, None
+        await session.commit()
+        return rich.id, poor.id, state.version
+
+async def bid(session_maker, amount, team_id, expected_version=None):
+    async with session_maker() as session:
+        return await _place_bid_statement(amount, team_id, expected_version, session)
+
+async def ledger(session_maker):
+    async with session_maker() as session:
+        bids = (await session.execute(select(Bid.team_id, Bid.amount).order_by(Bid.amount))).all()
+        state = await session.get(AuctionState, 1)
+        return [(team_id, float(amount)) for team_id, amount in bids], state.version, float(state.current_bid), state.current_bidder_id
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("statement_version", [None, "current"])
+async def test_accepted_bid_logs_one_row_and_bumps_version(clean_db, statement_version):
+    rich, _, version = await seed_lot(clean_db)
+    expected = version if statement_version == "current" else None
+
+    outcome = await bid(clean_db, 2000000, rich, expected)
+
+    assert (outcome.outcome, outcome.version, outcome.current_bid, outcome.current_bidder_id) == ("ok", version + 1, 2000000.0, rich)
+    assert await ledger(clean_db) == ([(rich, 2000000.0)], version + 1, 2000000.0, rich)
+
+@pytest.mark.asyncio
+async def test_rejected_bids_write_nothing(clean_db):
+    rich, poor, version = await seed_lot(clean_db)
+    await bid(clean_db, 2000000, poor)
+    after_first = ([(poor, 2000000.0)], version + 1, 2000000.0, poor)
+
+    for amount, team_id, message in [(2000000, rich, "Bid too low"), (2100000, poor, "Self-bidding not allowed")]:
+        with pytest.raises(ValueError, match=message):
+            await bid(clean_db, amount, team_id)
+        assert await ledger(clean_db) == after_first
+
+    # Rich bids, so Poor is no longer the current bidder but can't cover 30 L
+    await bid(clean_db, 2200000, rich)
+    with pytest.raises(ValueError, match="Insufficient funds"):
+        await bid(clean_db, 3000000, poor)
+    with pytest.raises(StaleBidError) as stale:
+        await bid(clean_db, 2500000, poor, expected_version=version + 1)
+    assert stale.value.current_version == version + 2
+    assert await ledger(clean_db) == ([(poor, 2000000.0), (rich, 2200000.0)], version + 2, 2200000.0, rich)
+
+@pytest.mark.asyncio
+async def test_bids_outside_an_active_lot_are_refused(clean_db):
+    rich, _, version = await seed_lot(clean_db, status="WAITING")
+
+    with pytest.raises(ValueError, match="Auction not active"):
+        await bid(clean_db, 2000000, rich)
+    assert await ledger(clean_db) == ([], version, 0.0, None)
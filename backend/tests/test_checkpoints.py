@@ -0,0 +1,82 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from app.models.all_models import AuctionState, Bid, Player, Team
+from app.services.auction_service import confirm_sale, place_bid, reset_auction_logic, select_player
+from app.services.checkpoint_service import create_checkpoint, restore_checkpoint
+
+async def seed(session_maker):
+    async with session_maker() as session:
+        teams = [Team(name=f"Checkpoint {c}", code=c, purse_balance=100000000) for c in ("CPA", "CPB")]
+        players = [Player(name=f"Lot {i}", role="BATSMAN", base_price=2000000, points=10 * i) for i in (1, 2, 3)]
+        session.add_all(teams + players)
+        await session.commit()
+        return [t.id for t in teams], [p.id for p in players]
+
+async def run(session_maker, action, *args):
+    # Each service call opens its own transaction
+    async with session_maker() as session:
+        return await action(*args, session)
+
+async def capture(session_maker):
+    """Everything a checkpoint is meant to bring back, plus the version."""
+    async with session_maker() as session:
+        teams = (await session.execute(
+            select(Team.id, Team.purse_balance, Team.total_points, Team.players_count).order_by(Team.id)
+        )).all()
+        players = (await session.execute(
+            select(Player.id, Player.is_sold, Player.team_id, Player.sold_price).order_by(Player.id)
+        )).all()
+        bids = (await session.execute(
+            select(Bid.id, Bid.player_id, Bid.team_id, Bid.amount, Bid.timestamp).order_by(Bid.id)
+        )).all()
+        state = await session.get(AuctionState, 1)
+        lot = (state.status, state.current_player_id, float(state.current_bid), state.current_bidder_id,
+               state.remaining_players_count)
+        return {"teams": teams, "players": players, "bids": bids, "state": lot}, state.version
+
+@pytest.mark.asyncio
+async def test_restore_rewinds_sales_bids_and_state_but_not_version(clean_db):
+    (team_a, team_b), (first, second, third) = await seed(clean_db)
+
+    # Lot 1 sold to A; lot 2 open with B holding the bid
+    await run(clean_db, select_player, first)
+    await run(clean_db, place_bid, 2000000, team_a)
+    await run(clean_db, confirm_sale)
+    await run(clean_db, select_player, second)
+    await run(clean_db, place_bid, 2000000, team_a)
+    await run(clean_db, place_bid, 2500000, team_b)
+
+    checkpoint = await run(clean_db, create_checkpoint, "mid-auction")
+    assert (checkpoint["sold_players"], checkpoint["bids"]) == (1, 3)
+    saved, saved_version = await capture(clean_db)
+
+    # Move on: more bids, another sale, then wipe everything
+    await run(clean_db, place_bid, 3000000, team_a)
+    await run(clean_db, confirm_sale)
+    await run(clean_db, select_player, third)
+    await run(clean_db, place_bid, 2000000, team_b)
+    changed, _ = await capture(clean_db)
+    assert changed != saved
+    await run(clean_db, reset_auction_logic)
+    _, version_before_restore = await capture(clean_db)
+
+    await run(clean_db, restore_checkpoint, "mid-auction")
+    restored, restored_version = await capture(clean_db)
+
+    assert restored["teams"] == saved["teams"]
+    assert restored["players"] == saved["players"]
+    assert restored["bids"] == saved["bids"]
+    assert restored["state"] == saved["state"]
+    assert restored["state"][1:4] == (second, 2500000.0, team_b)
+    # Versions never rewind: the restored lot is newer than anything seen before
+    assert restored_version == version_before_restore + 1 > saved_version
+
+    with pytest.raises(LookupError):
+        await run(clean_db, restore_checkpoint, "no-such-checkpoint")
@@ -0,0 +1,38 @@
+import sys
+import os
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import session as db_session
+from app.db.session import build_engine, script_engine, pool_stats, InstrumentedPool
+
+def test_engine_factory_applies_pool_settings_and_pgbouncer_mode(monkeypatch):
+    engine = build_engine(pool_size=3, max_overflow=2, pool_timeout=1.5)
+    pool = engine.sync_engine.pool
+    assert isinstance(pool, InstrumentedPool)
+    assert (pool.size(), pool.max_overflow, pool._timeout) == (3, 2, 1.5)
+    assert engine.url.query["prepared_statement_cache_size"] == "100"
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 0 and stats["saturation"] == 0
+    assert stats["max_overflow"] == 2
+
+    calls = []
+    monkeypatch.setattr(db_session, "DB_PGBOUNCER", True)
+    monkeypatch.setattr(db_session, "create_async_engine", lambda url, **kwargs: calls.append((url, kwargs)))
+    build_engine()
+    url, kwargs = calls[0]
+    assert url.query["prepared_statement_cache_size"] == "0"
+    assert kwargs["connect_args"]["statement_cache_size"] == 0
+    name_func = kwargs["connect_args"]["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+def test_scripts_keep_the_statement_cache_off_without_db_pgbouncer(monkeypatch):
+    calls = []
+    monkeypatch.setattr(db_session, "DB_PGBOUNCER", False)
+    monkeypatch.setattr(db_session, "create_async_engine", lambda url, **kwargs: calls.append((url, kwargs)))
+    script_engine(echo=True)
+    url, kwargs = calls[0]
+    assert url.query["prepared_statement_cache_size"] == "0"
+    assert kwargs["connect_args"]["statement_cache_size"] == 0
+    assert kwargs["echo"] is True
@@ -0,0 +1,103 @@
+import json
+import sys
+import os
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.leaderboard import Leaderboard
+
+def team(team_id, points, purse, count=0):
+    return {"id": team_id, "name": f"Team {team_id}", "code": team_id.upper(), "logo_url": "logo.png",
+            "total_points": points, "purse_balance": purse, "players_count": count}
+
+def ranks(board):
+    return {row["id"]: row["rank"] for row in board.rows()}
+
+def test_tied_teams_share_dense_rank():
+    board = Leaderboard()
+    board.load([team("a", 10, 100), team("b", 10, 100), team("c", 5, 100), team("d", 10, 90)])
+    assert ranks(board) == {"a": 1, "b": 1, "d": 2, "c": 3}
+
+def test_sale_delta_contains_only_changed_rows():
+    board = Leaderboard()
+    board.load([team("a", 0, 100), team("b", 0, 90), team("c", 0, 80), team("d", 0, 70)], version=3)
+
+    # Team b buys a player (the sale committed at AuctionState.version 7) and
+    # jumps to the top; a drops a rank, c and d keep theirs
+    delta = board.update_team("b", 7, total_points=50, purse_balance=60, players_count=1)
+
+    assert delta["base_version"] == 3
+    assert delta["version"] == 7
+    assert [t["id"] for t in delta["teams"]] == ["b", "a"]
+    assert delta["teams"][0] == {"id": "b", "rank": 1, "total_points": 50, "purse_balance": 60, "players_count": 1, "version": 7}
+    assert "logo_url" not in delta["teams"][0]
+    assert [row["id"] for row in board.rows()] == ["b", "a", "c", "d"]
+
+def test_other_workers_mirror_deltas_and_resets():
+    publisher, follower = Leaderboard(), Leaderboard()
+    for board in (publisher, follower):
+        board.load([team("a", 0, 100), team("b", 0, 90)])
+
+    delta = publisher.update_team("b", 1, total_points=40, purse_balance=50, players_count=1)
+    follower.apply_delta(delta)
+    follower.apply_delta(delta)  # duplicate delivery is a no-op
+    assert follower.rows() == publisher.rows()
+    assert follower.version == publisher.version
+
+    follower.reset(100, 2)
+    assert ranks(follower) == {"a": 1, "b": 1}
+    assert follower.version == 2
+
+def test_workers_converge_when_deltas_cross():
+    # Two workers sell concurrently: neither has seen the other's sale when it publishes
+    first, second = Leaderboard(), Leaderboard()
+    for board in (first, second):
+        board.load([team("a", 0, 100), team("b", 0, 90), team("c", 0, 80)], version=1)
+
+    late = first.update_team("a", 2, total_points=10, purse_balance=80, players_count=1)
+    early = second.update_team("c", 4, total_points=30, purse_balance=60, players_count=1)
+
+    # Each worker sees its own delta echoed and the other's, in either order
+    for board, deltas in ((first, [late, early, late]), (second, [early, late, early])):
+        for delta in deltas:
+            board.apply_delta(delta)
+    assert first.rows() == second.rows()
+    assert ranks(first) == {"c": 1, "a": 2, "b": 3}
+    assert first.version == second.version == 4
+
+    # A stale row riding along in a newer delta does not undo a newer write
+    third = Leaderboard()
+    third.load([team("a", 0, 100), team("b", 0, 90), team("c", 0, 80)], version=1)
+    third.apply_delta(early)
+    third.apply_delta(late)
+    assert third.rows() == first.rows()
+
+def test_added_team_reaches_other_workers():
+    publisher, follower = Leaderboard(), Leaderboard()
+    for board in (publisher, follower):
+        board.load([team("a", 10, 100)], version=5)
+
+    delta = publisher.add_team(team("z", 0, 120), 5)
+    assert delta["base_version"] == 5
+    assert delta["teams"][0]["name"] == "Team z"
+
+    follower.apply_delta(delta)
+    assert follower.rows() == publisher.rows()
+    assert ranks(follower) == {"a": 1, "z": 2}
+
+def test_listener_dispatches_on_the_event_type():
+    publisher, follower = Leaderboard(), Leaderboard()
+    for board in (publisher, follower):
+        board.load([team("a", 0, 100), team("b", 0, 90)])
+    delta = publisher.update_team("b", 1, total_points=40, purse_balance=50, players_count=1)
+
+    # Any JSON spacing works; text inside a payload is not an event type
+    follower.on_event(json.dumps({"seq": 1, "type": "LEADERBOARD_DELTA", "data": delta}, separators=(",", ":")))
+    follower.on_event(json.dumps({"seq": 2, "type": "CHECKPOINT_SAVED", "data": {"name": '"type": "AUCTION_RESET"'}}))
+    assert follower.rows() == publisher.rows()
+
+    follower.on_event(json.dumps({"seq": 3, "type": "AUCTION_RESET", "data": {"purse_balance": 100}, "version": 2}))
+    assert ranks(follower) == {"a": 1, "b": 1}
+    follower.on_event(json.dumps({"seq": 4, "type": "STATE_SYNC", "data": {}}))
+    assert not follower.loaded
@@ -0,0 +1,204 @@
+import pytest
+import asyncio
+import sys
+import os
+import uuid
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.live_engine import LiveAuctionEngine, LiveLot, TeamLedger
+
+def make_engine(team_ids):
+    # Build an engine by hand so validation can be tested without a database
+    engine = LiveAuctionEngine()
+    engine.lot = LiveLot(status="ACTIVE", current_player_id=uuid.uuid4(), base_price=2000000)
+    engine.teams = {t: TeamLedger(purse_balance=100000000, players_count=0) for t in team_ids}
+    engine._queue = asyncio.Queue()
+    engine.enabled = True
+    return engine
+
+@pytest.mark.asyncio
+async def test_memory_engine_validates_and_queues_bids():
+    team_a, team_b = uuid.uuid4(), uuid.uuid4()
+    engine = make_engine([team_a, team_b])
+
+    with pytest.raises(ValueError, match="base price"):
+        await engine.place_bid(1000000, team_a)
+
+    await engine.place_bid(2000000, team_a)
+    with pytest.raises(ValueError, match="Self-bidding"):
+        await engine.place_bid(2500000, team_a)
+    with pytest.raises(ValueError, match="Bid too low"):
+        await engine.place_bid(2000000, team_b)
+
+    lot = await engine.place_bid(2500000, team_b)
+    assert lot.current_bid == 2500000
+    assert lot.current_bidder_id == team_b
+    assert lot.version == 2
+    # The caller gets a snapshot, not the live lot later bids move on
+    await engine.place_bid(3000000, team_a)
+    assert (lot.current_bid, lot.version) == (2500000, 2)
+
+    # Accepted bids are persisted in arrival order
+    writes = [engine._queue.get_nowait() for _ in range(engine._queue.qsize())]
+    assert [w.team_id for w in writes] == [team_a, team_b, team_a]
+    assert [w.version for w in writes] == [1, 2, 3]
+
+@pytest.mark.asyncio
+async def test_concurrent_memory_bids_single_winner():
+    teams = [uuid.uuid4() for _ in range(10)]
+    engine = make_engine(teams)
+
+    async def try_bid(team_id):
+        try:
+            await engine.place_bid(2000000, team_id)
+            return "SUCCESS"
+        except ValueError as e:
+            return str(e)
+
+    results = await asyncio.gather(*(try_bid(t) for t in teams))
+    assert results.count("SUCCESS") == 1
+    assert engine._queue.qsize() == 1
+
+@pytest.mark.asyncio
+async def test_optimistic_bids_against_stale_version_are_rejected():
+    from app.core.errors import StaleBidError
+    teams = [uuid.uuid4() for _ in range(5)]
+    engine = make_engine(teams)
+
+    # Everyone saw version 0; only the first compare-and-swap lands
+    outcomes = []
+    for i, team_id in enumerate(teams):
+        try:
+            await engine.place_bid(2000000 + i * 100000, team_id, expected_version=0)
+            outcomes.append("SUCCESS")
+        except StaleBidError as e:
+            assert str(e) == "Outbid, refresh"
+            assert e.current_version == 1
+            outcomes.append("STALE")
+    assert outcomes == ["SUCCESS"] + ["STALE"] * 4
+    assert engine.lot.current_bidder_id == teams[0]
+
+    # Refreshing to the current version succeeds
+    lot = await engine.place_bid(2500000, teams[1], expected_version=1)
+    assert lot.version == 2
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried_and_holds_new_bids():
+    team_a, team_b = uuid.uuid4(), uuid.uuid4()
+    engine = make_engine([team_a, team_b])
+    engine.retry_delay = 0.01
+    persisted, failures = [], [RuntimeError("db down"), RuntimeError("db down")]
+
+    async def persist(batch):
+        if failures:
+            raise failures.pop(0)
+        persisted.extend(w.version for w in batch)
+
+    engine.persist = persist
+    engine._flusher = asyncio.create_task(engine._run_flusher())
+
+    await engine.place_bid(2000000, team_a)
+    await asyncio.sleep(0)
+    # The acknowledged bid is being retried; new bids wait instead of piling up
+    assert not engine._open.is_set()
+    later = asyncio.create_task(engine.place_bid(2500000, team_b))
+
+    await asyncio.wait_for(engine.flush(), 1)
+    lot = await asyncio.wait_for(later, 1)
+    await engine.flush()
+    assert persisted == [1, 2]
+    assert lot.current_bidder_id == team_b
+    engine._flusher.cancel()
+
+@pytest.mark.asyncio
+async def test_failed_reload_after_state_change_does_not_hang_bids():
+    team_a = uuid.uuid4()
+    engine = make_engine([team_a])
+    engine.timeout = 1
+    database = {"up": False}
+    saved_lot = engine.lot
+
+    async def reload():
+        if not database["up"]:
+            raise RuntimeError("db down")
+        engine.lot = saved_lot
+
+    engine.reload = reload
+
+    async with engine.exclusive():
+        pass
+    # The gate reopens even though the reload failed, and the lot is distrusted
+    assert engine._open.is_set()
+    with pytest.raises(RuntimeError, match="unavailable"):
+        await asyncio.wait_for(engine.place_bid(2000000, team_a), 1)
+
+    database["up"] = True
+    lot = await asyncio.wait_for(engine.place_bid(2000000, team_a), 1)
+    assert lot.current_bidder_id == team_a
+
+@pytest.mark.asyncio
+async def test_rejected_rows_are_dead_lettered_and_the_rest_persisted(monkeypatch):
+    from sqlalchemy.exc import IntegrityError
+    from app.services import live_engine
+    teams = [uuid.uuid4() for _ in range(3)]
+    engine = make_engine(teams)
+    persisted, reloads, broadcasts = [], [], []
+
+    async def broadcast(type, data, version=None, teams=()):
+        broadcasts.append((type, data, version))
+
+    monkeypatch.setattr(live_engine.manager, "broadcast", broadcast)
+
+    async def persist(batch):
+        # The second bid's team was deleted underneath the engine
+        if any(w.team_id == teams[1] for w in batch):
+            raise IntegrityError("INSERT INTO bids", {}, Exception("foreign key violation"))
+        persisted.extend(w.version for w in batch)
+
+    async def reload():
+        reloads.append(engine.lot.version)
+
+    engine.persist, engine.reload = persist, reload
+    for i, team_id in enumerate(teams):
+        await engine.place_bid(2000000 + i * 100000, team_id)
+    engine._flusher = asyncio.create_task(engine._run_flusher())
+    await asyncio.wait_for(engine.flush(), 1)
+
+    assert persisted == [1, 3]
+    assert [w.version for w in engine.dead_letters] == [2]
+    # The lot ran ahead of the database: the next bid reloads it first and
+    # clients are told to drop the bid they were shown
+    await engine.place_bid(2500000, teams[1])
+    assert reloads == [3]
+    assert broadcasts == [("STATE_SYNC", {"reason": "bids_dropped"}, 3)]
+    engine._flusher.cancel()
+
+@pytest.mark.asyncio
+async def test_flush_gives_up_after_max_retries_and_stop_is_bounded():
+    team_a = uuid.uuid4()
+    engine = make_engine([team_a])
+    engine.retry_delay, engine.max_retries, engine.timeout = 0.01, 3, 0.2
+    attempts = []
+
+    async def persist(batch):
+        attempts.append(len(batch))
+        raise RuntimeError("db down")
+
+    engine.persist = persist
+    engine._flusher = asyncio.create_task(engine._run_flusher())
+
+    await engine.place_bid(2000000, team_a)
+    await asyncio.wait_for(engine.flush(), 1)
+    assert attempts == [1, 1, 1]
+    assert [w.version for w in engine.dead_letters] == [1]
+    assert engine._stale
+
+    # A flusher that never drains does not hold shutdown forever
+    stuck = asyncio.Event()
+    engine.persist = lambda batch: stuck.wait()
+    engine._stale = False
+    await engine.place_bid(2500000, None)
+    await asyncio.wait_for(engine.stop(), 1)
+    assert not engine.enabled
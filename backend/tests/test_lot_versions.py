@@ -0,0 +1,40 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.errors import StaleBidError
+from app.models.all_models import AuctionState, Player, Team
+from app.services.auction_service import place_bid, select_player, reset_auction_logic
+
+@pytest.mark.asyncio
+async def test_bid_for_previous_lot_is_stale(clean_db):
+    async with clean_db() as session:
+        team = Team(name="Version Team", code="VT", purse_balance=100000000)
+        player_a = Player(name="Lot A", role="BATSMAN", base_price=2000000, points=10)
+        player_b = Player(name="Lot B", role="BOWLER", base_price=2000000, points=10)
+        session.add_all([team, player_a, player_b])
+        await session.commit()
+        team_id, a_id, b_id = team.id, player_a.id, player_b.id
+
+    async with clean_db() as session:
+        state = await select_player(a_id, session)
+        version_a = state.version
+    async with clean_db() as session:
+        state = await select_player(b_id, session)
+        assert state.version > version_a
+
+    # A late bid aimed at lot A must not land on lot B
+    async with clean_db() as session:
+        with pytest.raises(StaleBidError) as e:
+            await place_bid(2000000, team_id, session, expected_version=version_a)
+        assert e.value.current_version == state.version
+
+    # Reset moves the version forward too, never back to 0
+    async with clean_db() as session:
+        await reset_auction_logic(session)
+    async with clean_db() as session:
+        reset_state = await session.get(AuctionState, 1)
+        assert reset_state.version > state.version
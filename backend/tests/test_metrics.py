@@ -0,0 +1,68 @@
+import pytest
+import asyncio
+import sys
+import os
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core.metrics import MetricsMiddleware
+from main import app
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+def test_metrics_endpoint_reports_route_latency_and_ws_gauges():
+    # No lifespan: the endpoints below never touch the database
+    client = TestClient(app)
+    before = sample("http_request_duration_seconds_count", method="GET", route="/", status="200")
+    assert client.get("/").status_code == 200
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    for name in ("auction_place_bid_seconds", "auction_state_lock_wait_seconds", "ws_active_connections",
+                 "ws_outbound_queue_depth", "db_pool_checkouts_total", "auction_bids_rejected_total"):
+        assert name in body
+
+    assert sample("http_request_duration_seconds_count", method="GET", route="/", status="200") == before + 1
+    assert sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404") >= 1
+
+def test_routes_are_labelled_with_their_full_template():
+    # Validation errors: answered by the router without touching the database
+    client = TestClient(app)
+    team_label = dict(method="POST", route="/api/teams/", status="422")
+    select_label = dict(method="POST", route="/api/auction/select-player/{player_id}", status="422")
+    before = [sample("http_request_duration_seconds_count", **team_label),
+              sample("http_request_duration_seconds_count", **select_label)]
+
+    assert client.post("/api/teams/", json={}).status_code == 422
+    assert client.post("/api/auction/select-player/not-a-uuid").status_code == 422
+    assert client.post("/api/auction/select-player/also-not-a-uuid").status_code == 422
+
+    # One series per endpoint, prefix included, path parameters left as placeholders
+    assert sample("http_request_duration_seconds_count", **team_label) == before[0] + 1
+    assert sample("http_request_duration_seconds_count", **select_label) == before[1] + 2
+    assert sample("http_request_duration_seconds_count", method="POST", route="/", status="422") == 0
+
+@pytest.mark.asyncio
+async def test_streaming_responses_are_timed_to_the_first_byte():
+    async def slow_stream(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await asyncio.sleep(0.2)
+        await send({"type": "http.response.body", "body": b"data: 1\n\n", "more_body": False})
+
+    async def discard(message):
+        pass
+
+    labels = dict(method="STREAM", route="unmatched", status="200")
+    before = sample("http_request_duration_seconds_sum", **labels)
+    await MetricsMiddleware(slow_stream)({"type": "http", "method": "STREAM"}, None, discard)
+
+    assert sample("http_request_duration_seconds_count", **labels) == 1
+    assert sample("http_request_duration_seconds_sum", **labels) - before < 0.1
@@ -0,0 +1,87 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import update
+
+from app.models.all_models import Player, Team
+
+async def seed_catalog(session_maker):
+    async with session_maker() as session:
+        team = Team(name="Catalog Team", code="CT", purse_balance=100000000)
+        session.add(team)
+        await session.flush()
+        session.add_all([
+            Player(name="Ashwin", role="BOWLER", nationality="India", base_price=2000000, points=10, set_number=1),
+            Player(name="Buttler", role="WICKETKEEPER", nationality="England", base_price=2000000, points=10, set_number=1,
+                   is_sold=True, team_id=team.id, sold_price=5000000),
+            Player(name="Chahal", role="BOWLER", nationality="India", base_price=2000000, points=10, set_number=2),
+            Player(name="Dhoni", role="WICKETKEEPER", nationality="India", base_price=2000000, points=10, set_number=2),
+            Player(name="Evans", role="BATSMAN", nationality="England", base_price=2000000, points=10),
+            Player(name="Fakhar", role="BATSMAN", nationality="Pakistan", base_price=2000000, points=10),
+        ])
+        await session.flush()
+        # Not assigned to a set yet (the column default would fill in 1): sorts after every numbered set
+        await session.execute(update(Player).where(Player.name.in_(["Evans", "Fakhar"])).values(set_number=None))
+        await session.commit()
+        return team.id
+
+async def walk(client, params, limit):
+    names, cursor = [], None
+    while True:
+        page = await client.get("/api/players/", params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert page.status_code == 200
+        names += [p["name"] for p in page.json()]
+        cursor = page.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return names
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_the_catalog_including_null_sort_keys(clean_db, api_client):
+    await seed_catalog(clean_db)
+    everything = (await api_client.get("/api/players/")).json()
+    assert [p["name"] for p in everything] == ["Ashwin", "Buttler", "Chahal", "Dhoni", "Evans", "Fakhar"]
+
+    # Every page size walks the same rows, once each, across the NULL set
+    for limit in (1, 2, 3):
+        assert await walk(api_client, {}, limit) == [p["name"] for p in everything]
+
+    assert (await api_client.get("/api/players/", params={"cursor": "not-a-cursor"})).status_code == 400
+
+@pytest.mark.asyncio
+async def test_catalog_filters_and_field_projection(clean_db, api_client):
+    team_id = await seed_catalog(clean_db)
+
+    async def names(**params):
+        return [p["name"] for p in (await api_client.get("/api/players/", params=params)).json()]
+
+    assert await names(set_number=2) == ["Chahal", "Dhoni"]
+    assert await names(role="BOWLER") == ["Ashwin", "Chahal"]
+    assert await names(is_sold="true") == ["Buttler"]
+    assert await names(team_id=str(team_id)) == ["Buttler"]
+    assert await names(nationality="England", is_sold="false") == ["Evans"]
+    assert await walk(api_client, {"nationality": "India"}, 2) == ["Ashwin", "Chahal", "Dhoni"]
+
+    # Only the requested fields, in the order asked, still paginated
+    page = await api_client.get("/api/players/", params={"fields": "name,role", "limit": 2})
+    assert page.json() == [{"name": "Ashwin", "role": "BOWLER"}, {"name": "Buttler", "role": "WICKETKEEPER"}]
+    rest = await api_client.get("/api/players/", params={"fields": "name,role", "limit": 10, "cursor": page.headers["X-Next-Cursor"]})
+    assert [p["name"] for p in rest.json()] == ["Chahal", "Dhoni", "Evans", "Fakhar"]
+    assert "X-Next-Cursor" not in rest.headers
+
+    bad = await api_client.get("/api/players/", params={"fields": "name,password"})
+    assert bad.status_code == 400
+    assert "password" in bad.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_duplicate_player_name_is_a_conflict(clean_db, api_client):
+    await seed_catalog(clean_db)
+    body = {"name": "Dhoni", "role": "WICKETKEEPER"}
+
+    response = await api_client.post("/api/players/", json=body)
+    assert response.status_code == 409
+    assert "Dhoni" in response.json()["detail"]
+    assert (await api_client.post("/api/players/", json={**body, "name": "Jadeja"})).status_code == 200
@@ -0,0 +1,107 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import player_import
+from app.services.player_import import CsvChunkParser, import_players_csv
+
+CSV = (
+    'name,role,nationality,set_number,points,base_price\n'
+    'Virat Kohli,Batsman,India,1,95,20000000\n'
+    '"Bumrah, Jasprit","Fast\nBowler",India,1,94,20000000\n'
+    ',Batsman,India,2,10,2000000\n'
+    'Rinku Singh,Batsman,India,not-a-number,78,\n'
+    'Tilak Varma,Batsman,,2,78,\n'
+).encode("utf-8")
+
+class FakeUpload:
+    def __init__(self, data: bytes, chunk: int):
+        self.data, self.chunk, self.pos = data, chunk, 0
+
+    async def read(self, size: int = -1) -> bytes:
+        part = self.data[self.pos:self.pos + self.chunk]
+        self.pos += len(part)
+        return part
+
+class FakeSession:
+    def __init__(self, reject=()):
+        self.batches = []
+        # Names the "database" refuses, failing whichever statement carries them
+        self.reject = set(reject)
+
+    async def execute(self, statement, rows):
+        if any(r["name"] in self.reject for r in rows):
+            raise RuntimeError("value too long for type character varying\nDETAIL: ...")
+        self.batches.append(list(rows))
+        return self
+
+    def all(self):
+        # Pretend every row was new
+        return self.batches[-1]
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+def test_parser_keeps_quoted_newlines_across_chunks():
+    parser = CsvChunkParser()
+    rows = []
+    for i in range(0, len(CSV), 7):
+        rows += parser.feed(CSV[i:i + 7])
+    rows += parser.feed(b"", final=True)
+
+    assert len(rows) == 5
+    assert rows[1]["name"] == "Bumrah, Jasprit"
+    assert rows[1]["role"] == "Fast\nBowler"
+
+@pytest.mark.asyncio
+async def test_bad_rows_are_reported_not_fatal(monkeypatch):
+    monkeypatch.setattr(player_import, "IMPORT_BATCH_SIZE", 2)
+    session = FakeSession()
+
+    report = await import_players_csv(FakeUpload(CSV, chunk=16), session)
+
+    assert report["count"] == 3
+    assert report["rejected"] == 2
+    assert report["duplicates"] == 0
+    assert [e["row"] for e in report["errors"]] == [4, 5]
+    assert [len(b) for b in session.batches] == [2, 1]
+    # Blank cells use schema defaults; numeric columns are coerced
+    tilak = session.batches[1][0]
+    assert tilak["nationality"] == "India"
+    assert tilak["set_number"] == 2
+
+@pytest.mark.asyncio
+async def test_rejected_batch_is_retried_row_by_row(monkeypatch):
+    monkeypatch.setattr(player_import, "IMPORT_BATCH_SIZE", 2)
+    session = FakeSession(reject={"Bumrah, Jasprit"})
+
+    report = await import_players_csv(FakeUpload(CSV, chunk=16), session)
+
+    # Only Bumrah is lost from the [Kohli, Bumrah] batch; row numbers skip the invalid rows
+    assert report["status"] == "partial"
+    assert report["count"] == 2
+    assert report["rejected"] == 3
+    assert [e["row"] for e in report["errors"]] == [3, 4, 5]
+    assert report["errors"][0]["errors"] == ["value too long for type character varying"]
+    assert [[r["name"] for r in b] for b in session.batches] == [["Virat Kohli"], ["Tilak Varma"]]
+
+@pytest.mark.asyncio
+async def test_invalid_utf8_keeps_rows_before_it():
+    data = CSV.replace(b"Rinku Singh", b"Rinku \xff Singh")
+    session = FakeSession()
+
+    report = await import_players_csv(FakeUpload(data, chunk=1024), session)
+
+    # Rows 2-4 are in the same chunk as the bad byte and are still processed
+    assert report["status"] == "partial"
+    assert report["count"] == 2
+    assert report["rejected"] == 2
+    assert report["errors"][-1]["row"] == 5
+    assert "not valid UTF-8" in report["errors"][-1]["errors"][0]
+    assert [r["name"] for r in session.batches[0]] == ["Virat Kohli", "Bumrah, Jasprit"]
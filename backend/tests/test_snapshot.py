@@ -0,0 +1,60 @@
+import pytest
+import asyncio
+import sys
+import os
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import snapshot_service
+from app.services.snapshot_service import SnapshotCache
+from app.websockets.manager import ConnectionManager
+
+@pytest.mark.asyncio
+async def test_snapshot_built_once_until_next_event(monkeypatch):
+    builds = []
+
+    async def fake_build(session):
+        builds.append(session)
+        await asyncio.sleep(0.01)
+        return {"seq": len(builds), "epoch": "e", "state": {"version": 7}}
+
+    monkeypatch.setattr(snapshot_service, "build_snapshot", fake_build)
+    cache = SnapshotCache()
+    manager = ConnectionManager()
+    manager.add_listener(cache.invalidate)
+
+    # A bootstrap stampede shares a single build
+    results = await asyncio.gather(*(cache.get(None) for _ in range(50)))
+    assert len(builds) == 1
+    assert len({body for body, _ in results}) == 1
+
+    await manager.broadcast("BID_UPDATE", {"amount": 2000000})
+    await cache.get(None)
+    assert len(builds) == 2
+
+@pytest.mark.asyncio
+async def test_snapshot_reads_live_lot_in_memory_engine_mode(clean_db, monkeypatch):
+    from app.models.all_models import Player, Team
+    from app.services.live_engine import live_engine, LiveLot
+
+    async with clean_db() as session:
+        team = Team(name="Live Team", code="LT", purse_balance=100000000)
+        player = Player(name="Live Player", role="BATSMAN", base_price=2000000, points=10)
+        session.add_all([team, player])
+        await session.commit()
+        team_id, player_id = team.id, player.id
+
+    # The engine has accepted a bid the flusher has not written yet
+    monkeypatch.setattr(live_engine, "enabled", True)
+    monkeypatch.setattr(live_engine, "lot", LiveLot(
+        status="ACTIVE", current_player_id=player_id, current_bid=3500000,
+        current_bidder_id=team_id, version=42,
+    ))
+    async with clean_db() as session:
+        snapshot = await snapshot_service.build_snapshot(session)
+
+    assert snapshot["state"]["current_bid"] == 3500000
+    assert snapshot["state"]["current_bidder_id"] == str(team_id)
+    assert snapshot["state"]["version"] == 42
+    assert snapshot["current_player"]["id"] == str(player_id)
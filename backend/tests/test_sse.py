@@ -0,0 +1,47 @@
+import pytest
+import asyncio
+import sys
+import os
+import json
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.websockets.manager import ConnectionManager
+from app.websockets.protocol import parse_event_id
+
+async def read(frames, count):
+    return [await asyncio.wait_for(frames.__anext__(), 1) for _ in range(count)]
+
+@pytest.mark.asyncio
+async def test_event_stream_frames_and_resume():
+    manager = ConnectionManager(queue_size=8, send_timeout=5, heartbeat_interval=0.05)
+    connection = manager.open_stream(topics={"lot"})
+    frames = manager.stream_frames(connection)
+
+    await manager.broadcast("BID_UPDATE", {"amount": 2000000, "team_id": None}, version=1)
+    await manager.broadcast("LEADERBOARD_DELTA", {"teams": []})
+    manager.heartbeat()
+    hello, bid, ping = await read(frames, 3)
+
+    assert hello.startswith(f"id: {manager.epoch}:0\n")
+    assert bid == f'id: {manager.epoch}:1\ndata: {manager.replay_buffer[0][1]}\n\n'
+    assert json.loads(bid.split("data: ", 1)[1])["type"] == "BID_UPDATE"
+    # Heartbeats are comments; SSE clients are never reaped for not answering
+    assert ping == ": ping\n\n"
+    assert connection.websocket in manager.active_connections
+
+    # A reconnect with Last-Event-ID picks up after the last event it saw
+    await manager.broadcast("PLAYER_SELECTED", {"player_id": "p"})
+    since, epoch = parse_event_id(bid.split("\n", 1)[0][len("id: "):])
+    resumed = manager.open_stream(since=since, epoch=epoch, topics={"lot"})
+    hello, selected = await read(manager.stream_frames(resumed), 2)
+    assert '"type": "PLAYER_SELECTED"' in selected
+    assert parse_event_id("garbage") == (None, None)
+
+    # Evicted streams end once drained
+    manager._evict(connection)
+    await asyncio.sleep(0.01)
+    remaining = [frame async for frame in frames]
+    assert len(remaining) == 1 and "PLAYER_SELECTED" in remaining[0]
+    manager.disconnect(resumed.websocket)
@@ -0,0 +1,63 @@
+import pytest
+import sys
+import os
+import json
+import uuid
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.errors import StaleBidError
+from app.services.live_engine import LiveLot
+from app.websockets import commands
+
+@pytest.mark.asyncio
+async def test_bid_command_acks_and_nacks(monkeypatch):
+    calls = []
+
+    async def fake_place_bid(amount, team_id, session, expected_version=None):
+        calls.append((amount, team_id, expected_version))
+        if expected_version == 3:
+            raise StaleBidError(5)
+        if amount < 2000000:
+            raise ValueError("First bid must be at least base price: ₹20L")
+        return LiveLot(current_bid=amount, version=4)
+
+    monkeypatch.setattr(commands, "place_bid", fake_place_bid)
+    team_id = str(uuid.uuid4())
+
+    reply = json.loads(await commands.handle_command(json.dumps(
+        {"id": "c1", "type": "bid", "data": {"team_id": team_id, "amount": 2500000}}
+    )))
+    assert reply == {"type": "ACK", "id": "c1", "data": {"current_bid": 2500000, "version": 4}}
+    assert calls[0] == (2500000, uuid.UUID(team_id), None)
+
+    reply = json.loads(await commands.handle_command(json.dumps(
+        {"id": "c2", "type": "bid", "data": {"team_id": team_id, "amount": 3000000, "expected_version": 3}}
+    )))
+    assert reply["type"] == "NACK" and reply["id"] == "c2"
+    assert reply["error"] == {"status": 409, "detail": "Outbid, refresh", "version": 5}
+
+    reply = json.loads(await commands.handle_command(json.dumps(
+        {"id": 7, "type": "bid", "data": {"team_id": team_id, "amount": 100}}
+    )))
+    assert reply["id"] == 7 and reply["error"]["status"] == 400
+
+    # Missing amount never reaches place_bid
+    reply = json.loads(await commands.handle_command(json.dumps({"id": "c4", "type": "bid", "data": {}})))
+    assert reply["error"]["status"] == 422
+    assert len(calls) == 3
+
+@pytest.mark.asyncio
+async def test_malformed_and_unknown_commands_are_nacked():
+    reply = json.loads(await commands.handle_command("not json"))
+    assert reply == {"type": "NACK", "id": None, "error": {"status": 400, "detail": "Malformed command"}}
+
+    reply = json.loads(await commands.handle_command(json.dumps({"id": "c1", "data": {}})))
+    assert reply["id"] == "c1" and reply["error"]["detail"] == "Malformed command"
+
+    reply = json.loads(await commands.handle_command(json.dumps({"id": "c2", "type": "launch"})))
+    assert reply["error"] == {"status": 400, "detail": "Unknown command: launch"}
+
+    reply = json.loads(await commands.handle_command(json.dumps({"id": "c3", "type": "ping"})))
+    assert reply["type"] == "ACK" and set(reply["data"]) == {"seq", "epoch", "server_time"}
@@ -0,0 +1,141 @@
+import pytest
+import asyncio
+import sys
+import os
+import json
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.websockets.bus import BroadcastBackend
+from app.websockets.manager import ConnectionManager
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.sent = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        await asyncio.sleep(self.delay)
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+@pytest.mark.asyncio
+async def test_slow_viewer_does_not_delay_others():
+    manager = ConnectionManager(queue_size=4, send_timeout=5)
+    fast = [FakeWebSocket() for _ in range(3)]
+    slow = FakeWebSocket(delay=10)
+    for ws in [slow, *fast]:
+        await manager.connect(ws)
+
+    await manager.broadcast("BID_UPDATE", {"amount": 2000000})
+    await asyncio.sleep(0.01)
+
+    # HELLO + the bid update
+    assert all(len(ws.sent) == 2 for ws in fast)
+    assert slow.sent == []
+    for ws in [slow, *fast]:
+        manager.disconnect(ws)
+
+@pytest.mark.asyncio
+async def test_connection_over_queue_limit_is_evicted():
+    manager = ConnectionManager(queue_size=2, send_timeout=5)
+    slow = FakeWebSocket(delay=10)
+    await manager.connect(slow)
+
+    # HELLO is in flight and two updates fit in the queue; the third overflows
+    for i in range(3):
+        await manager.broadcast("BID_UPDATE", {"amount": i})
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+
+    assert slow not in manager.active_connections
+    assert manager.evicted_count == 1
+    assert slow.closed_with == 1013
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_only_missed_events():
+    manager = ConnectionManager(queue_size=16, send_timeout=5, replay_size=4)
+    for amount in range(6):
+        await manager.broadcast("BID_UPDATE", {"amount": amount}, version=amount)
+
+    # Missed seq 5 and 6 only
+    ws = FakeWebSocket()
+    await manager.connect(ws, since=4, epoch=manager.epoch)
+    await asyncio.sleep(0.01)
+    messages = [json.loads(m) for m in ws.sent]
+    assert messages[0]["type"] == "HELLO"
+    assert [m["seq"] for m in messages[1:]] == [5, 6]
+    assert messages[-1]["version"] == 5
+
+    # Seq 1 has aged out of the buffer: client must resync
+    stale = FakeWebSocket()
+    await manager.connect(stale, since=0, epoch=manager.epoch)
+    await asyncio.sleep(0.01)
+    assert json.loads(stale.sent[-1])["type"] == "STATE_SYNC"
+
+    # Different process: always resync
+    other = FakeWebSocket()
+    await manager.connect(other, since=6, epoch="another-epoch")
+    await asyncio.sleep(0.01)
+    assert json.loads(other.sent[-1])["type"] == "STATE_SYNC"
+
+    for sock in (ws, stale, other):
+        manager.disconnect(sock)
+
+class BrokenWebSocket(FakeWebSocket):
+    async def send_text(self, message: str):
+        raise RuntimeError("connection reset")
+
+@pytest.mark.asyncio
+async def test_failed_send_and_idle_sockets_are_reaped():
+    manager = ConnectionManager(queue_size=8, send_timeout=5, idle_timeout=60)
+    broken, idle, alive = BrokenWebSocket(), FakeWebSocket(), FakeWebSocket()
+    for ws in (broken, idle, alive):
+        await manager.connect(ws)
+    await asyncio.sleep(0.01)
+
+    # The first failed send (HELLO) removes the socket
+    assert broken not in manager.active_connections
+    assert manager.reaped_count == 1
+
+    manager.touch(alive)
+    manager.active_connections[idle].last_seen -= 61
+    manager.heartbeat()
+    await asyncio.sleep(0.01)
+
+    assert idle not in manager.active_connections
+    assert idle.closed_with == 1001
+    assert manager.reaped_count == 2
+    assert json.loads(alive.sent[-1])["type"] == "PING"
+    manager.disconnect(alive)
+
+@pytest.mark.asyncio
+async def test_failed_publish_is_logged_and_delivered_locally():
+    class DownBackend(BroadcastBackend):
+        async def start(self, deliver):
+            pass
+
+        async def publish(self, message):
+            raise ConnectionError("NOTIFY connection lost")
+
+    with pytest.raises(TypeError):
+        BroadcastBackend()
+
+    manager = ConnectionManager(queue_size=4, send_timeout=5)
+    manager.backend = DownBackend()
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+
+    # The bid already committed: broadcasting must not fail the request
+    await manager.broadcast("BID_UPDATE", {"amount": 2000000}, version=3)
+    await asyncio.sleep(0.01)
+
+    assert [json.loads(m)["type"] for m in ws.sent] == ["HELLO", "BID_UPDATE"]
+    manager.disconnect(ws)
@@ -0,0 +1,84 @@
+import pytest
+import asyncio
+import sys
+import os
+import json
+import uuid
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import msgpack
+
+from app.websockets import manager as manager_module
+from app.websockets.manager import ConnectionManager
+from app.websockets.protocol import MSGPACK_SUBPROTOCOL, encode_msgpack, decode_msgpack, command_text
+
+class FakeWebSocket:
+    def __init__(self, subprotocols=()):
+        self.scope = {"subprotocols": list(subprotocols)}
+        self.subprotocol = None
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        self.subprotocol = subprotocol
+
+    async def send_text(self, message: str):
+        self.sent.append(message)
+
+    async def send_bytes(self, message: bytes):
+        self.sent.append(message)
+
+def test_msgpack_frames_are_compact_and_round_trip():
+    team_id = str(uuid.uuid4())
+    message = json.dumps({
+        "seq": 3, "epoch": "abc", "type": "PLAYER_SOLD", "version": 9,
+        "data": {"player_id": team_id, "team_id": team_id, "sold_price": "25000000.00"},
+    })
+    frame = encode_msgpack(message)
+
+    raw = msgpack.unpackb(frame, raw=False)
+    assert raw["t"] == "PLAYER_SOLD" and raw["s"] == 3 and raw["v"] == 9
+    assert raw["d"]["sp"] == 25000000
+    assert raw["d"]["tm"] == uuid.UUID(team_id).bytes
+    assert len(frame) < len(message) / 2
+
+    event = decode_msgpack(frame)
+    assert event["data"] == {"player_id": team_id, "team_id": team_id, "sold_price": 25000000}
+
+    # Commands come back in as the JSON the handler expects
+    command = msgpack.packb({"i": "c1", "t": "bid", "d": {"tm": uuid.UUID(team_id).bytes, "a": 2500000}})
+    assert json.loads(command_text(command)) == {
+        "id": "c1", "type": "bid", "data": {"team_id": team_id, "amount": 2500000},
+    }
+    assert command_text(b"\xc1") == ""
+
+@pytest.mark.asyncio
+async def test_broadcast_encoded_once_per_format(monkeypatch):
+    calls = []
+    real_encode = manager_module.encode_msgpack
+
+    def counting_encode(message):
+        calls.append(message)
+        return real_encode(message)
+
+    monkeypatch.setattr(manager_module, "encode_msgpack", counting_encode)
+    manager = ConnectionManager(queue_size=8, send_timeout=5)
+    json_clients = [FakeWebSocket() for _ in range(3)]
+    packed_clients = [FakeWebSocket([MSGPACK_SUBPROTOCOL]) for _ in range(3)]
+    for ws in json_clients + packed_clients:
+        await manager.connect(ws)
+    calls.clear()  # HELLO frames
+
+    await manager.broadcast("BID_UPDATE", {"amount": 2500000.0, "team_id": None}, version=4)
+    await asyncio.sleep(0.01)
+
+    assert len(calls) == 1
+    assert all(ws.subprotocol == MSGPACK_SUBPROTOCOL for ws in packed_clients)
+    assert all(isinstance(ws.sent[-1], str) for ws in json_clients)
+    # Every MessagePack socket got the same frame object
+    assert len({id(ws.sent[-1]) for ws in packed_clients}) == 1
+    event = decode_msgpack(packed_clients[0].sent[-1])
+    assert event["type"] == "BID_UPDATE" and event["data"]["amount"] == 2500000 and event["version"] == 4
+    for ws in json_clients + packed_clients:
+        manager.disconnect(ws)
@@ -0,0 +1,70 @@
+import pytest
+import asyncio
+import sys
+import os
+import json
+import uuid
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.websockets.manager import ConnectionManager
+from app.websockets.topics import parse_topics, team_topic
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        self.sent.append(message)
+
+def received(ws):
+    return [json.loads(m)["type"] for m in ws.sent if json.loads(m)["type"] != "HELLO"]
+
+def test_parse_topics():
+    team_id = uuid.uuid4()
+    assert parse_topics(None) == {"lot", "leaderboard", "bids"}
+    assert parse_topics(["admin"]) == {"admin"}
+    assert parse_topics(["lot", f"team:{str(team_id).upper()}", ""]) == {"lot", team_topic(team_id)}
+    with pytest.raises(ValueError, match="Unknown topic"):
+        parse_topics(["everything"])
+    with pytest.raises(ValueError, match="Invalid team topic"):
+        parse_topics(["team:csk"])
+
+@pytest.mark.asyncio
+async def test_events_reach_only_subscribed_sockets():
+    manager = ConnectionManager(queue_size=16, send_timeout=5)
+    team_a, team_b = uuid.uuid4(), uuid.uuid4()
+    everyone, viewer, board, console, operator = (FakeWebSocket() for _ in range(5))
+    await manager.connect(everyone)
+    await manager.connect(operator, topics={"admin"})
+    await manager.connect(viewer, topics={"lot"})
+    await manager.connect(board, topics={"leaderboard"})
+    await manager.connect(console, topics={team_topic(team_a)})
+
+    await manager.broadcast("BID_UPDATE", {"amount": 2000000, "team_id": str(team_a)}, version=1, teams=[team_a])
+    await manager.broadcast("BID_UPDATE", {"amount": 2500000, "team_id": str(team_b)}, version=2, teams=[team_b])
+    await manager.broadcast("LEADERBOARD_DELTA", {"teams": []})
+    await manager.broadcast("CHECKPOINT_SAVED", {"name": "lunch"})
+    await manager.broadcast("AUCTION_RESET", {"purse_balance": 1})
+    await asyncio.sleep(0.01)
+
+    # Operator events only reach sockets that asked for them
+    assert received(everyone) == ["BID_UPDATE", "BID_UPDATE", "LEADERBOARD_DELTA", "AUCTION_RESET"]
+    assert received(operator) == ["CHECKPOINT_SAVED", "AUCTION_RESET"]
+    assert received(viewer) == ["BID_UPDATE", "BID_UPDATE", "AUCTION_RESET"]
+    assert received(board) == ["LEADERBOARD_DELTA", "AUCTION_RESET"]
+    assert received(console) == ["BID_UPDATE", "AUCTION_RESET"]
+
+    # Resume replays only what the socket subscribes to
+    assert [json.loads(m)["type"] for m in manager.replay_since(0, topics={"admin"})] == ["CHECKPOINT_SAVED", "AUCTION_RESET"]
+
+    manager.subscribe(viewer, {"leaderboard"})
+    assert viewer not in manager.subscribers["lot"]
+    for ws in (everyone, viewer, board, console, operator):
+        manager.disconnect(ws)
+    assert team_topic(team_a) not in manager.subscribers
+    assert all(not subs for subs in manager.subscribers.values())
@@ -2,17 +2,17 @@ import asyncio
 import re
 import requests
 import platform
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import select
 from app.models.all_models import Team, Player
-from app.db.session import DATABASE_URL
+from app.db.session import script_engine
 
 # Fix for Windows Asyncio Loop
 if platform.system() == 'Windows':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-engine = create_async_engine(DATABASE_URL)
+engine = script_engine()
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 TEAM_URLS = {
@@ -1,21 +1,76 @@
-import { useEffect } from 'react';
+import { useEffect, useRef } from 'react';
 import { useAuctionStore, Player } from '../store/useAuctionStore';
 import { socketUrl, fetchFromBackend } from '../utils/api';
 
+type Pending = { resolve: (data: any) => void; reject: (error: Error) => void; timer: ReturnType<typeof setTimeout> };
+
+const COMMAND_TIMEOUT_MS = 10000;
+// The server PINGs every 20s; this much silence means the socket is dead (e.g. after sleep)
+const SILENCE_TIMEOUT_MS = 60000;
+
 export const useAuctionSync = () => {
   const store = useAuctionStore();
+  // Commands sent over the socket, answered by ACK/NACK with the same id
+  const socketRef = useRef<WebSocket | null>(null);
+  const pendingRef = useRef(new Map<string, Pending>());
+  const nextIdRef = useRef(0);
 
   useEffect(() => {
     // 1. Fetch Initial Data
     store.fetchInitialData();
 
-    // 2. Setup WebSocket
-    const ws = new WebSocket(socketUrl);
+    // 2. Setup WebSocket (resumes from the last seen event after a drop)
+    let ws: WebSocket;
+    let lastSeq: number | null = null;
+    let epoch: string | null = null;
+    let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
+    let closedByUs = false;
+    let lastMessageAt = Date.now();
+
+    const connect = () => {
+      const resume = lastSeq !== null && epoch !== null ? `?since=${lastSeq}&epoch=${epoch}` : '';
+      ws = new WebSocket(socketUrl + resume);
+      socketRef.current = ws;
+      lastMessageAt = Date.now();
+      ws.onmessage = handleMessage;
+      ws.onclose = () => {
+        // Replies for commands in flight will never arrive on a new socket
+        pendingRef.current.forEach(p => {
+          clearTimeout(p.timer);
+          p.reject(new Error('Connection lost'));
+        });
+        pendingRef.current.clear();
+        if (!closedByUs) reconnectTimer = setTimeout(connect, 1000);
+      };
+    };
 
-    ws.onmessage = (event) => {
+    const handleMessage = (event: MessageEvent) => {
       const msg = JSON.parse(event.data);
+      lastMessageAt = Date.now();
+      if (msg.type === 'PING') {
+        ws.send(JSON.stringify({ type: 'pong' }));
+        return;
+      }
       console.log('WS Message:', msg);
 
+      if (msg.type === 'ACK' || msg.type === 'NACK') {
+        const pending = pendingRef.current.get(msg.id);
+        if (!pending) return;
+        pendingRef.current.delete(msg.id);
+        clearTimeout(pending.timer);
+        if (msg.type === 'ACK') pending.resolve(msg.data);
+        else pending.reject(new Error(msg.error.detail));
+        return;
+      }
+
+      if (typeof msg.seq === 'number') lastSeq = msg.seq;
+      if (msg.type === 'HELLO') {
+        // Only adopt the server position on a fresh stream; a resumed one replays from lastSeq
+        if (epoch !== msg.data.epoch) lastSeq = msg.data.seq;
+        epoch = msg.data.epoch;
+        return;
+      }
+
       switch (msg.type) {
         case 'BID_UPDATE':
           // Convert from backend (₹) to frontend (Lakhs)
@@ -47,10 +102,39 @@ export const useAuctionSync = () => {
             primaryColor: t.primary_color || '#000',
             secondaryColor: t.secondary_color || '#fff',
             rank: t.rank,
-            totalPoints: t.total_points
+            totalPoints: t.total_points,
+            playersCount: t.players_count
           })));
           break;
 
+        case 'LEADERBOARD_DELTA': {
+          // No baseline yet, a missed delta, or a team we have never seen:
+          // our rows are stale, reload the full leaderboard (which re-seeds
+          // the version from X-Leaderboard-Version)
+          const { leaderboardVersion, teams } = useAuctionStore.getState();
+          const known = new Set(teams.map(team => team.id));
+          if (leaderboardVersion === null || msg.data.base_version !== leaderboardVersion
+              || msg.data.teams.some((t: any) => !known.has(t.id))) {
+            store.fetchInitialData();
+            break;
+          }
+          const changed = new Map<string, any>(msg.data.teams.map((t: any) => [t.id, t]));
+          store.updateState({ leaderboardVersion: msg.data.version });
+          store.setTeams(teams
+            .map(team => {
+              const t = changed.get(team.id);
+              return t ? {
+                ...team,
+                purse: t.purse_balance / 100000,
+                rank: t.rank,
+                totalPoints: t.total_points,
+                playersCount: t.players_count
+              } : team;
+            })
+            .sort((a, b) => (a.rank ?? 0) - (b.rank ?? 0)));
+          break;
+        }
+
         case 'AUCTION_COMPLETED':
           store.updateState({ auctionStarted: true, auctionPaused: false });
           store.fetchInitialData();
@@ -62,9 +146,44 @@ export const useAuctionSync = () => {
       }
     };
 
-    return () => ws.close();
+    connect();
+
+    // Close a silent socket so onclose reconnects and resumes
+    const watchdog = setInterval(() => {
+      if (ws.readyState === WebSocket.OPEN && Date.now() - lastMessageAt > SILENCE_TIMEOUT_MS) ws.close();
+    }, SILENCE_TIMEOUT_MS / 4);
+
+    return () => {
+      closedByUs = true;
+      clearInterval(watchdog);
+      clearTimeout(reconnectTimer);
+      ws.close();
+    };
   }, []);
 
+  // Send a command over the open socket; null when it is not open (use HTTP instead)
+  const sendCommand = (type: string, data: Record<string, unknown> = {}): Promise<any> | null => {
+    const ws = socketRef.current;
+    if (!ws || ws.readyState !== WebSocket.OPEN) return null;
+    const id = `c${++nextIdRef.current}`;
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        pendingRef.current.delete(id);
+        reject(new Error('Command timed out'));
+      }, COMMAND_TIMEOUT_MS);
+      pendingRef.current.set(id, { resolve, reject, timer });
+      ws.send(JSON.stringify({ id, type, data }));
+    });
+  };
+
+  const bid = (amount: number, teamId?: string) => {
+    const data = teamId ? { team_id: teamId, amount } : { amount };
+    return sendCommand('bid', data) ?? fetchFromBackend('/auction/bid', {
+      method: 'POST',
+      body: JSON.stringify(data)
+    });
+  };
+
   // Override store actions to call Backend API
   const backendActions = {
     ...store,
@@ -73,22 +192,15 @@ export const useAuctionSync = () => {
       // Find an unsold player to start with
       const nextPlayer = store.players.find(p => !p.sold);
       if (nextPlayer) {
-        await fetchFromBackend(`/auction/select-player/${nextPlayer.id}`, {
-          method: 'POST'
-        });
+        await (sendCommand('select-player', { player_id: nextPlayer.id }) ??
+          fetchFromBackend(`/auction/select-player/${nextPlayer.id}`, { method: 'POST' }));
         // Status update would come via WS or manual next call
       }
     },
 
     placeBid: async (teamId: string, amount: number) => {
       try {
-        await fetchFromBackend('/auction/bid', {
-          method: 'POST',
-          body: JSON.stringify({
-            team_id: teamId,
-            amount: amount * 100000 // To ₹
-          })
-        });
+        await bid(amount * 100000, teamId); // To ₹
       } catch (e) {
         console.error('Bid failed:', e);
       }
@@ -97,9 +209,8 @@ export const useAuctionSync = () => {
     setCurrentPlayer: async (player: Player | null) => {
       if (player) {
         try {
-          await fetchFromBackend(`/auction/select-player/${player.id}`, {
-            method: 'POST'
-          });
+          await (sendCommand('select-player', { player_id: player.id }) ??
+            fetchFromBackend(`/auction/select-player/${player.id}`, { method: 'POST' }));
         } catch (e) {
           console.error('Player selection failed:', e);
         }
@@ -110,13 +221,8 @@ export const useAuctionSync = () => {
 
     updateBidDisplay: async (amount: number, _teamId: string = '') => {
       try {
-        await fetchFromBackend('/auction/bid', {
-          method: 'POST',
-          body: JSON.stringify({
-            amount: amount * 100000 // To ₹
-            // team_id is omitted for price-only updates
-          })
-        });
+        // team_id is omitted for price-only updates
+        await bid(amount * 100000); // To ₹
       } catch (e) {
         console.error('Bid display sync failed:', e);
       }
@@ -124,13 +230,7 @@ export const useAuctionSync = () => {
 
     placeBidFromViewer: async (bidAmount: number, teamId: string) => {
       try {
-        await fetchFromBackend('/auction/bid', {
-          method: 'POST',
-          body: JSON.stringify({
-            team_id: teamId,
-            amount: bidAmount * 100000
-          })
-        });
+        await bid(bidAmount * 100000, teamId);
         return { success: true, message: 'Bid placed successfully' };
       } catch (e: any) {
         return { success: false, message: e.message || 'Bid failed' };
@@ -139,7 +239,8 @@ export const useAuctionSync = () => {
 
     markSold: async (_playerId: string, _teamId: string, _price: number) => {
       try {
-        await fetchFromBackend('/auction/confirm-sale', { method: 'POST' });
+        await (sendCommand('confirm-sale') ??
+          fetchFromBackend('/auction/confirm-sale', { method: 'POST' }));
       } catch (e) {
         console.error('Sale confirmation failed:', e);
       }
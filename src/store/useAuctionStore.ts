@@ -1,5 +1,5 @@
 import { create } from 'zustand';
-import { fetchFromBackend } from '../utils/api';
+import { fetchFromBackend, fetchResponseFromBackend } from '../utils/api';
 
 export interface Player {
   id: string;
@@ -38,6 +38,7 @@ export interface Team {
   secondaryColor: string;
   rank?: number;
   totalPoints?: number;
+  playersCount?: number;
 }
 
 export interface BidHistoryItem {
@@ -59,6 +60,8 @@ interface AuctionState {
   lastBid?: { amount: number; teamId: string; teamName: string; timestamp: number };
   currentSetName: string | null;
   lastUpdate: number;
+  // Leaderboard version the teams reflect; LEADERBOARD_DELTA applies on top of it
+  leaderboardVersion: number | null;
 
   // Hydration Actions
   setPlayers: (players: Player[]) => void;
@@ -97,6 +100,7 @@ export const useAuctionStore = create<AuctionState>((set, get) => ({
   bidHistory: [],
   currentSetName: null,
   lastUpdate: Date.now(),
+  leaderboardVersion: null,
 
   setPlayers: (players) => set({ players }),
   setTeams: (teams) => set({ teams }),
@@ -104,11 +108,13 @@ export const useAuctionStore = create<AuctionState>((set, get) => ({
 
   fetchInitialData: async () => {
     try {
-      const [playersData, teamsData, stateData] = await Promise.all([
+      const [playersData, teamsResponse, stateData] = await Promise.all([
         fetchFromBackend('/players'),
-        fetchFromBackend('/teams/leaderboard'),
+        fetchResponseFromBackend('/teams/leaderboard'),
         fetchFromBackend('/auction/state')
       ]);
+      const teamsData = await teamsResponse.json();
+      const leaderboardVersion = teamsResponse.headers.get('X-Leaderboard-Version');
 
       const players = playersData.map((p: any) => ({
         id: p.id,
@@ -143,12 +149,14 @@ export const useAuctionStore = create<AuctionState>((set, get) => ({
         primaryColor: t.primary_color || '#000',
         secondaryColor: t.secondary_color || '#fff',
         rank: t.rank,
-        totalPoints: t.total_points
+        totalPoints: t.total_points,
+        playersCount: t.players_count
       }));
 
       set({
         players,
         teams,
+        leaderboardVersion: leaderboardVersion !== null ? Number(leaderboardVersion) : null,
         auctionStarted: stateData.status === 'ACTIVE',
         auctionPaused: stateData.status === 'PAUSED',
         currentBid: parseFloat(stateData.current_bid) / 100000,
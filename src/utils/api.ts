@@ -1,6 +1,7 @@
 const API_BASE_URL = 'https://auction-portal-1.onrender.com/api';
 
-export async function fetchFromBackend(endpoint: string, options: RequestInit = {}) {
+// The raw response, for callers that also need headers
+export async function fetchResponseFromBackend(endpoint: string, options: RequestInit = {}) {
     const response = await fetch(`${API_BASE_URL}${endpoint}`, {
         ...options,
         headers: {
@@ -9,6 +10,11 @@ export async function fetchFromBackend(endpoint: string, options: RequestInit =
         },
     });
     if (!response.ok) throw new Error(`API Error: ${response.statusText}`);
+    return response;
+}
+
+export async function fetchFromBackend(endpoint: string, options: RequestInit = {}) {
+    const response = await fetchResponseFromBackend(endpoint, options);
     return response.json();
 }
 